@@ -7,15 +7,15 @@ except ImportError:
     from ..adk.agent import Agent
 
 from agents import task_extractor_agent, planner_agent, reminder_agent, reporter_agent
-from llm import LLM
+from llm import get_llm
 
 
 class TaskExtractorAgent(Agent):
-    def __init__(self, memory, tools):
+    def __init__(self, memory, tools, llm=None):
         super().__init__("task_extractor")
         self.memory = memory
         self.tools = tools
-        self.llm = LLM()
+        self.llm = llm or get_llm()
 
     async def run(self, input: Dict[str, Any], session) -> Dict[str, Any]:
         # Call the async agent implementation directly
@@ -23,33 +23,33 @@ class TaskExtractorAgent(Agent):
 
 
 class PlannerAgent(Agent):
-    def __init__(self, memory, tools):
+    def __init__(self, memory, tools, llm=None):
         super().__init__("planner")
         self.memory = memory
         self.tools = tools
-        self.llm = LLM()
+        self.llm = llm or get_llm()
 
     async def run(self, input: Dict[str, Any], session) -> Dict[str, Any]:
         return await planner_agent(input, self.memory, self.tools, self.llm)
 
 
 class ReminderAgent(Agent):
-    def __init__(self, memory, tools):
+    def __init__(self, memory, tools, llm=None):
         super().__init__("reminder")
         self.memory = memory
         self.tools = tools
-        self.llm = LLM()
+        self.llm = llm or get_llm()
 
     async def run(self, input: Dict[str, Any], session) -> Dict[str, Any]:
         return await reminder_agent(input, self.memory, self.tools, self.llm)
 
 
 class ReporterAgent(Agent):
-    def __init__(self, memory, tools):
+    def __init__(self, memory, tools, llm=None):
         super().__init__("reporter")
         self.memory = memory
         self.tools = tools
-        self.llm = LLM()
+        self.llm = llm or get_llm()
 
     async def run(self, input: Dict[str, Any], session) -> Dict[str, Any]:
         return await reporter_agent(input, self.memory, self.tools, self.llm)
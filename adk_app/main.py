@@ -10,14 +10,20 @@ try:
 except ImportError:
     from ..adk.workflow import run_workflow
 
-from adk_app.workflow import build_workflow
+from adk_app.pool import WorkflowPool
+from llm import warmup
+
+# Build shared LLM clients and the workflow pool at import time so the first
+# request skips it.
+warmup()
+POOL = WorkflowPool()
 
 
 async def _run_async(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    wf = build_workflow()
     # session can carry runtime metadata
     session = {"env": "local"}
-    result = await run_workflow(wf, inputs, session=session)
+    async with POOL.acquire() as wf:
+        result = await run_workflow(wf, inputs, session=session)
     return result
 
 
@@ -0,0 +1,97 @@
+"""Pool of prebuilt ADK workflows for the Agent Engine entrypoint.
+
+Building a workflow creates tools, a `TaskMemory` and four agents. The pool
+builds `size` of them up front (all sharing the process-wide LLM) and hands
+one to each request. Every workflow uses in-memory task storage, and its
+memory and tools are cleared when it is returned, so requests never see each
+other's state. When all pooled workflows are busy, a temporary one is built
+rather than making the request wait.
+"""
+
+import os
+import logging
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict
+
+from adk_app.workflow import build_workflow
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.environ.get("WORKFLOWGENIE_WORKFLOW_POOL_SIZE", "4"))
+
+
+def _in_memory_workflow():
+    return build_workflow(in_memory=True)
+
+
+async def reset_workflow(workflow) -> None:
+    """Clear a workflow's tasks, calendar events and reminders."""
+    memory = getattr(workflow, "memory", None)
+    if memory is not None and hasattr(memory, "clear_db"):
+        memory.clear_db()
+    tools = getattr(workflow, "tools", None) or {}
+    calendar, reminder = tools.get("calendar"), tools.get("reminder")
+    if calendar is not None:
+        await calendar.clear_events()
+    if reminder is not None:
+        await reminder.clear_reminders()
+
+
+class WorkflowPool:
+    """Thread-safe pool of reusable workflows (usable from any event loop)."""
+
+    def __init__(self, size: int = POOL_SIZE, factory: Callable[[], Any] = _in_memory_workflow):
+        self.size = max(0, int(size))
+        self._factory = factory
+        self._idle: deque = deque()
+        self._lock = threading.Lock()
+        self.built = 0
+        self.reused = 0
+        self.overflow = 0
+        for _ in range(self.size):
+            self._idle.append(self._build())
+
+    def _build(self):
+        with self._lock:
+            self.built += 1
+        return self._factory()
+
+    def _take(self):
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.popleft()
+            self.overflow += 1
+        return self._build()
+
+    def _give_back(self, workflow):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(workflow)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """`async with pool.acquire() as workflow:` -- reset on release."""
+        workflow = self._take()
+        try:
+            yield workflow
+        finally:
+            try:
+                await reset_workflow(workflow)
+            except Exception:
+                # never hand a half-reset workflow to the next request
+                logger.exception("WorkflowPool: reset failed; discarding workflow")
+            else:
+                self._give_back(workflow)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "built": self.built,
+                "reused": self.reused,
+                "overflow": self.overflow,
+            }
@@ -37,7 +37,7 @@ async def run_sim():
     if not tasks or not isinstance(tasks, list) or len(tasks) == 0:
         raise AssertionError("Task extractor output missing or empty")
 
-    print(f"Task extractor added {len(tasks)} task(s).")
+    print(f"Task extractor added {len(tasks)} task(s), {task_out.get('stored', len(tasks))} stored.")
 
     # Planner
     if len(step_outputs) > 1:
@@ -1,11 +1,19 @@
-import asyncio
+"""ADK wrappers around the in-memory calendar and reminder tools.
+
+The wrapped tools only touch in-memory structures, so the async methods
+call them inline; a thread hop would cost far more than the work itself.
+"""
+
 try:
     from adk.tools import Tool
 except ImportError:
     from ..adk.tools import Tool
 from tools.calendar_tool import CalendarTool
 from tools.reminder_tool import ReminderTool
-from typing import Any, Dict
+from datetime import datetime
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+from records import Event, Reminder
 
 
 class ADKCalendarTool(Tool):
@@ -13,14 +21,30 @@ class ADKCalendarTool(Tool):
         super().__init__("calendar")
         self._impl = CalendarTool()
 
-    async def add_event(self, title: str, start_time: str, duration_mins: int = 60, notes: str = "") -> Dict[str, Any]:
-        return await asyncio.to_thread(self._impl.add_event, title, start_time, duration_mins, notes)
+    async def add_event(self, title: str, start_time: str, duration_mins: int = 60, notes: str = "",
+                        allow_overlap: bool = True) -> Event:
+        return self._impl.add_event(title, start_time, duration_mins, notes, allow_overlap)
+
+    async def add_events(self, events: Iterable[Mapping[str, Any]], allow_overlap: bool = True) -> List[Event]:
+        return self._impl.add_events(events, allow_overlap)
+
+    async def list_events(self) -> List[Event]:
+        return self._impl.list_events()
 
-    async def list_events(self) -> list:
-        return await asyncio.to_thread(self._impl.list_events)
+    async def events_between(self, start, end) -> List[Event]:
+        return self._impl.events_between(start, end)
+
+    async def overlaps(self, start_time, duration_mins: int = 60) -> List[Event]:
+        return self._impl.overlaps(start_time, duration_mins)
+
+    async def intervals(self) -> List[Tuple[datetime, datetime]]:
+        return self._impl.intervals()
+
+    async def find_free_slots(self, window, duration: int = 30, gap_mins: int = 0) -> List[Tuple[datetime, datetime]]:
+        return self._impl.find_free_slots(window, duration, gap_mins)
 
     async def clear_events(self) -> None:
-        return await asyncio.to_thread(self._impl.clear_events)
+        return self._impl.clear_events()
 
 
 class ADKReminderTool(Tool):
@@ -28,11 +52,17 @@ class ADKReminderTool(Tool):
         super().__init__("reminder")
         self._impl = ReminderTool()
 
-    async def create_reminder(self, task_id: int, remind_at: str) -> Dict[str, Any]:
-        return await asyncio.to_thread(self._impl.create_reminder, task_id, remind_at)
+    async def create_reminder(self, task_id: int, remind_at: str) -> Reminder:
+        return self._impl.create_reminder(task_id, remind_at)
+
+    async def create_reminders(self, reminders: Iterable[Mapping[str, Any]]) -> List[Reminder]:
+        return self._impl.create_reminders(reminders)
+
+    async def pop_due(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[Reminder]:
+        return self._impl.pop_due(now, limit)
 
-    async def list_reminders(self) -> list:
-        return await asyncio.to_thread(self._impl.list_reminders)
+    async def list_reminders(self) -> List[Reminder]:
+        return self._impl.list_reminders()
 
     async def clear_reminders(self) -> None:
-        return await asyncio.to_thread(self._impl.clear_reminders)
+        return self._impl.clear_reminders()
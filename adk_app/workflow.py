@@ -5,18 +5,27 @@ except ImportError:
 
 from adk_app.agents import TaskExtractorAgent, PlannerAgent, ReminderAgent, ReporterAgent
 from adk_app.tools import ADKCalendarTool, ADKReminderTool
+from llm import get_llm
+from tools.invocation import register
 try:
     from state.memory_store import TaskMemory
 except Exception:
     # Fallback lightweight in-memory TaskMemory for environments without TinyDB
     class TaskMemory:
-        def __init__(self, db_path: str = None, tools: dict = None, llm=None):
+        invoke_mode = "inline"
+
+        def __init__(self, db_path: str = None, tools: dict = None, llm=None, in_memory: bool = False):
             self._tasks = []
             self.tools = tools or {}
 
         def store_task(self, task: dict):
             self._tasks.append(task)
 
+        def store_tasks(self, tasks):
+            tasks = list(tasks)
+            self._tasks.extend(tasks)
+            return len(tasks)
+
         def list_tasks(self, include_done: bool = False):
             if include_done:
                 return list(self._tasks)
@@ -32,25 +41,36 @@ except Exception:
             pass
 
 
-def build_workflow():
+def build_workflow(in_memory: bool = False):
     """Construct an ADK Workflow instance that mirrors the original pipeline.
 
     Pipeline: input -> task_extractor -> planner -> reminder -> reporter -> output
+
+    The workflow keeps its `memory` and `tools` as attributes so a pool can
+    reset them between requests; `in_memory=True` keeps tasks off disk.
     """
     # Create tools and memory instances
     calendar = ADKCalendarTool()
     reminder = ADKReminderTool()
     tools = {"calendar": calendar, "reminder": reminder}
 
-    memory = TaskMemory(tools=tools)
+    # All agents share the process-wide LLM (one model handle, one cache)
+    llm = get_llm()
+    memory = TaskMemory(tools=tools, llm=llm, in_memory=in_memory)
+    # classify tool methods once (inline / executor / await) rather than per call
+    for target in (calendar, reminder, memory):
+        register(target)
 
     # Create agents
-    task_agent = TaskExtractorAgent(memory=memory, tools=tools)
-    planner_agent = PlannerAgent(memory=memory, tools=tools)
-    reminder_agent = ReminderAgent(memory=memory, tools=tools)
-    reporter_agent = ReporterAgent(memory=memory, tools=tools)
+    task_agent = TaskExtractorAgent(memory=memory, tools=tools, llm=llm)
+    planner_agent = PlannerAgent(memory=memory, tools=tools, llm=llm)
+    reminder_agent = ReminderAgent(memory=memory, tools=tools, llm=llm)
+    reporter_agent = ReporterAgent(memory=memory, tools=tools, llm=llm)
 
     # Build workflow steps
     steps = [task_agent, planner_agent, reminder_agent, reporter_agent]
 
-    return Workflow(steps)
+    workflow = Workflow(steps)
+    workflow.memory = memory
+    workflow.tools = tools
+    return workflow
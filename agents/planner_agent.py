@@ -1,31 +1,23 @@
-from typing import Dict, Any
-from datetime import datetime
+from collections.abc import Mapping
+from typing import Dict, Any, List
 import json
 import logging
-import re
-from utils import safe_parse_json
-import asyncio
-import inspect
+from utils import JSONStreamParser, safe_parse_json, stream_text
+from schemas import EVENT
+from tools.invocation import invoke
+from normalize import extract_duration
+import os
 
 logger = logging.getLogger(__name__)
 
+# "local": deterministic scheduler only; "hybrid": local schedule plus LLM
+# notes/assumptions; "llm": the LLM plans start times and durations.
+PLANNER_MODE = os.environ.get("WORKFLOWGENIE_PLANNER_MODE", "local").strip().lower()
+
+
+# kept under its old name for existing callers
+extract_duration_from_title = extract_duration
 
-def extract_duration_from_title(title: str) -> tuple[str, int | None]:
-    """Extract duration from task title. Returns (clean_title, duration_mins or None)."""
-    minutes_match = re.search(r'\s+(?:for\s+)?(\d+(?:\.\d+)?)\s+(?:mins?|minutes)\b', title, re.IGNORECASE)
-    if minutes_match:
-        mins = int(float(minutes_match.group(1)))
-        clean_title = re.sub(r'\s+(?:for\s+)?\d+(?:\.\d+)?\s+(?:mins?|minutes)\b', '', title, flags=re.IGNORECASE).strip()
-        return clean_title or title, mins
-    
-    hours_match = re.search(r'\s+(?:for\s+)?(\d+(?:\.\d+)?)\s+(?:hrs?|hours)\b', title, re.IGNORECASE)
-    if hours_match:
-        hours = float(hours_match.group(1))
-        mins = int(hours * 60)
-        clean_title = re.sub(r'\s+(?:for\s+)?\d+(?:\.\d+)?\s+(?:hrs?|hours)\b', '', title, flags=re.IGNORECASE).strip()
-        return clean_title or title, mins
-    
-    return title, None
 PLANNER_PROMPT = """
 You are a scheduling agent. You MUST respond with ONLY a valid JSON object. No other text, no markdown, no explanations.
 
@@ -44,17 +36,34 @@ Tasks input:
 {tasks_json}
 """
 
+ANNOTATE_PROMPT = """
+You are reviewing a schedule. You MUST respond with ONLY a valid JSON object. No other text, no markdown, no explanations.
+
+Return exactly this format:
+{{
+    "notes": {{"event title": "short note"}},
+    "assumptions": ["assumption 1", "assumption 2"]
+}}
+
+Do NOT change any start times or durations.
+
+Schedule:
+{events_json}
+"""
+
 
 async def planner_agent(inputs: Dict[str, Any], memory, tools: Dict, llm) -> Dict:
-    # memory.list_tasks is blocking (TinyDB); run in thread
-    tasks = await asyncio.to_thread(memory.list_tasks)
+    tasks = await invoke(memory, "list_tasks")
+
+    mode = inputs.get("planner_mode") or PLANNER_MODE
+    if mode in ("local", "hybrid"):
+        return await _plan_locally(tasks, tools, llm if mode == "hybrid" else None)
 
     task_duration_map = {}
     tasks_with_durations = []
     for task in tasks:
-        clean_title, extracted_duration = extract_duration_from_title(task.get('title', ''))
-        task_copy = task.copy()
-        task_copy['title'] = clean_title
+        clean_title, extracted_duration = extract_duration(task.get('title', ''))
+        task_copy = dict(task, title=clean_title)
         if extracted_duration is not None:
             task_copy['_user_specified_duration_mins'] = extracted_duration
             task_duration_map[clean_title] = extracted_duration
@@ -62,66 +71,107 @@ async def planner_agent(inputs: Dict[str, Any], memory, tools: Dict, llm) -> Dic
 
     prompt = PLANNER_PROMPT.format(tasks_json=json.dumps(tasks_with_durations, indent=2))
 
-    response_text = await llm.generate(prompt, temperature=0.0, max_tokens=512)
+    events = []
+
+    async def add(ev_objs):
+        events.extend(await _commit_events(ev_objs, task_duration_map, tools))
+
+    # Commit events to the calendar as soon as they close in the stream,
+    # one batch per chunk
+    parser = JSONStreamParser(key="events")
+    async for chunk in stream_text(llm, prompt, temperature=0.0, max_tokens=512):
+        closed = parser.feed(chunk)
+        if closed:
+            await add(closed)
+
+    response_text = parser.text
     logger.info("Planner LLM output: %s", response_text)
 
     plan_obj = safe_parse_json(response_text, default={"events": [], "assumptions": []})
     if not isinstance(plan_obj, dict):
         plan_obj = {"events": [], "assumptions": []}
 
-    events_list = plan_obj.get("events", [])
-    if not isinstance(events_list, list):
-        events_list = []
-
-    events = []
-    for ev_obj in events_list:
-        if not isinstance(ev_obj, dict):
-            continue
-
-        title = (ev_obj.get("title") or "").strip()
-        if not title:
-            continue
-
-        start_time = ev_obj.get("start_time", datetime.utcnow().isoformat())
-
-        duration_mins = ev_obj.get("duration_mins", None)
-        if duration_mins is None or not isinstance(duration_mins, int):
-            try:
-                duration_mins = int(duration_mins) if duration_mins is not None else None
-            except (ValueError, TypeError):
-                duration_mins = None
-
-        if duration_mins is None and title in task_duration_map:
-            duration_mins = task_duration_map[title]
-            logger.info("Using user-specified duration for '%s': %d mins", title, duration_mins)
-
-        if duration_mins is None:
-            duration_mins = 60
-
-        notes = ev_obj.get("notes", "")
-
-        event = {
-            "title": title,
-            "start_time": start_time,
-            "duration_mins": duration_mins,
-            "notes": notes if isinstance(notes, str) else ""
-        }
-
-        if tools and getattr(tools.get('calendar'), 'add_event', None):
-            add_fn = tools['calendar'].add_event
-            if inspect.iscoroutinefunction(add_fn):
-                ev = await add_fn(title=title, start_time=start_time, duration_mins=duration_mins, notes=notes)
-            else:
-                ev = await asyncio.to_thread(add_fn, title=title, start_time=start_time, duration_mins=duration_mins, notes=notes)
-            if isinstance(ev, dict) and 'id' in ev:
-                event['id'] = ev['id']
-        else:
-            import uuid
-            event['id'] = str(uuid.uuid4())
-
-        events.append(event)
+    if not parser.items_emitted:
+        events_list = plan_obj.get("events", [])
+        if isinstance(events_list, list):
+            await add(events_list)
 
     return {
         "events": events,
         "assumptions": plan_obj.get("assumptions", [])
     }
+
+
+async def _plan_locally(tasks, tools: Dict, llm=None) -> Dict:
+    """Schedule with `agents.scheduler`; the LLM, if given, only annotates."""
+    from agents.scheduler import schedule_tasks
+
+    busy = []
+    calendar = tools.get('calendar') if tools else None
+    # prefer the calendar's pre-parsed interval index over raw events
+    if hasattr(calendar, 'intervals'):
+        busy = await invoke(calendar, 'intervals')
+    elif hasattr(calendar, 'list_events'):
+        busy = await invoke(calendar, 'list_events')
+
+    planned, assumptions = schedule_tasks(tasks, busy=busy)
+
+    if llm is not None and planned:
+        prompt = ANNOTATE_PROMPT.format(events_json=json.dumps(planned, indent=2))
+        annotation = safe_parse_json(await llm.generate(prompt, temperature=0.0, max_tokens=512), default={})
+        if isinstance(annotation, dict):
+            notes = annotation.get("notes")
+            if isinstance(notes, dict):
+                for ev in planned:
+                    note = notes.get(ev["title"])
+                    if isinstance(note, str) and note.strip():
+                        ev["notes"] = (ev["notes"] + "; " if ev["notes"] else "") + note.strip()
+            extra = annotation.get("assumptions")
+            if isinstance(extra, list):
+                assumptions += [a for a in extra if isinstance(a, str)]
+
+    events = await _commit_events(planned, {}, tools)
+    return {"events": events, "assumptions": assumptions}
+
+
+def _normalize_event(ev_obj, task_duration_map: Dict[str, int]) -> Dict[str, Any] | None:
+    """Validate one planned event and fill in its duration."""
+    event = EVENT.validate(ev_obj)
+    if event is None:
+        return None
+
+    title = event["title"]
+    duration_mins = event["duration_mins"]
+    if duration_mins is None and title in task_duration_map:
+        duration_mins = task_duration_map[title]
+        logger.info("Using user-specified duration for '%s': %d mins", title, duration_mins)
+
+    if duration_mins is None:
+        duration_mins = 60
+    event["duration_mins"] = duration_mins
+    return event
+
+
+async def _commit_events(ev_objs, task_duration_map: Dict[str, int], tools: Dict) -> List[Dict[str, Any]]:
+    """Normalize planned events and add them to the calendar tool in one call."""
+    events = [e for e in (_normalize_event(ev, task_duration_map) for ev in ev_objs) if e is not None]
+    if not events:
+        return events
+
+    calendar = tools.get('calendar') if tools else None
+    if hasattr(calendar, 'add_events'):
+        added = await invoke(calendar, 'add_events', events)
+    elif hasattr(calendar, 'add_event'):
+        # calendar without a batch API: one call per event
+        added = []
+        for event in events:
+            kwargs = {k: event[k] for k in ("title", "start_time", "duration_mins", "notes")}
+            added.append(await invoke(calendar, 'add_event', **kwargs))
+    else:
+        import uuid
+        added = [{"id": str(uuid.uuid4())} for _ in events]
+
+    for event, ev in zip(events, added):
+        if isinstance(ev, Mapping) and 'id' in ev:
+            event['id'] = ev['id']
+    return events
@@ -1,35 +1,36 @@
 from typing import Dict, Any
-from datetime import datetime, timedelta
+from datetime import timedelta
 import logging
-import dateutil.parser
-import asyncio
-import inspect
+
+from normalize import local_naive, task_due, utcnow
+from records import as_dicts
+from tools.invocation import invoke
 
 logger = logging.getLogger(__name__)
 
 
 async def reminder_agent(inputs: Dict[str, Any], memory, tools: Dict, llm) -> Dict:
-    tasks = await asyncio.to_thread(memory.list_tasks)
-    reminders = []
-    now = datetime.utcnow()
+    tasks = await invoke(memory, 'list_tasks')
+    wanted = []
+    now = utcnow()
     for t in tasks:
-        due = t.get('due')
-        if not due:
-            continue
-        try:
-            dt = dateutil.parser.parse(due)
-            if dt - now < timedelta(days=2):
-                remind_at = (dt - timedelta(hours=1)).isoformat()
-                if tools and getattr(tools.get('reminder'), 'create_reminder', None):
-                    create_fn = tools['reminder'].create_reminder
-                    if inspect.iscoroutinefunction(create_fn):
-                        r = await create_fn(task_id=t['id'], remind_at=remind_at)
-                    else:
-                        r = await asyncio.to_thread(create_fn, task_id=t['id'], remind_at=remind_at)
-                else:
-                    r = {"task_id": t['id'], "remind_at": remind_at}
-                reminders.append(r)
-        except Exception:
-            continue
+        # aware UTC, from the due_at parsed at ingest (or a cached parse of due)
+        dt = task_due(t)
+        if dt is not None and dt - now < timedelta(days=2):
+            # reminders are kept in local time, like calendar events
+            remind_at = local_naive(dt - timedelta(hours=1)).isoformat()
+            wanted.append({"task_id": t['id'], "remind_at": remind_at})
+
+    return {"reminders": as_dicts(await _create_reminders(wanted, tools))}
+
 
-    return {"reminders": reminders}
+async def _create_reminders(wanted, tools: Dict):
+    """Create all reminders with one tool call (falls back to one call each)."""
+    if not wanted:
+        return []
+    tool = tools.get('reminder') if tools else None
+    if hasattr(tool, 'create_reminders'):
+        return await invoke(tool, 'create_reminders', wanted)
+    if not hasattr(tool, 'create_reminder'):
+        return wanted
+    return [await invoke(tool, 'create_reminder', **item) for item in wanted]
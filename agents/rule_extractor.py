@@ -0,0 +1,200 @@
+"""Deterministic task extraction for short, simple inputs.
+
+Inputs like "Finish report by 5pm, study React 2 hours, walk 30 minutes" are
+split into clauses, deadline phrases ("by 5pm", "before Friday", "due
+tomorrow") are parsed with dateutil and rolled forward to their next
+occurrence when already past, and each clause becomes a task. Every
+extraction carries a confidence score; `task_extractor_agent` only uses the
+result when it clears `FAST_PATH_THRESHOLD` and escalates to the LLM
+otherwise.
+"""
+
+import os
+import re
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import dateutil.parser
+
+from normalize import extract_duration
+
+logger = logging.getLogger(__name__)
+
+# Minimum confidence to skip the LLM; anything above 1.0 disables the fast path.
+FAST_PATH_THRESHOLD = float(os.environ.get("WORKFLOWGENIE_FAST_PATH_THRESHOLD", "0.8"))
+MAX_FAST_PATH_CHARS = 300
+
+_CLAUSE_SPLIT = re.compile(r"\s*(?:[;\n•]|,\s*(?:and\s+|then\s+)?|\s+and\s+then\s+|\s+then\s+|\s+and\s+)\s*", re.IGNORECASE)
+_PREAMBLE = re.compile(
+    r"^(?:(?:also|and|then|please|pls|todo:?|-|\*)\s+)*"
+    r"(?:i\s+(?:need|have|want|should|must|gotta|got)\s+to\s+|i\s+(?:should|must|will|'ll)\s+|remind\s+me\s+to\s+|don'?t\s+forget\s+to\s+)?",
+    re.IGNORECASE,
+)
+_DEADLINE = re.compile(
+    r"\s*,?\s*\b(?:by|before|due(?:\s+(?:by|on))?|until|no\s+later\s+than|on"
+    r"|for(?=\s+(?:today|tonight|tomorrow|(?:mon|tues?|wed(?:nes)?|thu(?:rs)?|fri|sat(?:ur)?|sun)(?:day)?)\b))"
+    r"\s+(?P<when>.+)$",
+    re.IGNORECASE,
+)
+_RELATIVE_DAY = re.compile(r"\b(today|tonight|tomorrow|eod|end\s+of\s+(?:the\s+)?day)\b", re.IGNORECASE)
+_WEEKDAY = re.compile(r"\b(?:mon|tues?|wed(?:nes)?|thu(?:rs)?|fri|sat(?:ur)?|sun)(?:day)?\b", re.IGNORECASE)
+# Two defaults differing in year, month and day: a field that comes out the
+# same under both was given in the phrase
+_PROBE_DEFAULTS = (datetime(2000, 1, 1, 17), datetime(2001, 2, 2, 17))
+# Date/time words left in a title after deadline and duration removal
+_TIME_HINT = re.compile(
+    r"\b(?:today|tonight|tomorrow|eod|noon|midnight|next\s+week|this\s+week|weekend"
+    r"|(?:mon|tues?|wed(?:nes)?|thu(?:rs)?|fri|sat(?:ur)?|sun)day"
+    r"|\d{1,2}(?::\d{2})?\s*(?:am|pm)|\d{1,2}:\d{2})\b",
+    re.IGNORECASE,
+)
+_HIGH = re.compile(r"\b(urgent|urgently|asap|important|critical|immediately)\b", re.IGNORECASE)
+_LOW = re.compile(r"\b(maybe|if\s+(?:i\s+have\s+)?time|someday|eventually|low\s+priority)\b", re.IGNORECASE)
+_AMBIGUOUS = re.compile(r"\?|\b(it|that|this|those|them|something|stuff|etc)\b", re.IGNORECASE)
+_PRIORITY_WORDS = re.compile(r"\s*\b(?:urgent(?:ly)?|asap|important|critical|immediately|maybe|someday|eventually|low\s+priority)\b\s*", re.IGNORECASE)
+
+_stats_lock = threading.Lock()
+_stats = {"attempts": 0, "hits": 0, "escalations": 0}
+
+
+def _roll_forward(dt: datetime, phrase: str, now: datetime) -> datetime:
+    """Move a past deadline to the next occurrence the phrase allows.
+
+    "5pm" moves to tomorrow, "Friday" to next week and "April 15" to next
+    year. Phrases that pin the date ("today", a year, "the 15th") are
+    returned unchanged, still in the past.
+    """
+    if dt >= now:
+        return dt
+    if _WEEKDAY.search(phrase):
+        return dt + timedelta(days=7)
+    try:
+        first, second = (dateutil.parser.parse(phrase, default=d) for d in _PROBE_DEFAULTS)
+    except (ValueError, OverflowError):
+        return dt
+    if first.year == second.year:
+        return dt
+    if first.month == second.month:
+        try:
+            return dt.replace(year=dt.year + 1)
+        except ValueError:  # February 29th
+            return dt
+    if first.day == second.day:
+        return dt
+    return dt + timedelta(days=1)
+
+
+def _parse_deadline(phrase: str, now: datetime) -> Optional[datetime]:
+    """Parse a deadline phrase relative to `now`; None if it is not a date/time.
+
+    Past results are rolled forward where the phrase allows (`_roll_forward`).
+    """
+    phrase = phrase.strip().rstrip(".!")
+    base = now.replace(second=0, microsecond=0)
+    rel = _RELATIVE_DAY.search(phrase)
+    if rel:
+        word = rel.group(1).lower()
+        if word == "tomorrow":
+            base = base + timedelta(days=1)
+        phrase = _RELATIVE_DAY.sub("", phrase).strip()
+        if word in ("tonight",) and not phrase:
+            return base.replace(hour=21, minute=0)
+        if not phrase or word.startswith("e"):
+            # a bare day means end of working day
+            return base.replace(hour=17, minute=0)
+        phrase = re.sub(r"^(?:at|@)\s+", "", phrase, flags=re.IGNORECASE)
+    try:
+        dt = dateutil.parser.parse(phrase, default=base.replace(hour=17, minute=0))
+    except (ValueError, OverflowError):
+        return None
+    # "today 3pm" names the day, so a past time there stays past
+    return dt if rel else _roll_forward(dt, phrase, now)
+
+
+def extract_tasks_locally(text: str, now: Optional[datetime] = None) -> Tuple[List[Dict], float]:
+    """Split `text` into TASK_INPUT-shaped dicts and a confidence in [0, 1]."""
+    text = (text or "").strip()
+    if not text or len(text) > MAX_FAST_PATH_CHARS:
+        return [], 0.0
+    now = now or datetime.now()
+
+    tasks = []
+    confidence = 1.0
+    for clause in _CLAUSE_SPLIT.split(text):
+        clause = _PREAMBLE.sub("", clause.strip()).strip(" .!")
+        if not clause:
+            continue
+
+        if _AMBIGUOUS.search(clause):
+            confidence = min(confidence, 0.5)
+
+        priority = "Medium"
+        if _HIGH.search(clause):
+            priority = "High"
+        elif _LOW.search(clause):
+            priority = "Low"
+        clause = _PRIORITY_WORDS.sub(" ", clause).strip(" ,")
+
+        due = None
+        match = _DEADLINE.search(clause)
+        if match:
+            when = match.group("when")
+            dt = _parse_deadline(when, now)
+            if when.strip().isdigit():
+                # "by 5": 5pm or the 5th? leave it to the LLM
+                confidence = min(confidence, 0.6)
+            if dt is None:
+                # "on the project" is not a deadline; keep the clause whole
+                confidence = min(confidence, 0.6)
+            else:
+                if dt < now:
+                    # past even after rolling forward ("today 9am" at noon)
+                    confidence = min(confidence, 0.6)
+                due = dt.isoformat()
+                clause = clause[:match.start()].strip(" ,")
+
+        words = clause.split()
+        if len(words) < 2:
+            # single words ("mom" from "email professor and mom") need context
+            confidence = min(confidence, 0.4)
+        elif len(words) > 10:
+            confidence = min(confidence, 0.6)
+
+        # durations stay in the title; any other date/time word means a
+        # deadline we did not recognize
+        without_duration, _ = extract_duration(" " + clause)
+        if _TIME_HINT.search(without_duration):
+            confidence = min(confidence, 0.6)
+
+        if not clause:
+            confidence = min(confidence, 0.3)
+            continue
+        tasks.append({"title": clause[0].upper() + clause[1:], "due": due, "priority": priority})
+
+    if not tasks:
+        return [], 0.0
+    if len(tasks) > 8:
+        confidence = min(confidence, 0.6)
+    return tasks, confidence
+
+
+def try_fast_path(text: str, threshold: Optional[float] = None,
+                  now: Optional[datetime] = None) -> Optional[List[Dict]]:
+    """Return locally extracted tasks if confident enough, else None."""
+    threshold = FAST_PATH_THRESHOLD if threshold is None else threshold
+    tasks, confidence = extract_tasks_locally(text, now=now)
+    hit = bool(tasks) and confidence >= threshold
+    with _stats_lock:
+        _stats["attempts"] += 1
+        _stats["hits" if hit else "escalations"] += 1
+    logger.info("TaskExtractor fast path: confidence=%.2f threshold=%.2f hit=%s", confidence, threshold, hit)
+    return tasks if hit else None
+
+
+def fast_path_stats() -> Dict[str, float]:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["hit_rate"] = stats["hits"] / stats["attempts"] if stats["attempts"] else 0.0
+    return stats
@@ -1,14 +1,30 @@
 from typing import Dict, Any
-from datetime import datetime
+import time
 import logging
-from utils import extract_json_array
+import threading
+from utils import JSONStreamParser, extract_json_array, stream_text
+from schemas import TASK_INPUT
+from agents.rule_extractor import try_fast_path
+from records import Task, as_dicts
+from normalize import canonical, now_iso
+from tools.invocation import invoke
 
 logger = logging.getLogger(__name__)
 
+_id_lock = threading.Lock()
+_last_id = 0
+
 
 async def task_extractor_agent(inputs: Dict[str, Any], memory, tools: Dict, llm) -> Dict:
     text = inputs.get("text", "")
 
+    # Simple inputs are split locally; only escalate to the LLM when unsure
+    local = try_fast_path(text)
+    if local is not None:
+        tasks = [_build_task(fields) for fields in TASK_INPUT.validate_many(local)]
+        stored = await _store(memory, tasks)
+        return {"added": as_dicts(tasks), "stored": stored}
+
     prompt = """You MUST respond with ONLY a valid JSON array. No other text, no markdown, no explanations.
 
 Return exactly this format:
@@ -25,42 +41,66 @@ CRITICAL RULES:
 Extract tasks from this text:
 """ + text
 
-    # Use async LLM
-    raw = await llm.generate(prompt, temperature=0.0, max_tokens=512)
+    # Stream the LLM output and build each task as soon as its object closes
+    tasks = []
+    parser = JSONStreamParser()
+    async for chunk in stream_text(llm, prompt, temperature=0.0, max_tokens=512):
+        for task_obj in parser.feed(chunk):
+            fields = TASK_INPUT.validate(task_obj)
+            if fields is not None:
+                tasks.append(_build_task(fields))
+
+    raw = parser.text
     logger.info("TaskExtractor LLM output: %s", raw)
 
-    tasks_json = extract_json_array(raw, default=[])
-
-    tasks = []
-    for task_obj in tasks_json:
-        if not isinstance(task_obj, dict):
-            continue
-
-        title = (task_obj.get("title") or "").strip()
-        if not title:
-            continue
-
-        due = task_obj.get("due")
-        if due and isinstance(due, str):
-            due = due.strip() if due.strip().lower() not in ("null", "none", "n/a") else None
-
-        priority = task_obj.get("priority", "Medium")
-        if priority not in ("High", "Medium", "Low"):
-            priority = "Medium"
-
-        task = {
-            "id": int(datetime.utcnow().timestamp() * 1000),
-            "title": title,
-            "created_at": datetime.utcnow().isoformat(),
-            "due": due,
-            "priority": priority,
-            "done": False,
-        }
-
-        if hasattr(memory, 'store_task'):
-            # TinyDB operations are blocking; run in a thread
-            import asyncio
-            await asyncio.to_thread(memory.store_task, task)
-        tasks.append(task)
-
-    return {"added": tasks}
\ No newline at end of file
+    if not parser.items_emitted:
+        # Output was not a streamable array; fall back to whole-text repair
+        tasks = [_build_task(fields) for fields in TASK_INPUT.validate_many(extract_json_array(raw, default=[]))]
+
+    stored = await _store(memory, tasks)
+    return {"added": as_dicts(tasks), "stored": stored}
+
+
+async def _store(memory, tasks) -> int:
+    """Persist all extracted tasks in one batch (one write, at most one thread hop).
+
+    Returns how many the store actually wrote; dedup may reject some.
+    """
+    if not tasks:
+        return 0
+    if hasattr(memory, 'store_tasks'):
+        stored = await invoke(memory, 'store_tasks', tasks)
+        if stored is None:
+            stored = len(tasks)
+    elif hasattr(memory, 'store_task'):
+        # stores that report nothing per task are taken to have written it
+        stored = 0
+        for t in tasks:
+            stored += await invoke(memory, 'store_task', t) is not False
+    else:
+        return 0
+    if stored < len(tasks):
+        logger.info("TaskExtractor: store kept %d of %d extracted task(s); the rest were duplicates or blank",
+                    stored, len(tasks))
+    return stored
+
+
+def _next_task_id() -> int:
+    """Millisecond timestamp id, bumped so tasks built in the same ms differ."""
+    global _last_id
+    with _id_lock:
+        _last_id = max(int(time.time() * 1000), _last_id + 1)
+        return _last_id
+
+
+def _build_task(fields: Dict[str, Any]) -> Task:
+    """Turn validated TASK_INPUT fields into a stored task record."""
+    return Task(
+        id=_next_task_id(),
+        title=fields["title"],
+        created_at=now_iso(),
+        due=fields["due"],
+        due_at=canonical(fields["due"]),
+        priority=fields["priority"],
+        done=False,
+    )
\ No newline at end of file
@@ -0,0 +1,4 @@
+"""Micro-benchmarks for WorkflowGenie hot paths.
+
+Each module is runnable on its own, e.g. `python -m benchmarks.json_parse_bench`.
+"""
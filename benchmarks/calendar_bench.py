@@ -0,0 +1,55 @@
+"""
+Benchmark: CalendarTool interval index vs scanning every event.
+
+Fills a calendar with N events spread over a year, then times a one-day
+range query, an overlap check and a free-slot search through the index
+against the equivalent linear scan that parses every `start_time` (what
+callers had to do before the index existed). Each n is run again with one
+two-year event added, which must not widen the index's lookback.
+
+Usage:
+    python -m benchmarks.calendar_bench
+"""
+
+import timeit
+from datetime import datetime, timedelta
+
+from agents.scheduler import busy_intervals
+from tools.calendar_tool import CalendarTool
+
+BASE = datetime(2025, 1, 6, 9)
+
+
+def _calendar(n: int) -> CalendarTool:
+    calendar = CalendarTool()
+    for i in range(n):
+        start = BASE + timedelta(days=i % 365, hours=(i * 7) % 8)
+        calendar.add_event(f"Event {i}", start.isoformat(), 30 + (i % 4) * 15)
+    return calendar
+
+
+def _scan_between(calendar: CalendarTool, start: datetime, end: datetime):
+    return [(s, e) for s, e in busy_intervals(calendar.list_events()) if s < end and e > start]
+
+
+def _us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    day = BASE + timedelta(days=180)
+    window = (day.replace(hour=9), day.replace(hour=17))
+    for n, long_event in ((1000, False), (10000, False), (50000, False), (50000, True)):
+        calendar = _calendar(n)
+        if long_event:
+            calendar.add_event("Sabbatical", BASE.isoformat(), 2 * 365 * 24 * 60)
+        number = max(1, 20000 // n)
+        print(f"n={n}" + (" + one two-year event" if long_event else ""))
+        print(f"  range query   index {_us(lambda: calendar.events_between(*window), 2000):9.1f} us"
+              f"   scan {_us(lambda: _scan_between(calendar, *window), number):10.1f} us")
+        print(f"  overlap check index {_us(lambda: calendar.overlaps(window[0], 60), 2000):9.1f} us")
+        print(f"  free slots    index {_us(lambda: calendar.find_free_slots(window, 30), 2000):9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: `utils.safe_parse_json` against the previous regex cascade.
+
+Runs both parsers over a corpus of malformed LLM responses of the kind the
+agents see in practice (prose around JSON, code fences, trailing commas,
+truncated output, brackets inside strings) plus a large generated response,
+and reports how many inputs each recovers and the time per call.
+The scanner is linear in the input length; the cascade decodes the text
+once per regex guess and gives up on wrapped or truncated output.
+
+Usage:
+    python -m benchmarks.json_parse_bench
+"""
+
+import json
+import re
+import timeit
+
+from utils import safe_parse_json
+
+CORPUS = [
+    '[{"title": "Finish report", "due": "2025-11-25T17:00:00", "priority": "High"}]',
+    'Sure! Here are your tasks:\n[{"title": "Study React 2 hours", "due": null, "priority": "Medium"}]',
+    '```json\n[\n  {"title": "Walk 30 minutes", "due": null, "priority": "Low"}\n]\n```',
+    '```\n{"events": [{"title": "Standup", "start_time": "2025-11-25T09:00:00", "duration_mins": 15, "notes": ""}], "assumptions": []}\n```',
+    '{"summary": "Good week", "completed_count": 3, "pending_count": 1, "top_actions": ["Ship it",],}',
+    '[{"title": "Email professor", "due": "2025-11-25T17:00:00", "priority": "High"},]',
+    'Here is the plan {"events": [{"title": "Deep work [focus]", "start_time": "2025-11-25T10:00:00", "duration_mins": 90, "notes": "no {meetings}"}], "assumptions": ["9-5"]} Let me know!',
+    '[{"title": "Buy groceries", "due": null, "priority": "Low"}, {"title": "Call mom", "due": "2025-11-26T18:00',
+    '{"events": [{"title": "Gym", "start_time": "2025-11-25T07:00:00", "duration_mins": 60, "notes": ""}, {"title": "Read", "start_ti',
+    'Step [1]: nothing yet. ```json\n{"summary": "ok", "completed_count": 0, "pending_count": 2, "top_actions": []}\n```',
+    'I could not find tasks. {"status": "acknowledged"}',
+    '[{"title": "He said \\"done]\\" already", "due": null, "priority": "Medium"}]',
+    'No JSON here at all, sorry.',
+]
+
+
+def _large_body(n: int = 300) -> str:
+    tasks = [
+        {"title": f"Task {i} for 30 minutes", "due": f"2025-12-{(i % 28) + 1:02d}T09:00:00", "priority": "Medium"}
+        for i in range(n)
+    ]
+    return json.dumps(tasks, indent=2)
+
+
+def large_wrapped(n: int = 300) -> str:
+    """A long valid array wrapped in prose, the common large-output shape."""
+    return "Here are the tasks {as requested}:\n" + _large_body(n) + "\nLet me know [if] anything changes."
+
+
+def large_fenced(n: int = 300) -> str:
+    """A long valid array in a ```json fence, which both parsers recover."""
+    return "Here you go:\n```json\n" + _large_body(n) + "\n```"
+
+
+def large_truncated(n: int = 300) -> str:
+    """A long array with a fence, a trailing comma and no closing bracket."""
+    body = _large_body(n)
+    return "Here you go:\n```json\n" + body[:-2] + ",\n"
+
+
+def legacy_safe_parse_json(text: str, default=None):
+    """The regex cascade `safe_parse_json` used before the single-pass scanner."""
+    if not text:
+        return default
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    match = re.search(r'```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```', text, re.DOTALL)
+    if match:
+        try:
+            return json.loads(match.group(1))
+        except json.JSONDecodeError:
+            pass
+    for pattern in (r'\{.*\}', r'\[.*\]'):
+        found = re.search(pattern, text, re.DOTALL)
+        if found:
+            try:
+                return json.loads(found.group(0))
+            except json.JSONDecodeError:
+                pass
+    return default
+
+
+def _bench(fn, inputs, number: int) -> float:
+    timer = timeit.Timer(lambda: [fn(t) for t in inputs])
+    return min(timer.repeat(repeat=5, number=number)) / (number * len(inputs))
+
+
+def main():
+    import logging
+    logging.getLogger("utils").setLevel(logging.ERROR)
+
+    fenced = [large_fenced()]
+    wrapped = [large_wrapped()]
+    truncated = [large_truncated()]
+    print(f"{'parser':<10} {'recovered':>10} {'corpus us':>10} {'fenced us':>10} "
+          f"{'wrapped us':>11} {'truncated us':>13}")
+    for name, fn in (("legacy", legacy_safe_parse_json), ("scanner", safe_parse_json)):
+        recovered = sum(fn(t) is not None for t in CORPUS + fenced + wrapped + truncated)
+        corpus_us = _bench(fn, CORPUS, 200) * 1e6
+        fenced_us = _bench(fn, fenced, 20) * 1e6
+        wrapped_us = _bench(fn, wrapped, 20) * 1e6
+        truncated_us = _bench(fn, truncated, 20) * 1e6
+        total = len(CORPUS) + 3
+        print(f"{name:<10} {recovered:>7}/{total:<2} {corpus_us:>10.1f} {fenced_us:>10.1f} "
+              f"{wrapped_us:>11.1f} {truncated_us:>13.1f}")
+    print("legacy recovers neither the wrapped nor the truncated response; "
+          "its time there is the cost of giving up")
+
+
+if __name__ == "__main__":
+    main()
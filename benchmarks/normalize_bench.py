@@ -0,0 +1,91 @@
+"""
+Benchmark: memoized normalization vs the per-call parsing it replaced.
+
+Builds a corpus of task titles and due strings with the repetition a real
+history has (the same tasks are re-read by every agent on every run), then
+times:
+
+- durations: the old uncompiled `re.search` + `re.sub` per title against
+  `normalize.extract_duration`,
+- dates: `dateutil.parser.parse` per due string (what `reminder_agent` did)
+  against `normalize.parse_datetime`, and reading the `due_at` stored at
+  ingest with `normalize.task_due`.
+
+"cold" runs start with empty caches; "warm" runs repeat the pass, as the
+next agent or the next run would.
+
+Usage:
+    python -m benchmarks.normalize_bench
+"""
+
+import re
+import time
+import random
+from datetime import datetime, timedelta
+
+import dateutil.parser
+
+import normalize
+
+N = 50000
+DISTINCT = 2000
+
+
+def _old_extract_duration(title):
+    minutes_match = re.search(r'\s+(?:for\s+)?(\d+(?:\.\d+)?)\s+(?:mins?|minutes)\b', title, re.IGNORECASE)
+    if minutes_match:
+        mins = int(float(minutes_match.group(1)))
+        clean_title = re.sub(r'\s+(?:for\s+)?\d+(?:\.\d+)?\s+(?:mins?|minutes)\b', '', title, flags=re.IGNORECASE).strip()
+        return clean_title or title, mins
+    hours_match = re.search(r'\s+(?:for\s+)?(\d+(?:\.\d+)?)\s+(?:hrs?|hours)\b', title, re.IGNORECASE)
+    if hours_match:
+        mins = int(float(hours_match.group(1)) * 60)
+        clean_title = re.sub(r'\s+(?:for\s+)?\d+(?:\.\d+)?\s+(?:hrs?|hours)\b', '', title, flags=re.IGNORECASE).strip()
+        return clean_title or title, mins
+    return title, None
+
+
+def _corpus():
+    rng = random.Random(7)
+    base = datetime(2025, 11, 24, 9)
+    shapes = ["Study chapter {i} for 2 hours", "Walk {i} 30 minutes", "Finish report {i}",
+              "Call client {i} 1.5 hrs", "Email team about item {i}"]
+    due_shapes = [lambda d: d.isoformat(), lambda d: d.strftime("%Y-%m-%d %H:%M"),
+                  lambda d: d.strftime("%b %d %Y %I:%M %p"), lambda d: d.isoformat() + "+00:00"]
+    titles = [shapes[i % len(shapes)].format(i=i) for i in range(DISTINCT)]
+    dues = [due_shapes[i % len(due_shapes)](base + timedelta(hours=i)) for i in range(DISTINCT)]
+    picks = [rng.randrange(DISTINCT) for _ in range(N)]
+    tasks = [{"title": titles[i], "due": dues[i], "due_at": normalize.canonical(dues[i])} for i in picks]
+    return [titles[i] for i in picks], [dues[i] for i in picks], tasks
+
+
+def _time(label, fn, items):
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<36} {elapsed / len(items) * 1e6:8.2f} us/item")
+
+
+def main():
+    titles, dues, tasks = _corpus()
+    print(f"{N} items, {DISTINCT} distinct titles / due strings")
+
+    _time("duration  old regex per call", _old_extract_duration, titles)
+    normalize.extract_duration.cache_clear()
+    _time("duration  normalize (cold)", normalize.extract_duration, titles)
+    _time("duration  normalize (warm)", normalize.extract_duration, titles)
+
+    _time("due       dateutil per call", dateutil.parser.parse, dues)
+    normalize._parse_str.cache_clear()
+    _time("due       parse_datetime (cold)", normalize.parse_datetime, dues)
+    _time("due       parse_datetime (warm)", normalize.parse_datetime, dues)
+    _time("due       task_due from due_at", normalize.task_due, tasks)
+
+    print()
+    for name, info in normalize.cache_info().items():
+        print(f"cache {name:<9} hits={info['hits']:<7} misses={info['misses']:<6} size={info['currsize']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: local scheduler vs the LLM-planned `planner_agent` path.
+
+Times `agents.scheduler.schedule_tasks` for growing task lists against a
+calendar that already has events, then runs `planner_agent` end to end in
+"local", "hybrid" and "llm" mode. The model is a stub that streams a plan
+for the given tasks with hosted-model latency (first token after
+FIRST_TOKEN_S, then CHARS_PER_S of output), so the LLM legs measure a
+realistic round-trip without an API key and without the offline fallback,
+which ignores the tasks.
+
+Usage:
+    python -m benchmarks.planner_bench
+"""
+
+import json
+import time
+import timeit
+import asyncio
+from datetime import datetime, timedelta
+
+from agents.planner_agent import planner_agent
+from agents.scheduler import schedule_tasks
+from normalize import extract_duration
+from tools.calendar_tool import CalendarTool
+
+# roughly a hosted "flash" model: ~0.4 s to first token, ~200 tokens/s
+FIRST_TOKEN_S = 0.4
+CHARS_PER_S = 800.0
+CHUNK_CHARS = 40
+
+
+def _tasks(n: int):
+    base = datetime(2025, 11, 24, 9)
+    shapes = [
+        lambda i: {"title": f"Finish report {i}", "due": (base + timedelta(hours=i)).isoformat(), "priority": "High"},
+        lambda i: {"title": f"Study chapter {i} 2 hours", "due": None, "priority": "Medium"},
+        lambda i: {"title": f"Walk {i} 30 minutes", "due": None, "priority": "Low"},
+        lambda i: {"title": f"Email contact {i}", "due": (base + timedelta(days=i % 5)).isoformat(), "priority": "Medium"},
+    ]
+    return [shapes[i % len(shapes)](i) for i in range(n)]
+
+
+def _busy(n: int):
+    base = datetime(2025, 11, 24, 11)
+    return [{"start_time": (base + timedelta(hours=5 * i)).isoformat(), "duration_mins": 45} for i in range(n)]
+
+
+class _Memory:
+    def __init__(self, tasks):
+        self._tasks = tasks
+
+    def list_tasks(self):
+        return list(self._tasks)
+
+
+class _StubLLM:
+    """Answers planner prompts for `tasks` with simulated model latency."""
+
+    def __init__(self, tasks):
+        start = datetime(2025, 11, 24, 9)
+        events = []
+        for i, task in enumerate(tasks):
+            title, mins = extract_duration(task["title"])
+            events.append({"title": title, "start_time": (start + timedelta(minutes=70 * i)).isoformat(),
+                           "duration_mins": mins or 60, "notes": ""})
+        self._plan = json.dumps({"events": events, "assumptions": ["Tasks prioritized by deadline"]})
+        self._notes = json.dumps({"notes": {e["title"]: "Block out distractions" for e in events},
+                                  "assumptions": ["Working hours 09:00-17:00"]})
+
+    async def generate_stream(self, prompt: str, **kwargs):
+        await asyncio.sleep(FIRST_TOKEN_S)
+        text = self._plan
+        for i in range(0, len(text), CHUNK_CHARS):
+            chunk = text[i:i + CHUNK_CHARS]
+            await asyncio.sleep(len(chunk) / CHARS_PER_S)
+            yield chunk
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        text = self._notes if "reviewing a schedule" in prompt else self._plan
+        await asyncio.sleep(FIRST_TOKEN_S + len(text) / CHARS_PER_S)
+        return text
+
+
+async def _plan(mode: str, tasks) -> float:
+    tools = {"calendar": CalendarTool()}
+    started = time.perf_counter()
+    await planner_agent({"planner_mode": mode}, _Memory(tasks), tools, _StubLLM(tasks))
+    return time.perf_counter() - started
+
+
+def main():
+    start = datetime(2025, 11, 24, 8, 50)
+    for n in (10, 100, 500):
+        tasks, busy = _tasks(n), _busy(n // 4)
+        number = max(1, 2000 // n)
+        t = min(timeit.repeat(lambda: schedule_tasks(tasks, busy, start=start), number=number, repeat=5)) / number
+        print(f"schedule_tasks n={n:<4} {t * 1e3:8.3f} ms/plan  {t / n * 1e6:6.1f} us/task")
+
+    tasks = _tasks(10)
+    print(f"planner_agent, stub model: {FIRST_TOKEN_S:.1f} s to first token, {CHARS_PER_S:.0f} chars/s")
+    for mode in ("local", "hybrid", "llm"):
+        t = min(asyncio.run(_plan(mode, tasks)) for _ in range(3))
+        print(f"planner_agent mode={mode:<6} n=10  {t * 1e3:9.3f} ms/plan")
+
+
+if __name__ == "__main__":
+    main()
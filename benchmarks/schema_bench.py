@@ -0,0 +1,69 @@
+"""
+Benchmark: `schemas.TASK_INPUT.validate_many` over extracted task lists.
+
+Compares the schema validator with the field-by-field checks the task
+extractor used to hand-roll, on a mix of clean and messy LLM task objects.
+The two are timed alternately and the best of 25 rounds is reported, since
+single runs vary more than the difference between them. The schema runs
+its checks in one inline loop, so it lands within a few percent of the
+hand-rolled checks (which skip the type checks on `title` and `due`); it is
+not faster, but it is one set of rules shared by every agent.
+
+Usage:
+    python -m benchmarks.schema_bench
+"""
+
+import timeit
+
+from schemas import TASK_INPUT, EVENT
+
+
+def _tasks(n: int):
+    shapes = [
+        {"title": "Finish report", "due": "2025-11-25T17:00:00", "priority": "High"},
+        {"title": "  study React 2 hours ", "due": "null", "priority": "urgent"},
+        {"title": "", "due": None},
+        {"title": "walk 30 minutes"},
+        "not a task",
+    ]
+    return [shapes[i % len(shapes)] for i in range(n)]
+
+
+def hand_rolled(items):
+    """The per-field checks task_extractor_agent used before schemas.py."""
+    out = []
+    for task_obj in items:
+        if not isinstance(task_obj, dict):
+            continue
+        title = (task_obj.get("title") or "").strip()
+        if not title:
+            continue
+        due = task_obj.get("due")
+        if due and isinstance(due, str):
+            due = due.strip() if due.strip().lower() not in ("null", "none", "n/a") else None
+        priority = task_obj.get("priority", "Medium")
+        if priority not in ("High", "Medium", "Low"):
+            priority = "Medium"
+        out.append({"title": title, "due": due, "priority": priority})
+    return out
+
+
+def main():
+    for n in (10, 1000):
+        items = _tasks(n)
+        number = max(1, 20000 // n)
+        runs = (("hand-rolled", hand_rolled), ("schema", TASK_INPUT.validate_many))
+        best = {name: float("inf") for name, _ in runs}
+        for _ in range(25):
+            for name, fn in runs:
+                best[name] = min(best[name], timeit.timeit(lambda: fn(items), number=number) / (number * n))
+        for name, t in best.items():
+            print(f"tasks n={n:<5} {name:<12} {t * 1e6:6.2f} us/item")
+
+    events = [{"title": "Standup", "start_time": "2025-11-25T09:00:00", "duration_mins": "15"}] * 1000
+    t = min(timeit.repeat(lambda: EVENT.validate_many(events), number=20, repeat=5)) / (20 * 1000)
+    print(f"events n=1000  schema       {t * 1e6:6.2f} us/item")
+
+
+if __name__ == "__main__":
+    main()
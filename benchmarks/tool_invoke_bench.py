@@ -0,0 +1,61 @@
+"""
+Benchmark: per-call overhead of tool invocation from agent code.
+
+Compares, for cheap in-memory tool calls:
+
+- the old agent pattern: `inspect.iscoroutinefunction` on every call, then
+  `asyncio.to_thread` for sync tools (and the ADK wrappers' own
+  `asyncio.to_thread` inside async methods),
+- `tools.invocation.invoke`, which classifies each method once and calls
+  in-memory tools inline.
+
+Then prints the per-method timing that `invoke` records.
+
+Usage:
+    python -m benchmarks.tool_invoke_bench
+"""
+
+import time
+import asyncio
+import inspect
+
+from adk_app.tools import ADKCalendarTool
+from tools import invocation
+from tools.calendar_tool import CalendarTool
+
+CALLS = 5000
+
+
+async def _old_style(tool):
+    fn = tool.list_events
+    if inspect.iscoroutinefunction(fn):
+        # the ADK wrappers used to hop to a thread inside the coroutine
+        return await asyncio.to_thread(tool._impl.list_events)
+    return await asyncio.to_thread(fn)
+
+
+async def _time(label, call):
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        await call()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34} {elapsed / CALLS * 1e6:8.1f} us/call")
+
+
+async def main():
+    plain, adk = CalendarTool(), ADKCalendarTool()
+    for tool in (plain, adk._impl):
+        tool.add_events([{"title": f"Event {i}", "start_time": f"2025-11-24T{9 + i % 8:02d}:00:00"} for i in range(20)])
+
+    await _time("plain  to_thread (old)", lambda: _old_style(plain))
+    await _time("plain  invoke (inline)", lambda: invocation.invoke(plain, "list_events"))
+    await _time("ADK    to_thread in wrapper (old)", lambda: _old_style(adk))
+    await _time("ADK    invoke (await, inline impl)", lambda: invocation.invoke(adk, "list_events"))
+
+    print()
+    for key, row in invocation.stats().items():
+        print(f"{key:<24} {row['mode']:<8} calls={row['calls']:<6} avg={row['avg_s'] * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
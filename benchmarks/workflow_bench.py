@@ -0,0 +1,92 @@
+"""
+Benchmark: per-request orchestration overhead of `workflows.workflow.run`.
+
+Runs a four-step workflow whose steps do no real work (one async step
+awaiting `asyncio.to_thread`, like the agents' TinyDB reads) so only the
+orchestration cost is measured:
+
+- per-step:    the previous `run()`, one `asyncio.run` per async step
+- per-request: one `asyncio.run` around `run_async`
+- persistent:  `run()` submitting into the shared `workflows.runtime` loop
+
+Usage:
+    python -m benchmarks.workflow_bench
+"""
+
+import time
+import asyncio
+import inspect
+
+from workflows import runtime
+from workflows.workflow import Workflow, run, run_async
+
+
+def _noop():
+    return None
+
+
+async def extract(inputs, memory, tools, llm):
+    await asyncio.to_thread(_noop)
+    return {"added": []}
+
+
+async def plan(inputs, memory, tools, llm):
+    await asyncio.to_thread(_noop)
+    return {"events": []}
+
+
+async def remind(inputs, memory, tools, llm):
+    await asyncio.to_thread(_noop)
+    return {"reminders": []}
+
+
+async def report(inputs, memory, tools, llm):
+    await asyncio.to_thread(_noop)
+    return {"summary": ""}
+
+
+class _Memory:
+    tools: dict = {}
+    llm = None
+
+
+def _workflow() -> Workflow:
+    w = Workflow("bench")
+    w.set_entrypoint(extract)
+    for step in (plan, remind, report):
+        w.add_step(step, depends_on=["extract"])
+    return w
+
+
+def run_per_step(workflow, memory, inputs):
+    """The orchestration `run()` used before the shared runtime loop."""
+    result = {}
+    for step_func, step_name in workflow.steps:
+        if inspect.iscoroutinefunction(step_func):
+            result[step_name] = asyncio.run(step_func(inputs, memory, {}, None))
+        else:
+            result[step_name] = step_func(inputs, memory, {}, None)
+    return result
+
+
+def run_per_request(workflow, memory, inputs):
+    return asyncio.run(run_async(workflow, memory, inputs))
+
+
+def _time(fn, workflow, memory, n=300) -> float:
+    fn(workflow, memory, {})  # warm up (starts the runtime loop for `run`)
+    started = time.perf_counter()
+    for _ in range(n):
+        fn(workflow, memory, {})
+    return (time.perf_counter() - started) / n
+
+
+def main():
+    workflow, memory = _workflow(), _Memory()
+    for name, fn in (("per-step", run_per_step), ("per-request", run_per_request), ("persistent", run)):
+        print(f"{name:<12} {_time(fn, workflow, memory) * 1e3:7.3f} ms/request")
+    runtime.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -214,7 +214,7 @@ POST /run → user_input="Send internship form by tomorrow..."
     Input: "Extract tasks from this text: ..."
     Output JSON: [{"title": "...", "due": "...", "priority": "..."}]
     Stores in memory.store_task(task)
-    Returns: {"added": [task1, task2, task3]}
+    Returns: {"added": [task1, task2, task3], "stored": 3}
     ↓
 [2] PlannerAgent.llm(PLANNER_PROMPT.format(tasks_json=...))
     Input: Template with actual task JSON injected
@@ -1,5 +1,6 @@
 import os
 import sys
+import asyncio
 import logging
 
 # When running this file directly (python legacy/server_flask.py), the
@@ -16,9 +17,12 @@ from dotenv import load_dotenv  # noqa: E402
 # Now safe to import local top-level packages
 from workflows.workflow import build_workflow, run  # noqa: E402
 from state.memory_store import TaskMemory  # noqa: E402
-from llm import LLM  # noqa: E402
+from llm import get_llm, warmup  # noqa: E402
 from tools.calendar_tool import CalendarTool  # noqa: E402
 from tools.reminder_tool import ReminderTool  # noqa: E402
+from tools.reminder_dispatcher import ReminderDispatcher, make_sink  # noqa: E402
+from workflows import runtime  # noqa: E402
+from records import as_dicts  # noqa: E402
 
 # Load .env after module-level imports so import ordering rules are preserved.
 load_dotenv()
@@ -26,6 +30,12 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Copy each /run's tasks into the shared TinyDB file once the run completes.
+# Off by default: runs then touch no shared file at all.
+PERSIST_RUNS = os.environ.get("WORKFLOWGENIE_PERSIST_RUNS", "").lower() in ("1", "true", "yes")
+# Deliver due reminders: "log" or a webhook URL (unset = reminders never fire)
+REMINDER_SINK = os.environ.get("WORKFLOWGENIE_REMINDER_SINK", "").strip()
+
 
 def create_app():
     # Configure Flask to serve the legacy static folder at the URL path `/static`.
@@ -33,7 +43,8 @@ def create_app():
     app = Flask("workflowgenie", static_folder=STATIC_DIR, static_url_path="/static")
 
     logger.info("Flask server startup: initializing LLM, tools and memory")
-    llm = LLM()
+    warmup()
+    llm = get_llm()
     calendar = CalendarTool()
     reminder = ReminderTool()
     tools = {"calendar": calendar, "reminder": reminder}
@@ -45,6 +56,12 @@ def create_app():
     app.config["tools"] = tools
     app.config["memory"] = memory
     app.config["workflow"] = workflow
+    app.config["dispatcher"] = None
+    if REMINDER_SINK:
+        dispatcher = ReminderDispatcher(reminder, make_sink(REMINDER_SINK))
+        asyncio.run_coroutine_threadsafe(dispatcher.run(), runtime.get_loop())
+        app.config["dispatcher"] = dispatcher
+        logger.info("Reminder dispatcher started (sink: %s)", REMINDER_SINK)
 
     @app.route("/", methods=["GET"])
     def root():
@@ -81,13 +98,18 @@ def create_app():
         calendar = CalendarTool()
         reminder = ReminderTool()
         tools = {"calendar": calendar, "reminder": reminder}
-        memory = TaskMemory(tools=tools, llm=app.config.get("llm"))
-        memory.cleanup_on_startup()
+        # Session-scoped memory: concurrent runs never share or clear each
+        # other's tasks, and nothing is written to disk on the hot path.
+        memory = TaskMemory(tools=tools, llm=app.config.get("llm"), in_memory=True)
         workflow = app.config.get("workflow")
+        persist_to = app.config.get("memory") if PERSIST_RUNS else None
         
         try:
-            result = run(workflow, memory=memory, inputs={"text": text})
-            # Result captured; DB already cleared by workflow.run()
+            result = run(workflow, memory=memory, inputs={"text": text}, persist_to=persist_to)
+            if app.config.get("dispatcher") is not None:
+                # hand this run's reminders to the app-wide tool so they fire later
+                app.config["tools"]["reminder"].create_reminders(reminder.list_reminders())
+            # Result captured; session memory already cleared by workflow.run()
             calendar.clear_events()
             reminder.clear_reminders()
             return jsonify({"ok": True, "result": result})
@@ -104,7 +126,7 @@ def create_app():
     def tasks():
         include_done = request.args.get("include_done", "false").lower() in ("1", "true", "yes")
         memory: TaskMemory = app.config.get("memory")
-        return jsonify({"tasks": memory.list_tasks(include_done=include_done)})
+        return jsonify({"tasks": as_dicts(memory.list_tasks(include_done=include_done))})
 
     @app.route("/tasks/<int:task_id>/done", methods=["POST"])
     def mark_done(task_id):
@@ -115,18 +137,17 @@ def create_app():
     @app.route("/events", methods=["GET"])
     def events():
         tools = app.config.get("tools")
-        return jsonify({"events": tools["calendar"].list_events()})
+        return jsonify({"events": as_dicts(tools["calendar"].list_events())})
 
     @app.route("/reminders", methods=["GET"])
     def reminders():
         tools = app.config.get("tools")
-        return jsonify({"reminders": tools["reminder"].list_reminders()})
+        return jsonify({"reminders": as_dicts(tools["reminder"].list_reminders())})
 
     @app.route("/clear_db", methods=["POST"])
     def clear_db():
-        from state.memory_store import TaskMemory
-        mem = TaskMemory()
-        mem.clear_db()
+        memory: TaskMemory = app.config.get("memory")
+        memory.clear_db()
         return jsonify({"status": "ok", "message": "Database cleared"})
 
     @app.route("/tasks/<int:task_id>/delete", methods=["POST", "DELETE"])
@@ -2,11 +2,20 @@
 
 This module keeps a synchronous callable for backward compatibility but
 adds an async `generate()` method so ADK agents can `await llm.generate(...)`.
+The async path uses the SDK's native async API when available and every
+upstream call passes through a shared `LLMLimiter` (max in-flight, RPM, TPM)
+and a per-instance `ResilientCaller` (deadline, retries, hedging, breaker).
 """
 
 import os
 import logging
 import asyncio
+import threading
+from typing import AsyncIterator, Optional
+
+from llm_cache import ResponseCache, SingleFlight, make_key
+from llm_limits import LLMLimiter, estimate_tokens
+from llm_resilience import ResilientCaller
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -33,6 +42,13 @@ except Exception as e:
     logger.warning(f"Gemini initialization failed: {e}")
     _GENAI_AVAILABLE = False
 
+# Process-wide response cache shared by every LLM instance unless one is passed in.
+DEFAULT_CACHE = ResponseCache.from_env()
+# Process-wide coalescing of identical in-flight prompts.
+DEFAULT_INFLIGHT = SingleFlight()
+# Process-wide bound on in-flight upstream calls and RPM/TPM budgets.
+DEFAULT_LIMITER = LLMLimiter.from_env()
+
 
 class LLM:
     """LLM wrapper supporting both sync call and async generate().
@@ -40,59 +56,191 @@ class LLM:
     - `llm = LLM()` creates an instance.
     - `await llm.generate(prompt, ...)` is the preferred async API.
     - `llm(prompt, ...)` remains supported for existing synchronous code.
+    - `async for chunk in llm.generate_stream(prompt, ...)` yields text as the
+      model produces it.
+
+    Successful responses are served from `cache` (a `ResponseCache`) when the
+    same (model, prompt, params) was answered before. Fallback output produced
+    after an upstream error is never cached. Concurrent misses for the same key
+    are collapsed by `inflight` (a `SingleFlight`) into one upstream call,
+    which then waits for a slot from `limiter` (an `LLMLimiter`). Transient
+    upstream errors are retried by `resilience` (a `ResilientCaller`); canned
+    `_fallback` output is only returned once retries are exhausted or the
+    circuit breaker is open, and is counted in `stats()["fallbacks"]`.
     """
 
-    def __init__(self, model: str = DEFAULT_MODEL):
+    def __init__(self, model: str = DEFAULT_MODEL, cache: Optional[ResponseCache] = None,
+                 inflight: Optional[SingleFlight] = None, model_config: Optional[dict] = None,
+                 limiter: Optional[LLMLimiter] = None, resilience: Optional[ResilientCaller] = None):
         self.model = model
+        self.model_config = dict(model_config or {})
         self.enabled = _GENAI_AVAILABLE
+        self.cache = cache if cache is not None else DEFAULT_CACHE
+        self.inflight = inflight if inflight is not None else DEFAULT_INFLIGHT
+        self.limiter = limiter if limiter is not None else DEFAULT_LIMITER
+        self.resilience = resilience if resilience is not None else ResilientCaller()
+        self.fallbacks = 0
 
     def __call__(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0, **kwargs) -> str:
         """Synchronous call (backward compatible)."""
+        key = self._cache_key(prompt, max_tokens, temperature, **kwargs)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        return self.inflight.do(key, self._call_uncached, key, prompt, max_tokens, temperature, **kwargs)
+
+    def _call_uncached(self, key: str, prompt: str, max_tokens: int, temperature: float, **kwargs) -> str:
         if not self.enabled:
-            return self._fallback(prompt)
+            return self._cache_set(key, self._fallback(prompt))
 
         try:
-            model = genai.GenerativeModel(self.model)
-            response = model.generate_content(prompt)
-            if hasattr(response, "text") and response.text:
-                return response.text.strip()
-            return str(response)
+            text = self.resilience.call_sync(
+                lambda: self._limited_sync_generate(prompt, max_tokens, temperature, **kwargs))
+            return self._cache_set(key, text)
         except Exception as e:
-            msg = str(e).lower()
-            logger.warning(f"LLM sync call failed: {e}")
-            # If the error indicates the model or method is not available,
-            # disable remote Gemini for this instance and fall back.
-            if "404" in msg or "not found" in msg or "not supported" in msg:
-                logger.info("Disabling remote Gemini for this LLM instance (fallback mode).")
-                self.enabled = False
+            # Retries are exhausted or the breaker is open; the breaker
+            # (not a permanent flag) decides when Gemini is tried again.
+            logger.warning(f"LLM sync call failed, using fallback output: {e}")
+            self.fallbacks += 1
             return self._fallback(prompt)
 
     async def generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0, **kwargs) -> str:
         """Async generation API compatible with ADK agents.
 
-        Uses thread execution for blocking SDK calls so the async loop isn't blocked.
+        Uses the SDK's async API when present and falls back to thread
+        execution for blocking SDK calls so the async loop isn't blocked.
         """
+        key = self._cache_key(prompt, max_tokens, temperature, **kwargs)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        return await self.inflight.do_async(key, self._generate_uncached, key, prompt, max_tokens, temperature, **kwargs)
+
+    async def _generate_uncached(self, key: str, prompt: str, max_tokens: int, temperature: float, **kwargs) -> str:
         if not self.enabled:
-            return self._fallback(prompt)
+            return self._cache_set(key, self._fallback(prompt))
 
         try:
-            # run the blocking SDK call in a thread
-            return await asyncio.to_thread(self._sync_generate, prompt, max_tokens, temperature, **kwargs)
+            text = await self.resilience.call(
+                lambda: self._limited_generate(prompt, max_tokens, temperature, **kwargs))
+            return self._cache_set(key, text)
         except Exception as e:
-            msg = str(e).lower()
-            logger.warning(f"LLM async generate failed: {e}")
-            if "404" in msg or "not found" in msg or "not supported" in msg:
-                logger.info("Disabling remote Gemini for this LLM instance (fallback mode).")
-                self.enabled = False
+            logger.warning(f"LLM async generate failed, using fallback output: {e}")
+            self.fallbacks += 1
             return self._fallback(prompt)
 
+    async def generate_stream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0,
+                              **kwargs) -> AsyncIterator[str]:
+        """Yield response text chunks as Gemini streams them.
+
+        Cache hits, offline mode and SDKs without async streaming yield the
+        whole response as one chunk. Errors before the first chunk fall back to
+        the resilient `generate()` path; an error mid-stream ends the stream
+        and callers parse what they have. Streams are not coalesced. A stream
+        cancelled or closed by its consumer before it ends gives back a
+        half-open breaker probe, as `ResilientCaller.call`/`call_sync` do.
+        """
+        key = self._cache_key(prompt, max_tokens, temperature, **kwargs)
+        cached = self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        if not self.enabled:
+            yield self._cache_set(key, self._fallback(prompt))
+            return
+
+        model = get_model(self.model, **self.model_config)
+        generate_async = getattr(model, "generate_content_async", None)
+        if generate_async is None or not self.resilience.breaker.allow():
+            yield await self.generate(prompt, max_tokens, temperature, **kwargs)
+            return
+
+        parts = []
+        settled = False
+        try:
+            async with self.limiter.slot(estimate_tokens(prompt, max_tokens)):
+                response = await generate_async(prompt, stream=True)
+                async for chunk in response:
+                    text = getattr(chunk, "text", "") or ""
+                    if text:
+                        parts.append(text)
+                        yield text
+            settled = True
+            self.resilience.breaker.record_success()
+        except Exception as e:
+            settled = True
+            self.resilience.breaker.record_failure()
+            if not parts:
+                logger.warning(f"LLM stream failed before first chunk, retrying unstreamed: {e}")
+                yield await self.generate(prompt, max_tokens, temperature, **kwargs)
+                return
+            logger.warning(f"LLM stream interrupted after {len(parts)} chunk(s): {e}")
+            return
+        finally:
+            # cancelled, or abandoned by the consumer (GeneratorExit): there is
+            # no outcome, so give back a half-open probe instead of holding it
+            if not settled:
+                self.resilience.breaker.release()
+
+        if parts:
+            self._cache_set(key, "".join(parts).strip())
+
+    async def _limited_generate(self, prompt: str, max_tokens: int, temperature: float, **kwargs) -> str:
+        async with self.limiter.slot(estimate_tokens(prompt, max_tokens)):
+            return await self._async_generate(prompt, max_tokens, temperature, **kwargs)
+
+    def _limited_sync_generate(self, prompt: str, max_tokens: int, temperature: float, **kwargs) -> str:
+        with self.limiter.slot_sync(estimate_tokens(prompt, max_tokens)):
+            return self._sync_generate(prompt, max_tokens, temperature, **kwargs)
+
     def _sync_generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0, **kwargs) -> str:
-        model = genai.GenerativeModel(self.model)
-        response = model.generate_content(prompt)
+        model = get_model(self.model, **self.model_config)
+        return self._response_text(model.generate_content(prompt))
+
+    async def _async_generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0, **kwargs) -> str:
+        model = get_model(self.model, **self.model_config)
+        generate_async = getattr(model, "generate_content_async", None)
+        if generate_async is None:
+            # older SDKs: run the blocking call in a thread
+            return await asyncio.to_thread(self._sync_generate, prompt, max_tokens, temperature, **kwargs)
+        return self._response_text(await generate_async(prompt))
+
+    @staticmethod
+    def _response_text(response) -> str:
         if hasattr(response, "text") and response.text:
             return response.text.strip()
         return str(response)
 
+    def _cache_key(self, prompt: str, max_tokens: int, temperature: float, **kwargs) -> str:
+        # Offline answers live in their own namespace so they are never served
+        # once a real Gemini backend becomes available.
+        backend = "gemini" if self.enabled else "offline"
+        if self.model_config:
+            kwargs["model_config"] = self.model_config
+        return make_key(f"{backend}:{self.model}", prompt,
+                        max_tokens=max_tokens, temperature=temperature, **kwargs)
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return self.cache.get(key)
+
+    def _cache_set(self, key: str, text: str) -> str:
+        if self.cache is not None:
+            self.cache.set(key, text)
+        return text
+
+    def stats(self) -> dict:
+        """Cache and coalescing counters for observability."""
+        return {
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "inflight": self.inflight.stats(),
+            "limiter": self.limiter.stats(),
+            "resilience": self.resilience.stats(),
+            "fallbacks": self.fallbacks,
+        }
+
     def _fallback(self, prompt: str) -> str:
         p = prompt.lower()
 
@@ -108,6 +256,56 @@ class LLM:
         return '{"status": "acknowledged"}'
 
 
+_MODEL_HANDLES: dict = {}
+_LLM_INSTANCES: dict = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _config_key(model: str, config: dict) -> str:
+    return make_key(model, "", **config) if config else model
+
+
+def get_model(model: str = DEFAULT_MODEL, **config):
+    """Return a process-wide cached `genai.GenerativeModel` for (model, config)."""
+    key = _config_key(model, config)
+    handle = _MODEL_HANDLES.get(key)
+    if handle is None:
+        with _REGISTRY_LOCK:
+            handle = _MODEL_HANDLES.get(key)
+            if handle is None:
+                handle = genai.GenerativeModel(model, **config)
+                _MODEL_HANDLES[key] = handle
+    return handle
+
+
+def get_llm(model: str = DEFAULT_MODEL, **config) -> LLM:
+    """Return the shared `LLM` for (model, config), creating it on first use.
+
+    Agents and workflows should use this instead of constructing `LLM()` so
+    the model handle, cache and coalescing state are shared process-wide.
+    """
+    key = _config_key(model, config)
+    llm = _LLM_INSTANCES.get(key)
+    if llm is None:
+        with _REGISTRY_LOCK:
+            llm = _LLM_INSTANCES.get(key)
+            if llm is None:
+                llm = LLM(model, model_config=config)
+                _LLM_INSTANCES[key] = llm
+    return llm
+
+
+def warmup(models=(DEFAULT_MODEL,)) -> None:
+    """Create shared LLMs and model handles ahead of the first request."""
+    for model in models:
+        llm = get_llm(model)
+        if llm.enabled:
+            try:
+                get_model(model, **llm.model_config)
+            except Exception as e:
+                logger.warning(f"LLM warmup failed for {model}: {e}")
+
+
 # Export a convenient default instance for synchronous codepaths
-DEFAULT_LLM = LLM()
+DEFAULT_LLM = get_llm()
 
@@ -0,0 +1,311 @@
+"""Content-addressed response cache and request coalescing for `llm.LLM`.
+
+Responses are keyed on a SHA-256 digest of (backend, model, prompt, generation
+params). A bounded in-memory LRU tier serves repeated prompts without touching
+the network; an optional SQLite tier keeps entries across restarts, bounded
+by its own row limit and pruned of expired rows as it is written.
+`SingleFlight` uses the same key so identical in-flight prompts share one call.
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_SIZE = int(os.environ.get("WORKFLOWGENIE_LLM_CACHE_SIZE", "1024"))
+CACHE_TTL = float(os.environ.get("WORKFLOWGENIE_LLM_CACHE_TTL", "3600"))
+CACHE_PATH = os.environ.get("WORKFLOWGENIE_LLM_CACHE_PATH")
+DISK_CACHE_SIZE = int(os.environ.get("WORKFLOWGENIE_LLM_CACHE_DISK_SIZE", "10000"))
+
+
+def make_key(model: str, prompt: str, **params: Any) -> str:
+    """Return a stable hex digest for a (model, prompt, params) triple."""
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "params": params},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _SQLiteTier:
+    """Persistent key/value tier backed by a single SQLite table.
+
+    Every `PRUNE_EVERY` writes (and on open) expired rows are deleted and,
+    past `max_rows`, the oldest writes go first; the table can therefore
+    overshoot the limit by at most `PRUNE_EVERY` rows.
+    """
+
+    PRUNE_EVERY = 64
+
+    def __init__(self, path: str, max_rows: int = DISK_CACHE_SIZE):
+        self.path = path
+        self.max_rows = max(1, int(max_rows))
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_responses_expires ON llm_responses (expires_at)")
+
+    def get(self, key: str, now: float) -> Optional[tuple]:
+        row = self._conn.execute(
+            "SELECT value, expires_at FROM llm_responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] <= now:
+            self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            return None
+        return row
+
+    def set(self, key: str, value: str, expires_at: Optional[float], now: float) -> Tuple[int, int]:
+        """Store a row; returns (expired, evicted) if this write triggered a prune."""
+        # REPLACE gives the row a new rowid, so rowid order is write order
+        self._conn.execute(
+            "INSERT OR REPLACE INTO llm_responses (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+        self._writes += 1
+        if self._writes < self.PRUNE_EVERY:
+            return 0, 0
+        return self.prune(now)
+
+    def prune(self, now: float) -> Tuple[int, int]:
+        """Delete expired rows, then the oldest beyond `max_rows`; returns (expired, evicted)."""
+        self._writes = 0
+        expired = self._conn.execute(
+            "DELETE FROM llm_responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        ).rowcount
+        evicted = self._conn.execute(
+            "DELETE FROM llm_responses WHERE rowid IN"
+            " (SELECT rowid FROM llm_responses ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        ).rowcount
+        return expired, evicted
+
+    def clear(self):
+        self._conn.execute("DELETE FROM llm_responses")
+
+    def close(self):
+        self._conn.close()
+
+
+class ResponseCache:
+    """Thread-safe LRU response cache with TTLs and an optional SQLite tier.
+
+    - `get(key)` returns the cached text or None and updates hit/miss counters.
+    - `set(key, value)` stores a response and evicts the least recently used
+      entry once `max_entries` is exceeded.
+    - `persist_path` enables the on-disk tier; memory misses fall through to it.
+      It holds up to `disk_entries` rows; its evictions and expirations are
+      counted with the memory tier's.
+    """
+
+    def __init__(self, max_entries: int = CACHE_SIZE, ttl: Optional[float] = CACHE_TTL,
+                 persist_path: Optional[str] = None, disk_entries: int = DISK_CACHE_SIZE):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._disk = None
+        if persist_path:
+            self._disk = _SQLiteTier(persist_path, disk_entries)
+            self._count_pruned(self._disk.prune(time.time()))
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        return cls(max_entries=CACHE_SIZE, ttl=CACHE_TTL, persist_path=CACHE_PATH, disk_entries=DISK_CACHE_SIZE)
+
+    def _count_pruned(self, pruned: Tuple[int, int]):
+        self.expirations += pruned[0]
+        self.evictions += pruned[1]
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+
+            if self._disk is not None:
+                row = self._disk.get(key, now)
+                if row is not None:
+                    self._store(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        with self._lock:
+            self._store(key, value, expires_at)
+            if self._disk is not None:
+                try:
+                    self._count_pruned(self._disk.set(key, value, expires_at, now))
+                except sqlite3.Error as e:
+                    logger.warning("LLM cache: persistent write failed: %s", e)
+
+    def _store(self, key: str, value: str, expires_at: Optional[float]):
+        if self.max_entries == 0:
+            return
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._disk is not None:
+                self._disk.clear()
+
+    def close(self):
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class _LeaderGone(Exception):
+    """Set on a shared future when its leader was interrupted, not failed."""
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into one upstream call.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is in flight wait for and receive the leader's result or
+    exception. Futures are `concurrent.futures.Future` so coalescing works
+    across threads and event loops (Flask worker threads each run their own).
+    Only `Exception`s are shared: if the leader is interrupted (cancelled,
+    KeyboardInterrupt, SystemExit) the key is released and a waiting caller
+    takes over as leader.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._tasks = set()     # detached async calls, kept alive until done
+        self.leaders = 0
+        self.collapsed = 0
+
+    def _claim(self, key: str) -> tuple:
+        with self._lock:
+            fut = self._calls.get(key)
+            if fut is not None:
+                self.collapsed += 1
+                return fut, False
+            fut = Future()
+            self._calls[key] = fut
+            self.leaders += 1
+            return fut, True
+
+    def _settle(self, key: str, fut: Future, result: Any = None, exc: Optional[BaseException] = None):
+        with self._lock:
+            if self._calls.get(key) is fut:
+                del self._calls[key]
+        if exc is not None:
+            fut.set_exception(exc if isinstance(exc, Exception) else _LeaderGone())
+        else:
+            fut.set_result(result)
+
+    def do(self, key: str, fn: Callable, /, *args, **kwargs) -> Any:
+        """Run blocking `fn` once per key; concurrent callers share its result."""
+        while True:
+            fut, leader = self._claim(key)
+            if leader:
+                break
+            try:
+                return fut.result()
+            except _LeaderGone:
+                continue
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._settle(key, fut, exc=e)
+            raise
+        self._settle(key, fut, result)
+        return result
+
+    async def do_async(self, key: str, fn: Callable, /, *args, **kwargs) -> Any:
+        """Await coroutine function `fn` once per key; concurrent callers share its result.
+
+        The call runs as its own task, so cancelling the leader (or any
+        follower) only stops that caller from waiting; the others still get
+        the result.
+        """
+        while True:
+            fut, leader = self._claim(key)
+            if leader:
+                break
+            try:
+                # shield so a cancelled follower does not cancel the shared future
+                return await asyncio.shield(asyncio.wrap_future(fut))
+            except _LeaderGone:
+                continue
+        task = asyncio.ensure_future(fn(*args, **kwargs))
+        self._tasks.add(task)
+        task.add_done_callback(lambda t: self._settle_task(key, fut, t))
+        return await asyncio.shield(task)
+
+    def _settle_task(self, key: str, fut: Future, task: "asyncio.Task"):
+        self._tasks.discard(task)
+        if task.cancelled():
+            self._settle(key, fut, exc=_LeaderGone())
+        elif task.exception() is not None:
+            self._settle(key, fut, exc=task.exception())
+        else:
+            self._settle(key, fut, task.result())
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "collapsed": self.collapsed,
+            }
@@ -0,0 +1,175 @@
+"""Concurrency and rate limiting for upstream LLM calls.
+
+`LLMLimiter` combines a bounded number of in-flight calls with token buckets
+for requests-per-minute and tokens-per-minute. All primitives are thread-safe
+and not bound to an event loop, so one limiter can be shared by the Flask
+worker threads and any number of asyncio loops.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional
+
+MAX_CONCURRENCY = int(os.environ.get("WORKFLOWGENIE_LLM_MAX_CONCURRENCY", "8"))
+REQUESTS_PER_MINUTE = float(os.environ.get("WORKFLOWGENIE_LLM_RPM", "0"))
+TOKENS_PER_MINUTE = float(os.environ.get("WORKFLOWGENIE_LLM_TPM", "0"))
+
+
+def estimate_tokens(prompt: str, max_tokens: int = 0) -> int:
+    """Rough token estimate (~4 chars per token) plus the output budget."""
+    return len(prompt) // 4 + 1 + max(0, int(max_tokens or 0))
+
+
+class TokenBucket:
+    """Token bucket that lets callers reserve capacity ahead of time.
+
+    `reserve(amount)` always succeeds and returns the number of seconds the
+    caller must wait before proceeding; the bucket goes into debt so later
+    callers queue behind earlier ones in arrival order.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # a single request larger than the bucket would otherwise never fit
+            self._tokens -= min(float(amount), self.capacity)
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class ConcurrencyLimiter:
+    """FIFO counting semaphore usable from threads and any event loop."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, int(limit))
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    def _try_acquire(self) -> Optional[Future]:
+        with self._lock:
+            if self.in_flight < self.limit and not self._waiters:
+                self.in_flight += 1
+                return None
+            waiter = Future()
+            self._waiters.append(waiter)
+            return waiter
+
+    async def acquire(self):
+        waiter = self._try_acquire()
+        if waiter is None:
+            return
+        try:
+            await asyncio.wrap_future(waiter)
+        except asyncio.CancelledError:
+            # the slot may have been handed over just before cancellation
+            with self._lock:
+                handed = not waiter.cancel() and not waiter.cancelled()
+            if handed:
+                self.release()
+            raise
+
+    def acquire_sync(self):
+        waiter = self._try_acquire()
+        if waiter is not None:
+            waiter.result()
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                # hand the slot directly to the next live waiter
+                if waiter.set_running_or_notify_cancel():
+                    waiter.set_result(None)
+                    return
+            self.in_flight -= 1
+
+
+class LLMLimiter:
+    """Bound in-flight LLM calls and enforce RPM/TPM budgets.
+
+    Use `async with limiter.slot(tokens):` (or `with limiter.slot_sync(...)`)
+    around each upstream call. Time spent waiting for a slot or for bucket
+    capacity is recorded as queue wait.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY,
+                 requests_per_minute: float = REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = TOKENS_PER_MINUTE):
+        self.concurrency = ConcurrencyLimiter(max_concurrency)
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    @classmethod
+    def from_env(cls) -> "LLMLimiter":
+        return cls(MAX_CONCURRENCY, REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+
+    def _bucket_delay(self, tokens: int) -> float:
+        delay = 0.0
+        if self.requests is not None:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.reserve(tokens))
+        return delay
+
+    def _record_wait(self, waited: float):
+        with self._lock:
+            self.calls += 1
+            self.queue_wait_total += waited
+            self.queue_wait_max = max(self.queue_wait_max, waited)
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0):
+        started = time.perf_counter()
+        await self.concurrency.acquire()
+        try:
+            delay = self._bucket_delay(tokens)
+            if delay:
+                await asyncio.sleep(delay)
+            self._record_wait(time.perf_counter() - started)
+            yield
+        finally:
+            self.concurrency.release()
+
+    @contextmanager
+    def slot_sync(self, tokens: int = 0):
+        started = time.perf_counter()
+        self.concurrency.acquire_sync()
+        try:
+            delay = self._bucket_delay(tokens)
+            if delay:
+                time.sleep(delay)
+            self._record_wait(time.perf_counter() - started)
+            yield
+        finally:
+            self.concurrency.release()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "in_flight": self.concurrency.in_flight,
+                "max_concurrency": self.concurrency.limit,
+                "calls": self.calls,
+                "queue_wait_total_s": round(self.queue_wait_total, 6),
+                "queue_wait_avg_s": round(self.queue_wait_total / self.calls, 6) if self.calls else 0.0,
+                "queue_wait_max_s": round(self.queue_wait_max, 6),
+            }
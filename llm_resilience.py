@@ -0,0 +1,328 @@
+"""Retries, hedging, deadlines and circuit breaking for upstream LLM calls.
+
+`ResilientCaller.call(factory)` runs an async call factory with:
+
+- a per-call deadline covering every attempt and backoff sleep,
+- jittered exponential retries for transient errors (429/5xx/timeouts),
+- an optional hedged duplicate request once the primary has been running
+  longer than a fixed threshold or the observed p95 latency,
+- a `CircuitBreaker` that opens after repeated failures and lets a single
+  half-open probe through after a cool-down instead of disabling forever.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CALL_DEADLINE = float(os.environ.get("WORKFLOWGENIE_LLM_DEADLINE", "60"))
+ATTEMPT_TIMEOUT = float(os.environ.get("WORKFLOWGENIE_LLM_ATTEMPT_TIMEOUT", "30"))
+MAX_ATTEMPTS = int(os.environ.get("WORKFLOWGENIE_LLM_MAX_ATTEMPTS", "3"))
+# "p95" hedges at the observed p95 latency, a number hedges after that many
+# seconds, and "off" (the default) disables hedging.
+HEDGE_AFTER = os.environ.get("WORKFLOWGENIE_LLM_HEDGE_AFTER", "off")
+
+_TRANSIENT_MARKERS = (
+    "429", "500", "502", "503", "504", "deadline", "timeout", "timed out",
+    "temporarily", "unavailable", "resource exhausted", "rate limit",
+    "connection", "reset by peer", "internal error",
+)
+_PERMANENT_MARKERS = ("404", "not found", "not supported", "permission", "401", "403")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the circuit breaker rejects a call without trying it."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Return True if `exc` looks like a retryable upstream failure."""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    msg = str(exc).lower()
+    if any(m in msg for m in _PERMANENT_MARKERS):
+        return False
+    return any(m in msg for m in _TRANSIENT_MARKERS)
+
+
+def is_permanent(exc: BaseException) -> bool:
+    """Return True if `exc` says the model or method does not exist."""
+    msg = str(exc).lower()
+    return any(m in msg for m in _PERMANENT_MARKERS)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, max_attempts: int = MAX_ATTEMPTS, base_delay: float = 0.25, max_delay: float = 4.0):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures.
+
+    While open, calls are rejected until `reset_timeout` elapses; then one
+    half-open probe is allowed. A successful probe closes the circuit, a failed
+    one re-opens it. Permanent errors (e.g. unknown model) open it immediately.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self):
+        """Give back a probe that ended without an outcome (cancelled, abandoned).
+
+        The breaker stays half-open and the next call may probe again.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self, permanent: bool = False):
+        with self._lock:
+            self._failures += 1
+            if permanent or self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.trips += 1
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ResilientCaller:
+    """Run upstream calls with deadlines, retries, hedging and a breaker."""
+
+    def __init__(self, retry: Optional[RetryPolicy] = None, breaker: Optional[CircuitBreaker] = None,
+                 deadline: float = CALL_DEADLINE, attempt_timeout: float = ATTEMPT_TIMEOUT,
+                 hedge_after: Any = HEDGE_AFTER):
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.hedge_after = hedge_after
+        self.latency = LatencyTracker()
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _hedge_delay(self) -> Optional[float]:
+        setting = str(self.hedge_after).strip().lower()
+        if setting in ("", "off", "none", "0"):
+            return None
+        if setting == "p95":
+            return self.latency.percentile(0.95)
+        try:
+            return float(setting)
+        except ValueError:
+            return None
+
+    async def call(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `factory()` with retries; raises the last error on failure.
+
+        The breaker sees one outcome per logical call, not one per attempt;
+        a call cancelled before it has one releases its half-open probe.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM circuit breaker is open")
+        settled = False
+        try:
+            loop = asyncio.get_running_loop()
+            expires = loop.time() + self.deadline
+            attempt = 0
+            while True:
+                attempt += 1
+                remaining = expires - loop.time()
+                started = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(self._hedged(factory), min(self.attempt_timeout, remaining))
+                except Exception as e:
+                    if isinstance(e, asyncio.TimeoutError):
+                        self._count("timeouts")
+                    permanent = is_permanent(e)
+                    if permanent or not is_transient(e) or attempt >= self.retry.max_attempts:
+                        settled = True
+                        self.breaker.record_failure(permanent=permanent)
+                        raise
+                    delay = self.retry.backoff(attempt)
+                    if loop.time() + delay >= expires:
+                        settled = True
+                        self.breaker.record_failure()
+                        raise
+                    logger.info("LLM call failed (%s); retry %d in %.2fs", e, attempt, delay)
+                    self._count("retries")
+                    await asyncio.sleep(delay)
+                    continue
+                self.latency.record(time.perf_counter() - started)
+                settled = True
+                self.breaker.record_success()
+                return result
+        finally:
+            if not settled:
+                self.breaker.release()
+
+    async def _hedged(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        delay = self._hedge_delay()
+        if delay is None:
+            return await factory()
+
+        primary = asyncio.ensure_future(factory())
+        hedge = None
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            self._count("hedges")
+            hedge = asyncio.ensure_future(factory())
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    if fut.exception() is None:
+                        if fut is hedge:
+                            self._count("hedge_wins")
+                        return fut.result()
+                    error = fut.exception()
+            raise error
+        finally:
+            # also reached when the caller's timeout or cancel lands mid-wait
+            for fut in (primary, hedge):
+                if fut is not None and not fut.done():
+                    fut.cancel()
+
+    def call_sync(self, fn: Callable[[], Any]) -> Any:
+        """Blocking variant of `call()` (retries and breaker, no hedging)."""
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM circuit breaker is open")
+        settled = False
+        try:
+            expires = time.monotonic() + self.deadline
+            attempt = 0
+            while True:
+                attempt += 1
+                started = time.perf_counter()
+                try:
+                    result = fn()
+                except Exception as e:
+                    permanent = is_permanent(e)
+                    if permanent or not is_transient(e) or attempt >= self.retry.max_attempts:
+                        settled = True
+                        self.breaker.record_failure(permanent=permanent)
+                        raise
+                    delay = self.retry.backoff(attempt)
+                    if time.monotonic() + delay >= expires:
+                        settled = True
+                        self.breaker.record_failure()
+                        raise
+                    logger.info("LLM call failed (%s); retry %d in %.2fs", e, attempt, delay)
+                    self._count("retries")
+                    time.sleep(delay)
+                    continue
+                self.latency.record(time.perf_counter() - started)
+                settled = True
+                self.breaker.record_success()
+                return result
+        finally:
+            if not settled:
+                self.breaker.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {
+                "retries": self.retries,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "timeouts": self.timeouts,
+            }
+        counters["p95_latency_s"] = self.latency.percentile(0.95)
+        counters["breaker"] = self.breaker.stats()
+        return counters
@@ -0,0 +1,123 @@
+"""Shared date and duration normalization for agents, tools and stores.
+
+Everything here is memoized or precompiled, so agents can call it once per
+task per run without repeating parsing work:
+
+- `parse_datetime` turns an ISO-ish string (or datetime) into an aware UTC
+  datetime; naive values are taken as local time. String results are kept
+  in an LRU cache keyed on the string and today's date, since dateutil
+  fills relative inputs ("Friday 5pm") in from the current date.
+- `canonical` gives the aware UTC ISO string stored as a task's `due_at` at
+  ingest. Downstream agents read it back with `fromisoformat` and never
+  need dateutil.
+- `local_naive` gives the naive local datetime that the scheduler, calendar
+  and reminder tools work in.
+- `extract_duration` strips "30 minutes" / "2 hours" from a title, using
+  precompiled patterns and an LRU cache.
+- `utcnow` / `now_iso` replace the scattered `datetime.utcnow()` calls with
+  timezone-aware timestamps.
+"""
+
+import os
+import re
+from datetime import date, datetime, time, timezone
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import dateutil.parser
+
+# Entries in each of the date and title caches
+CACHE_SIZE = int(os.environ.get("WORKFLOWGENIE_PARSE_CACHE_SIZE", "4096"))
+
+_MINUTES = re.compile(r"\s+(?:for\s+)?(\d+(?:\.\d+)?)\s+(?:mins?|minutes)\b", re.IGNORECASE)
+_HOURS = re.compile(r"\s+(?:for\s+)?(\d+(?:\.\d+)?)\s+(?:hrs?|hours)\b", re.IGNORECASE)
+
+
+def utcnow() -> datetime:
+    """Aware current UTC time."""
+    return datetime.now(timezone.utc)
+
+
+def now_iso() -> str:
+    """Current UTC time as an aware ISO 8601 string (for created_at etc.)."""
+    return utcnow().isoformat()
+
+
+def _parse(value: str, today: date) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        # missing fields come from `today`, which is part of the cache keys
+        return dateutil.parser.parse(value, default=datetime.combine(today, time()))
+    except (ValueError, OverflowError):
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_str(value: str, today: date) -> Optional[datetime]:
+    dt = _parse(value, today)
+    # naive values are local time; astimezone() interprets them that way
+    return dt.astimezone(timezone.utc) if dt is not None else None
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Aware UTC datetime from a string or datetime; None if unusable."""
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc)
+    if isinstance(value, str):
+        value = value.strip()
+        if value:
+            return _parse_str(value, date.today())
+    return None
+
+
+def canonical(value: Any) -> Optional[str]:
+    """Aware UTC ISO string for `value`, or None."""
+    dt = parse_datetime(value)
+    return dt.isoformat() if dt is not None else None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _local_str(value: str, today: date) -> Optional[datetime]:
+    dt = _parse(value, today)
+    if dt is not None and dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def local_naive(value: Any) -> Optional[datetime]:
+    """Naive local datetime from a string or datetime; None if unusable."""
+    if isinstance(value, datetime):
+        return value.astimezone().replace(tzinfo=None) if value.tzinfo is not None else value
+    if isinstance(value, str):
+        value = value.strip()
+        if value:
+            return _local_str(value, date.today())
+    return None
+
+
+def task_due(task: Mapping[str, Any]) -> Optional[datetime]:
+    """A task's deadline as aware UTC, preferring the `due_at` set at ingest."""
+    return parse_datetime(task.get("due_at") or task.get("due"))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def extract_duration(title: str) -> Tuple[str, Optional[int]]:
+    """Extract duration from task title. Returns (clean_title, duration_mins or None)."""
+    match = _MINUTES.search(title)
+    if match:
+        clean_title = _MINUTES.sub("", title).strip()
+        return clean_title or title, int(float(match.group(1)))
+    match = _HOURS.search(title)
+    if match:
+        clean_title = _HOURS.sub("", title).strip()
+        return clean_title or title, int(float(match.group(1)) * 60)
+    return title, None
+
+
+def cache_info() -> Dict[str, Any]:
+    """Hit/miss counters of the memoized parsers."""
+    return {name: fn.cache_info()._asdict()
+            for name, fn in (("datetime", _parse_str), ("local", _local_str), ("duration", extract_duration))}
@@ -0,0 +1,141 @@
+"""Compact, immutable Task/Event/Reminder records.
+
+Records use `__slots__` instead of a per-instance dict and implement the
+read-only `Mapping` interface, so existing code that does `task["title"]`,
+`task.get("due")` or `dict(task)` keeps working. Because records never
+change in place (`replace()` returns a new one), stores and tools hand out
+the stored objects themselves instead of defensive copies. Convert with
+`to_dict()` / `as_dicts()` at JSON boundaries; keys not in `FIELDS` are
+kept in a side dict and round-trip unchanged. `to_row()` / `from_row()` use
+a positional list instead, for bulk storage such as snapshots.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+_MISSING = object()
+
+
+class Record(Mapping):
+    """Base class; subclasses set FIELDS and DEFAULTS (matching __slots__)."""
+
+    FIELDS: Tuple[str, ...] = ()
+    DEFAULTS: Dict[str, Any] = {}
+    __slots__ = ("_extra",)
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        # slot setters in FIELDS order, for from_row()
+        cls._setters = tuple(getattr(cls, name).__set__ for name in cls.FIELDS)
+
+    def __init__(self, **values: Any):
+        setter = object.__setattr__
+        for name in self.FIELDS:
+            value = values.pop(name, _MISSING)
+            if value is _MISSING:
+                value = self.DEFAULTS.get(name)
+            setter(self, name, value)
+        setter(self, "_extra", values or None)
+
+    @classmethod
+    def from_mapping(cls, data: Mapping) -> "Record":
+        """Build from any mapping (returns `data` itself if already a `cls`)."""
+        if type(data) is cls:
+            return data
+        return cls(**data)
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Record":
+        """Build from `to_row()` output without going through keyword arguments."""
+        record = object.__new__(cls)
+        for set_field, value in zip(cls._setters, row):
+            set_field(record, value)
+        extra = row[len(cls.FIELDS)] if len(row) > len(cls.FIELDS) else None
+        _set_extra(record, extra or None)
+        return record
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable; use replace()")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.FIELDS
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + (len(self._extra) if self._extra is not None else 0)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.FIELDS or (self._extra is not None and key in self._extra)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (_rebuild, (type(self), self.to_dict()))
+
+    def replace(self, **changes: Any) -> "Record":
+        """Copy with some fields changed."""
+        return type(self)(**{**self.to_dict(), **changes})
+
+    def to_row(self) -> List[Any]:
+        """Field values in FIELDS order, then the extra keys as a dict if any."""
+        row = [getattr(self, name) for name in self.FIELDS]
+        if self._extra is not None:
+            row.append(self._extra)
+        return row
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.FIELDS}
+        if self._extra is not None:
+            data.update(self._extra)
+        return data
+
+
+_set_extra = Record._extra.__set__
+
+
+def _rebuild(cls, data):
+    return cls(**data)
+
+
+class Task(Record):
+    # due_at: canonical aware-UTC form of `due`, parsed once at ingest
+    FIELDS = ("id", "title", "created_at", "due", "priority", "done", "due_at")
+    DEFAULTS = {"priority": "Medium", "done": False}
+    __slots__ = FIELDS
+
+
+class Event(Record):
+    FIELDS = ("id", "title", "start_time", "duration_mins", "notes")
+    DEFAULTS = {"duration_mins": 60, "notes": ""}
+    __slots__ = FIELDS
+
+
+class Reminder(Record):
+    FIELDS = ("id", "task_id", "remind_at")
+    __slots__ = FIELDS
+
+
+def to_dict(value: Any) -> Any:
+    """`value.to_dict()` for records, anything else unchanged."""
+    return value.to_dict() if isinstance(value, Record) else value
+
+
+def as_dicts(items: Iterable[Any]) -> List[Any]:
+    """Plain dicts for a JSON response."""
+    return [to_dict(item) for item in items]
@@ -0,0 +1,149 @@
+"""Validation and coercion for task, event and report payloads.
+
+Each `Schema` wraps a plain validator function written out field by field.
+`validate()` normalizes one dict (or returns None if a required field is
+missing or invalid); `validate_many()` normalizes a whole list in one pass
+and drops unusable items. A schema on a hot path can supply its own batch
+function that runs the checks inline instead of calling `validate()` per
+item. Coercers signal a bad value by returning `INVALID` rather than
+raising, keeping rejects cheap.
+"""
+
+from typing import Any, Callable, List, Optional
+
+from normalize import now_iso
+
+# Returned by coercers for unusable values
+INVALID = object()
+_NULL_STRINGS = frozenset(("", "null", "none", "n/a"))
+_PRIORITIES = ("High", "Medium", "Low")
+
+
+# ---- coercers ---------------------------------------------------------------
+
+def required_text(value: Any) -> str:
+    """Non-empty stripped string."""
+    text = value.strip() if isinstance(value, str) else ""
+    return text or INVALID
+
+
+def text(value: Any) -> str:
+    return value if isinstance(value, str) else ""
+
+
+def optional_int(value: Any) -> Optional[int]:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    try:
+        return int(value) if value is not None else None
+    except (ValueError, TypeError):
+        return None
+
+
+def integer(value: Any, default: Any = INVALID) -> int:
+    result = optional_int(value)
+    return default if result is None else result
+
+
+def string_list(value: Any) -> List[str]:
+    if not isinstance(value, list):
+        return []
+    return [v for v in value if isinstance(v, str)]
+
+
+# ---- schema -----------------------------------------------------------------
+
+class Schema:
+    """A named validator for one payload shape.
+
+    `many`, if given, must return what `validate_many` would; it is used
+    instead of mapping `validate` over the list.
+    """
+
+    def __init__(self, name: str, validate: Callable[[Any], Optional[dict]],
+                 many: Optional[Callable[[list], List[dict]]] = None):
+        self.name = name
+        self.validate = validate
+        self._many = many
+
+    def validate_many(self, items: Any) -> List[dict]:
+        if not isinstance(items, list):
+            return []
+        if self._many is not None:
+            return self._many(items)
+        validate = self.validate
+        return [v for v in map(validate, items) if v is not None]
+
+    def defaults(self) -> dict:
+        """Payload built purely from defaults (for non-dict LLM output)."""
+        return self.validate({}) or {}
+
+
+def _task_input(obj: Any) -> Optional[dict]:
+    tasks = _task_inputs([obj])
+    return tasks[0] if tasks else None
+
+
+def _task_inputs(items: list) -> List[dict]:
+    # the extractor validates every task, so the coercers are inlined and
+    # the loop runs here rather than calling a validator per item
+    out = []
+    append = out.append
+    for obj in items:
+        if not isinstance(obj, dict):
+            continue
+        title = obj.get("title")
+        if not isinstance(title, str):
+            continue
+        title = title.strip()
+        if not title:
+            continue
+        due = obj.get("due")
+        if due is not None:
+            if isinstance(due, str):
+                due = due.strip()
+                if due.lower() in _NULL_STRINGS:
+                    due = None
+            else:
+                due = None
+        priority = obj.get("priority", "Medium")
+        if priority not in _PRIORITIES:
+            priority = "Medium"
+        append({"title": title, "due": due, "priority": priority})
+    return out
+
+
+def _event(obj: Any) -> Optional[dict]:
+    if not isinstance(obj, dict):
+        return None
+    title = required_text(obj.get("title"))
+    if title is INVALID:
+        return None
+    start_time = required_text(obj.get("start_time"))
+    return {
+        "title": title,
+        "start_time": now_iso() if start_time is INVALID else start_time,
+        "duration_mins": optional_int(obj.get("duration_mins")),
+        "notes": text(obj.get("notes", "")),
+    }
+
+
+def _report(obj: Any) -> Optional[dict]:
+    if not isinstance(obj, dict):
+        return None
+    summary = required_text(obj.get("summary"))
+    return {
+        "summary": "No summary available" if summary is INVALID else summary,
+        "completed_count": integer(obj.get("completed_count"), 0),
+        "pending_count": integer(obj.get("pending_count"), 0),
+        "top_actions": string_list(obj.get("top_actions")),
+    }
+
+
+# Task as extracted by the LLM (before id/created_at are assigned)
+TASK_INPUT = Schema("task_input", _task_input, _task_inputs)
+
+# Event as planned by the LLM; duration stays None so the planner can fill it
+EVENT = Schema("event", _event)
+
+REPORT = Schema("report", _report)
@@ -0,0 +1,510 @@
+"""Storage backends for `TaskMemory`.
+
+A backend stores tasks keyed by their numeric `id` and is responsible
+for its own thread safety. Three implementations are provided:
+
+- `TinyDBBackend`: the original JSON file store (tinydb imported lazily),
+  optionally write-behind (buffered, atomically flushed),
+- `SQLiteBackend`: WAL-mode SQLite with indexes on id, done, due and
+  (title, due), so writes are O(log n) and pending/dedup queries use indexes,
+- `MemoryBackend`: a plain dict, for per-session state that never hits disk,
+- `state.log_store.LogBackend`: an append-only JSONL log with snapshots.
+
+Every backend keeps at most one task per normalized (title, due) and never
+stores blank titles: on write, a duplicate is dropped unless it was created
+earlier than the task it collides with, which it then replaces (the same
+rule `cleanup()` applies). Pass `dedup=False` for the old accept-everything
+behaviour.
+
+The in-memory stores (memory, log) keep `records.Task` records and return
+them from `all()` without copying; SQLite also returns records. Callers
+treat returned tasks as read-only mappings either way.
+
+`open_backend(kind, path)` builds one by name ("tinydb", "sqlite", "log", "memory").
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from records import Task, to_dict
+
+# Opt-in write-behind for the TinyDB backend
+WRITE_BEHIND = os.environ.get("WORKFLOWGENIE_DB_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+FLUSH_OPS = int(os.environ.get("WORKFLOWGENIE_DB_FLUSH_OPS", "100"))
+FLUSH_INTERVAL = float(os.environ.get("WORKFLOWGENIE_DB_FLUSH_INTERVAL", "1.0"))
+# Reject/merge (title, due) duplicates and blank titles on write
+DEDUP = os.environ.get("WORKFLOWGENIE_DB_DEDUP", "1").lower() not in ("0", "false", "no")
+
+
+def _dedup_key(task: Dict[str, Any]) -> str:
+    return (task.get("title") or "").strip().lower() + "\x1f" + (task.get("due") or "none")
+
+
+def _created_earlier(task: Dict[str, Any], than: Optional[str]) -> bool:
+    # ISO strings sort chronologically; unknown times never win
+    created = task.get("created_at") or ""
+    return bool(created and than and created < than)
+
+
+class DedupIndex:
+    """Normalized (title, due) -> (id, created_at) for the tasks in a store."""
+
+    def __init__(self):
+        self._by_key: Dict[str, Tuple[Any, Optional[str]]] = {}
+        self._key_of: Dict[Any, str] = {}
+
+    def check(self, task: Dict[str, Any]) -> Tuple[bool, Any]:
+        """(accept, id_to_evict) for writing `task`."""
+        if not (task.get("title") or "").strip():
+            return False, None
+        holder = self._by_key.get(_dedup_key(task))
+        if holder is None or holder[0] == task["id"]:
+            return True, None
+        if _created_earlier(task, holder[1]):
+            return True, holder[0]
+        return False, None
+
+    def add(self, task: Dict[str, Any]) -> None:
+        self.discard(task["id"])
+        key = _dedup_key(task)
+        self._by_key[key] = (task["id"], task.get("created_at"))
+        self._key_of[task["id"]] = key
+
+    def discard(self, task_id: Any) -> None:
+        key = self._key_of.pop(task_id, None)
+        if key is not None and self._by_key.get(key, (None,))[0] == task_id:
+            del self._by_key[key]
+
+    def clear(self) -> None:
+        self._by_key.clear()
+        self._key_of.clear()
+
+    def rebuild(self, tasks: Iterable[Dict[str, Any]]) -> Tuple[List[Any], List[Any]]:
+        """Index `tasks`; returns the (blank, duplicate) ids left out."""
+        self.clear()
+        by_key, key_of = self._by_key, self._key_of
+        blank, duplicates = [], []
+        # check() and add() inlined: this runs over every task on open
+        for t in tasks:
+            title = (t.get("title") or "").strip()
+            if not title:
+                blank.append(t.get("id"))
+                continue
+            task_id = t["id"]
+            key = title.lower() + "\x1f" + (t.get("due") or "none")
+            holder = by_key.get(key)
+            if holder is not None and holder[0] != task_id:
+                if not _created_earlier(t, holder[1]):
+                    duplicates.append(task_id)
+                    continue
+                duplicates.append(holder[0])
+                del key_of[holder[0]]
+            if task_id in key_of:
+                self.discard(task_id)
+            by_key[key] = (task_id, t.get("created_at"))
+            key_of[task_id] = key
+        return blank, duplicates
+
+    def admit(self, tasks: Iterable[Dict[str, Any]]) -> Tuple[Dict[Any, Dict[str, Any]], List[Any], int]:
+        """Apply a batch to the index.
+
+        Returns (tasks to write by id, stored ids to delete, rejected count).
+        """
+        accepted: Dict[Any, Dict[str, Any]] = {}
+        evicted: List[Any] = []
+        rejected = 0
+        for task in tasks:
+            ok, evict = self.check(task)
+            if not ok:
+                rejected += 1
+                continue
+            if evict is not None:
+                self.discard(evict)
+                if accepted.pop(evict, None) is None:
+                    evicted.append(evict)
+            self.add(task)
+            accepted[task["id"]] = task
+        return accepted, evicted, rejected
+
+
+class TaskBackend:
+    """Interface every task store implements."""
+
+    rejected = 0
+
+    def upsert(self, task: Dict[str, Any]) -> bool:
+        """Store one task; False if dedup rejected it."""
+        return self.upsert_many([task]) == 1
+
+    def upsert_many(self, tasks: Iterable[Dict[str, Any]]) -> int:
+        """Store a batch; returns how many tasks were written."""
+        raise NotImplementedError()
+
+    def all(self, include_done: bool = True) -> List[Dict[str, Any]]:
+        raise NotImplementedError()
+
+    def mark_done(self, task_id: int) -> None:
+        raise NotImplementedError()
+
+    def delete(self, task_ids: Iterable[int]) -> int:
+        raise NotImplementedError()
+
+    def clear(self) -> None:
+        raise NotImplementedError()
+
+    def flush(self) -> None:
+        """Persist buffered writes (no-op for write-through backends)."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {"dedup_rejected": self.rejected}
+
+    def close(self) -> None:
+        pass
+
+    def cleanup(self) -> Tuple[int, int]:
+        """Remove blank-title tasks and (title, due) duplicates in one write.
+
+        Keeps the earliest `created_at` of each duplicate group; returns
+        (blank_removed, duplicates_removed).
+        """
+        blank, duplicates = DedupIndex().rebuild(self.all())
+        self.delete(blank + duplicates)
+        return len(blank), len(duplicates)
+
+
+class _IndexedBackend(TaskBackend):
+    """Backend whose dedup index lives in memory next to the data.
+
+    Offenders already in the store when it is opened are found while the
+    index is built and removed by the next `cleanup()`, which therefore
+    needs no scan of its own.
+    """
+
+    def _init_index(self, dedup: bool, tasks: Iterable[Dict[str, Any]] = ()):
+        self.dedup = dedup
+        self._index = DedupIndex() if dedup else None
+        self._offenders: List[Any] = []
+        self._offender_counts = (0, 0)
+        if self._index is not None:
+            blank, duplicates = self._index.rebuild(tasks)
+            self._offenders = blank + duplicates
+            self._offender_counts = (len(blank), len(duplicates))
+
+    def _admit(self, tasks: Iterable[Dict[str, Any]]) -> Tuple[Dict[Any, Dict[str, Any]], List[Any]]:
+        if self._index is None:
+            return {t["id"]: t for t in tasks}, []  # last write wins within a batch
+        accepted, evicted, rejected = self._index.admit(tasks)
+        self.rejected += rejected
+        return accepted, evicted
+
+    def _forget(self, task_ids: Iterable[Any]) -> None:
+        if self._index is not None:
+            for task_id in task_ids:
+                self._index.discard(task_id)
+
+    def cleanup(self) -> Tuple[int, int]:
+        if self._index is None:
+            return super().cleanup()
+        with self._lock:
+            offenders, counts = self._offenders, self._offender_counts
+            self._offenders, self._offender_counts = [], (0, 0)
+            self._delete_raw(offenders)
+        return counts
+
+
+class MemoryBackend(_IndexedBackend):
+    """Dict-backed store; insertion ordered, nothing persisted."""
+
+    def __init__(self, dedup: bool = DEDUP):
+        self._tasks: Dict[Any, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._init_index(dedup)
+
+    def upsert_many(self, tasks: Iterable[Dict[str, Any]]) -> int:
+        with self._lock:
+            accepted, evicted = self._admit(tasks)
+            self._delete_raw(evicted)
+            for task_id, task in accepted.items():
+                self._tasks[task_id] = Task.from_mapping(task)
+            return len(accepted)
+
+    def all(self, include_done: bool = True) -> List[Task]:
+        with self._lock:
+            if include_done:
+                return list(self._tasks.values())
+            return [t for t in self._tasks.values() if not t.done]
+
+    def mark_done(self, task_id: int) -> None:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is not None:
+                self._tasks[task_id] = task.replace(done=True)
+
+    def _delete_raw(self, task_ids: Iterable[Any]) -> int:
+        return sum(self._tasks.pop(task_id, None) is not None for task_id in set(task_ids))
+
+    def delete(self, task_ids: Iterable[int]) -> int:
+        task_ids = set(task_ids)
+        with self._lock:
+            self._forget(task_ids)
+            return self._delete_raw(task_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tasks.clear()
+            self._init_index(self.dedup)
+
+
+class TinyDBBackend(_IndexedBackend):
+    """The original TinyDB store (optionally on MemoryStorage).
+
+    With `write_behind=True` the file is only written on flush: after
+    `flush_ops` buffered writes, `flush_interval` seconds, `flush()`,
+    `close()` or interpreter exit, each time via an atomic rename.
+    """
+
+    def __init__(self, path: str, in_memory: bool = False, write_behind: bool = WRITE_BEHIND,
+                 flush_ops: int = FLUSH_OPS, flush_interval: float = FLUSH_INTERVAL, dedup: bool = DEDUP):
+        from tinydb import TinyDB, Query
+        from tinydb.storages import MemoryStorage
+
+        self.path = path
+        self._middleware = None
+        if in_memory:
+            self.db = TinyDB(storage=MemoryStorage)
+        elif write_behind:
+            from state.tinydb_storage import AtomicJSONStorage, WriteBehindMiddleware
+
+            self._middleware = WriteBehindMiddleware(AtomicJSONStorage, flush_ops, flush_interval)
+            self.db = TinyDB(path, storage=self._middleware)
+        else:
+            self.db = TinyDB(path)
+        self._query = Query()
+        self._lock = threading.RLock()
+        self.table = self.db.table("tasks")
+        # the index is built from one read at open and then kept in step
+        # with every write made through this backend
+        self._init_index(dedup, self.table.all() if dedup else ())
+
+    def upsert_many(self, tasks: Iterable[Dict[str, Any]]) -> int:
+        """Batch upsert: at most one delete, one update and one insert write."""
+        with self._lock:
+            batch, evicted = self._admit(tasks)
+            if not batch:
+                return 0
+            self._delete_raw(evicted)
+            existing = {doc.get("id") for doc in self.table.all()}
+            updates = [(t, self._query.id == i) for i, t in batch.items() if i in existing]
+            inserts = [t for i, t in batch.items() if i not in existing]
+            if updates:
+                self.table.update_multiple(updates)
+            if inserts:
+                self.table.insert_multiple(inserts)
+        return len(batch)
+
+    def all(self, include_done: bool = True) -> List[Dict[str, Any]]:
+        with self._lock:
+            tasks = self.table.all()
+        return tasks if include_done else [t for t in tasks if not t.get("done", False)]
+
+    def mark_done(self, task_id: int) -> None:
+        with self._lock:
+            self.table.update({"done": True}, self._query.id == task_id)
+
+    def _delete_raw(self, task_ids: Iterable[Any]) -> int:
+        ids = set(task_ids)
+        if not ids:
+            return 0
+        return len(self.table.remove(self._query.id.one_of(list(ids))))
+
+    def delete(self, task_ids: Iterable[int]) -> int:
+        ids = set(task_ids)
+        with self._lock:
+            self._forget(ids)
+            return self._delete_raw(ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.db.drop_tables()
+            self.table = self.db.table("tasks")
+            self._init_index(self.dedup)
+
+    def flush(self) -> None:
+        if self._middleware is not None:
+            self._middleware.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        if self._middleware is not None:
+            stats.update(self._middleware.stats())
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self.db.close()
+
+
+class SQLiteBackend(TaskBackend):
+    """Indexed SQLite store.
+
+    Core fields live in columns (id is the primary key); the full task dict
+    is kept as JSON in `data` so extra fields round-trip unchanged. `done`
+    is authoritative in its column and overlaid on read. `dedup_key` holds
+    the normalized (title, due) and is indexed, so duplicate checks on write
+    and cleanup are index lookups.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS tasks ("
+        " id INTEGER PRIMARY KEY, title TEXT NOT NULL DEFAULT '', due TEXT,"
+        " done INTEGER NOT NULL DEFAULT 0, created_at TEXT, data TEXT NOT NULL, dedup_key TEXT)",
+        "CREATE INDEX IF NOT EXISTS tasks_done ON tasks (done)",
+        "CREATE INDEX IF NOT EXISTS tasks_due ON tasks (due)",
+    )
+    _UPSERT = (
+        "INSERT INTO tasks (id, title, due, done, created_at, data, dedup_key) VALUES (?, ?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT(id) DO UPDATE SET title=excluded.title, due=excluded.due, done=excluded.done,"
+        " created_at=excluded.created_at, data=excluded.data, dedup_key=excluded.dedup_key"
+    )
+
+    def __init__(self, path: str, dedup: bool = DEDUP):
+        self.path = path
+        self.dedup = dedup
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in self._SCHEMA:
+            self._conn.execute(statement)
+        self._migrate()
+
+    def _migrate(self):
+        """Add and backfill `dedup_key` on stores created before it existed."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "dedup_key" not in columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN dedup_key TEXT")
+        missing = self._conn.execute("SELECT id, data FROM tasks WHERE dedup_key IS NULL").fetchall()
+        if missing:
+            with self._transaction():
+                self._conn.executemany("UPDATE tasks SET dedup_key = ? WHERE id = ?",
+                                       [(_dedup_key(json.loads(data)), task_id) for task_id, data in missing])
+        self._conn.execute("DROP INDEX IF EXISTS tasks_title_due")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_dedup ON tasks (dedup_key)")
+
+    @contextmanager
+    def _transaction(self):
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _row(task: Dict[str, Any]) -> Tuple:
+        return (task["id"], task.get("title") or "", task.get("due"), 1 if task.get("done") else 0,
+                task.get("created_at"), json.dumps(to_dict(task), default=str), _dedup_key(task))
+
+    @staticmethod
+    def _task(data: str, done: int) -> Task:
+        task = json.loads(data)
+        task["done"] = bool(done)
+        return Task(**task)
+
+    def _admit(self, task: Dict[str, Any]) -> bool:
+        """Dedup check for one task inside the write transaction."""
+        if not (task.get("title") or "").strip():
+            return False
+        holder = self._conn.execute(
+            "SELECT id, created_at FROM tasks WHERE dedup_key = ? AND id != ? LIMIT 1",
+            (_dedup_key(task), task["id"]),
+        ).fetchone()
+        if holder is None:
+            return True
+        if _created_earlier(task, holder[1]):
+            self._conn.execute("DELETE FROM tasks WHERE id = ?", (holder[0],))
+            return True
+        return False
+
+    def upsert_many(self, tasks: Iterable[Dict[str, Any]]) -> int:
+        """Batch upsert in a single transaction."""
+        tasks = list(tasks)
+        rows = [self._row(t) for t in tasks]
+        with self._lock, self._transaction():
+            if not self.dedup:
+                self._conn.executemany(self._UPSERT, rows)
+                return len(rows)
+            written = 0
+            for task, row in zip(tasks, rows):
+                if self._admit(task):
+                    self._conn.execute(self._UPSERT, row)
+                    written += 1
+            self.rejected += len(rows) - written
+            return written
+
+    def all(self, include_done: bool = True) -> List[Task]:
+        sql = "SELECT data, done FROM tasks" + ("" if include_done else " WHERE done = 0") + " ORDER BY id"
+        with self._lock:
+            rows = self._conn.execute(sql).fetchall()
+        return [self._task(data, done) for data, done in rows]
+
+    def mark_done(self, task_id: int) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE tasks SET done = 1 WHERE id = ?", (task_id,))
+
+    def delete(self, task_ids: Iterable[int]) -> int:
+        ids = [(i,) for i in set(task_ids)]
+        if not ids:
+            return 0
+        with self._lock, self._transaction():
+            before = self._conn.total_changes
+            self._conn.executemany("DELETE FROM tasks WHERE id = ?", ids)
+            return self._conn.total_changes - before
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM tasks")
+
+    def cleanup(self) -> Tuple[int, int]:
+        with self._lock, self._transaction():
+            blank = self._conn.execute("DELETE FROM tasks WHERE trim(title) = ''").rowcount
+            # only rows from repeated groups are loaded (a scan of tasks_dedup)
+            rows = self._conn.execute(
+                "SELECT data, done FROM tasks WHERE dedup_key IN ("
+                " SELECT dedup_key FROM tasks GROUP BY dedup_key HAVING count(*) > 1)"
+                " ORDER BY id"
+            ).fetchall()
+            _, duplicates = DedupIndex().rebuild(self._task(data, done) for data, done in rows)
+            self._conn.executemany("DELETE FROM tasks WHERE id = ?", [(i,) for i in duplicates])
+        return blank, len(duplicates)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+BACKENDS = ("tinydb", "sqlite", "log", "memory")
+
+
+def open_backend(kind: str, path: Optional[str] = None) -> TaskBackend:
+    """Build a backend by name; `path` is ignored for "memory"."""
+    kind = (kind or "tinydb").strip().lower()
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "sqlite":
+        return SQLiteBackend(path or ":memory:")
+    if kind == "tinydb":
+        return TinyDBBackend(path) if path else TinyDBBackend("", in_memory=True)
+    if kind == "log":
+        if not path:
+            raise ValueError("the log backend needs a file path")
+        from state.log_store import LogBackend
+
+        return LogBackend(path)
+    raise ValueError(f"unknown task backend {kind!r}; expected one of {', '.join(BACKENDS)}")
@@ -0,0 +1,293 @@
+"""Append-only, log-structured task backend.
+
+Every mutation is appended to `<path>` as one JSON line carrying a sequence
+number, so a write costs one small append (plus an optional fsync) no
+matter how many tasks are stored. State lives in memory; on open it is
+rebuilt from `<path>.snapshot` followed by the log records newer than the
+snapshot. The snapshot is a header line (sequence number and field names)
+followed by a JSON array holding one positional row per task and per line;
+it is decoded in one call and the rows turned straight into records.
+
+Once `compact_every` records have accumulated, the log is rotated to
+`<path>.old` and a background thread writes a new snapshot (temp file plus
+atomic rename) and then deletes the rotated log. If a compaction fails,
+the rotated log is kept and the next one snapshots the current state
+without rotating again, which covers both logs. Replaying skips records
+the snapshot already covers, so a crash at any point of compaction loses
+nothing.
+"""
+
+import gc
+import os
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional
+
+from records import Task, to_dict
+from state.backends import DEDUP, _IndexedBackend
+
+logger = logging.getLogger(__name__)
+
+COMPACT_EVERY = int(os.environ.get("WORKFLOWGENIE_LOG_COMPACT_EVERY", "10000"))
+FSYNC = os.environ.get("WORKFLOWGENIE_LOG_FSYNC", "1").lower() not in ("0", "false", "no")
+
+
+def _json_default(value: Any) -> Any:
+    # records serialize as dicts; anything else unknown (e.g. datetime) as str
+    converted = to_dict(value)
+    return str(value) if converted is value else converted
+
+
+@contextmanager
+def _gc_paused():
+    # recovery allocates one acyclic record per task; letting the cyclic
+    # collector rescan them all every few thousand allocations is wasted work
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _task_from_row(fields: Iterable[str], row: List[Any]) -> Task:
+    values = dict(zip(fields, row))
+    if len(row) > len(values):
+        values.update(row[-1])
+    return Task(**values)
+
+
+class LogBackend(_IndexedBackend):
+    """Task store backed by a JSONL mutation log plus periodic snapshots."""
+
+    def __init__(self, path: str, compact_every: int = COMPACT_EVERY, fsync: bool = FSYNC,
+                 dedup: bool = DEDUP):
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.rotated_path = path + ".old"
+        self.compact_every = max(1, int(compact_every))
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._tasks: Dict[Any, Task] = {}
+        self._seq = 0
+        self._since_snapshot = 0
+        self._compactor: Optional[threading.Thread] = None
+        self.appends = 0
+        self.compactions = 0
+
+        with _gc_paused():
+            self._load()
+        if os.path.exists(self.rotated_path):
+            # finish a compaction interrupted by a crash: everything loaded
+            # so far goes into the snapshot, after which both logs are redundant
+            self._write_snapshot(self._seq, list(self._tasks.values()))
+            if not os.path.exists(self.rotated_path):
+                open(self.path, "w").close()
+                self._since_snapshot = 0
+        self._log = open(self.path, "a", encoding="utf-8")
+        with _gc_paused():
+            self._init_index(dedup, self._tasks.values())
+
+    # ---- recovery -------------------------------------------------------
+
+    def _load(self):
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path) and os.path.getsize(self.snapshot_path):
+            snapshot_seq = self._load_snapshot()
+        self._seq = snapshot_seq
+        for log_path in (self.rotated_path, self.path):
+            self._replay(log_path, snapshot_seq)
+
+    def _load_snapshot(self) -> int:
+        with open(self.snapshot_path, "rb") as fh:
+            header = json.loads(fh.readline())
+            if "tasks" in header:
+                # single-document snapshot from before the row format
+                tasks = (Task(**t) for t in header["tasks"])
+            else:
+                rows = json.loads(fh.read())
+                fields = tuple(header.get("fields", ()))
+                if fields == Task.FIELDS:
+                    tasks = map(Task.from_row, rows)
+                else:
+                    # written with a different field list: go through the names
+                    tasks = (_task_from_row(fields, row) for row in rows)
+            self._tasks = {t.id: t for t in tasks}
+        return header.get("seq", 0)
+
+    def _replay(self, log_path: str, after_seq: int):
+        if not os.path.exists(log_path):
+            return
+        good = 0
+        with open(log_path, "rb") as fh:
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    # a torn final line from a crash mid-append
+                    logger.warning("LogBackend: dropping incomplete record at the end of %s", log_path)
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning("LogBackend: skipping unreadable record in %s", log_path)
+                    good += len(line)
+                    continue
+                good += len(line)
+                seq = record.get("seq", 0)
+                if seq <= after_seq:
+                    continue
+                self._apply(record)
+                self._seq = max(self._seq, seq)
+                self._since_snapshot += 1
+        if good < os.path.getsize(log_path):
+            # later appends must start on a fresh line
+            os.truncate(log_path, good)
+
+    def _apply(self, record: Dict[str, Any]):
+        op = record.get("op")
+        if op == "put":
+            for task in record["tasks"]:
+                self._tasks[task["id"]] = Task.from_mapping(task)
+        elif op == "done":
+            task = self._tasks.get(record["id"])
+            if task is not None:
+                self._tasks[record["id"]] = task.replace(done=True)
+        elif op == "del":
+            for task_id in record["ids"]:
+                self._tasks.pop(task_id, None)
+        elif op == "clear":
+            self._tasks.clear()
+
+    # ---- writes ---------------------------------------------------------
+
+    def _append(self, record: Dict[str, Any]):
+        """Apply `record` and append it durably; caller holds the lock."""
+        self._seq += 1
+        record["seq"] = self._seq
+        self._apply(record)
+        self._log.write(json.dumps(record, separators=(",", ":"), default=_json_default) + "\n")
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self.appends += 1
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.compact_every:
+            self._start_compaction()
+
+    def upsert_many(self, tasks: Iterable[Dict[str, Any]]) -> int:
+        with self._lock:
+            accepted, evicted = self._admit(tasks)
+            self._delete_raw(evicted)
+            if accepted:
+                self._append({"op": "put", "tasks": list(accepted.values())})
+            return len(accepted)
+
+    def all(self, include_done: bool = True) -> List[Task]:
+        with self._lock:
+            if include_done:
+                return list(self._tasks.values())
+            return [t for t in self._tasks.values() if not t.done]
+
+    def mark_done(self, task_id: int) -> None:
+        with self._lock:
+            if task_id in self._tasks:
+                self._append({"op": "done", "id": task_id})
+
+    def _delete_raw(self, task_ids: Iterable[Any]) -> int:
+        ids = [i for i in set(task_ids) if i in self._tasks]
+        if ids:
+            self._append({"op": "del", "ids": ids})
+        return len(ids)
+
+    def delete(self, task_ids: Iterable[int]) -> int:
+        task_ids = set(task_ids)
+        with self._lock:
+            self._forget(task_ids)
+            return self._delete_raw(task_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._append({"op": "clear"})
+            self._init_index(self.dedup)
+
+    # ---- compaction -----------------------------------------------------
+
+    def _start_compaction(self):
+        """Rotate the log and snapshot in the background; caller holds the lock."""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        if not os.path.exists(self.rotated_path):
+            self._log.close()
+            os.replace(self.path, self.rotated_path)
+            self._log = open(self.path, "a", encoding="utf-8")
+        # else a previous compaction failed: the rotated log stays, and this
+        # snapshot covers it as well as the records in the current log
+        # records are immutable, so the background thread can serialize
+        # this list while writers carry on
+        tasks = list(self._tasks.values())
+        self._since_snapshot = 0
+        self._compactor = threading.Thread(target=self._write_snapshot, args=(self._seq, tasks),
+                                           name="workflowgenie-log-compactor", daemon=True)
+        self._compactor.start()
+
+    def _write_snapshot(self, seq: int, tasks: List[Task]):
+        tmp = self.snapshot_path + ".tmp"
+        try:
+            encode = json.JSONEncoder(separators=(",", ":"), default=_json_default).encode
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(encode({"seq": seq, "fields": Task.FIELDS}) + "\n[\n")
+                fh.write(",\n".join(encode(task.to_row()) for task in tasks))
+                fh.write("\n]\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, self.snapshot_path)
+            os.remove(self.rotated_path)
+            with self._lock:
+                self.compactions += 1
+        except Exception:
+            logger.exception("LogBackend: compaction of %s failed", self.path)
+
+    def compact(self) -> None:
+        """Snapshot the current state and wait for it (e.g. before shipping the files).
+
+        A compaction already running covers only what was written before it
+        started, so it is waited for and a new one started after it.
+        """
+        while True:
+            with self._lock:
+                compactor = self._compactor
+                running = compactor is not None and compactor.is_alive()
+                if not running:
+                    self._start_compaction()
+                    compactor = self._compactor
+            compactor.join()
+            if not running:
+                return
+
+    def flush(self) -> None:
+        with self._lock:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats.update({
+                "tasks": len(self._tasks),
+                "seq": self._seq,
+                "appends": self.appends,
+                "records_since_snapshot": self._since_snapshot,
+                "compactions": self.compactions,
+            })
+        return stats
+
+    def close(self) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            if not self._log.closed:
+                self.flush()
+                self._log.close()
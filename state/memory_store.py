@@ -1,106 +1,113 @@
 import os
-from tinydb import TinyDB, Query
+import asyncio
 import logging
+from typing import Iterable
+
+from state.backends import MemoryBackend, TaskBackend, open_backend
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-DB_PATH = os.environ.get("WORKFLOWGENIE_DB", "workflowgenie_adk_db.json")
+# "tinydb" (default), "sqlite", "log" or "memory"
+DB_BACKEND = os.environ.get("WORKFLOWGENIE_DB_BACKEND", "tinydb").strip().lower()
+_DEFAULT_PATHS = {
+    "tinydb": "workflowgenie_adk_db.json",
+    "sqlite": "workflowgenie_adk_db.sqlite3",
+    "log": "workflowgenie_adk_db.jsonl",
+}
+DB_PATH = os.environ.get("WORKFLOWGENIE_DB", _DEFAULT_PATHS.get(DB_BACKEND, ""))
 
-class TaskMemory:
 
-    def __init__(self, db_path: str = None, tools: dict = None, llm=None):
-        self.db_path = db_path or DB_PATH
-        self.db = TinyDB(self.db_path)
-        self.table = self.db.table("tasks")
+class TaskMemory:
+    """Task store on top of a pluggable `state.backends.TaskBackend`.
+
+    The backend comes from `backend=` or WORKFLOWGENIE_DB_BACKEND; backends
+    are thread-safe, since workflow steps read and write from worker threads
+    concurrently. With `in_memory=True` nothing touches the filesystem
+    (per-session state).
+    """
+
+    def __init__(self, db_path: str = None, tools: dict = None, llm=None, in_memory: bool = False,
+                 backend: TaskBackend = None):
+        self.in_memory = in_memory
+        if backend is not None:
+            self.backend = backend
+            self.db_path = getattr(backend, "path", None) or ":memory:"
+        elif in_memory:
+            self.backend = MemoryBackend()
+            self.db_path = ":memory:"
+        else:
+            self.db_path = db_path or DB_PATH
+            self.backend = open_backend(DB_BACKEND, self.db_path)
         self.tools = tools or {}
         self.llm = llm
 
-    def store_task(self, task: dict):
-        Task = Query()
-        if self.table.contains(Task.id == task["id"]):
-            self.table.update(task, Task.id == task["id"])
-        else:
-            self.table.insert(task)
+    @property
+    def invoke_mode(self) -> str:
+        """How `tools.invocation` calls this store: inline only if nothing blocks."""
+        return "inline" if isinstance(self.backend, MemoryBackend) else "executor"
+
+    def store_task(self, task: dict) -> bool:
+        """Upsert one task; False if dedup rejected it."""
+        return self.backend.upsert(task)
+
+    def store_tasks(self, tasks: Iterable[dict]) -> int:
+        """Upsert a batch of tasks in one backend write; returns how many were written."""
+        return self.backend.upsert_many(tasks)
+
+    async def astore_tasks(self, tasks: Iterable[dict]) -> int:
+        """`store_tasks` off the event loop (one thread hop per batch)."""
+        return await asyncio.to_thread(self.store_tasks, list(tasks))
 
     def list_pending(self):
-        return [t for t in self.table.all() if not t.get("done", False)]
+        return self.backend.all(include_done=False)
 
     def list_tasks(self, include_done: bool = False):
-        if include_done:
-            return self.table.all()
-        return [t for t in self.table.all() if not t.get("done", False)]
+        return self.backend.all(include_done=include_done)
 
     @property
     def tasks(self):
-        return self.table.all()
+        return self.backend.all()
+
+    def merge_into(self, target: "TaskMemory") -> int:
+        """Upsert every task from this memory into `target`; returns the count."""
+        return target.backend.upsert_many(self.backend.all())
 
     def mark_done(self, task_id):
-        Task = Query()
-        self.table.update({"done": True}, Task.id == task_id)
+        self.backend.mark_done(task_id)
 
     def delete_task(self, task_id):
         """Delete a task by its numeric id field."""
-        Task = Query()
         # remove all matching entries
-        self.table.remove(Task.id == task_id)
+        self.backend.delete([task_id])
 
     def clear_db(self):
-        self.db.drop_tables()
-        self.db = TinyDB(self.db_path)
-        self.table = self.db.table("tasks")
+        self.backend.clear()
         logger.info("TaskMemory: DB cleared.")
 
     def clear(self):
         """Alias for clear_db(): delete all persistent data."""
         self.clear_db()
 
+    def flush(self):
+        """Persist any writes the backend is buffering (write-behind mode)."""
+        self.backend.flush()
+
+    def stats(self):
+        return self.backend.stats()
+
+    def close(self):
+        self.backend.close()
+
     def cleanup_on_startup(self):
         """
         Remove blank-title tasks and deduplicate tasks (keep earliest created).
         Run this at program start to avoid leftover/blank records from earlier runs.
         """
         logger.info("TaskMemory: Running startup cleanup on DB: %s", self.db_path)
-        all_tasks = self.table.all()
-        # Remove tasks with blank/empty titles (whitespace-only)
-        removed = 0
-        for t in all_tasks:
-            title = (t.get("title") or "").strip()
-            if title == "":
-                self.table.remove(doc_ids=[t.doc_id])
-                removed += 1
+        removed, duplicates = self.backend.cleanup()
         if removed:
             logger.info("TaskMemory: removed %d blank-title tasks.", removed)
-
-        # Deduplicate by (title, due) — keep earliest created_at
-        tasks = self.table.all()
-        seen = {}
-        duplicates = []
-        for t in tasks:
-            key = ( (t.get("title") or "").strip().lower(), t.get("due") or "none" )
-            created = t.get("created_at") or ""
-            # if key seen, compare created times and choose earliest to keep
-            if key in seen:
-                # existing doc
-                existing = seen[key]
-                # choose which to keep: earliest created_at string lexicographically earlier likely older
-                keep = existing
-                drop = t
-                # if new one has earlier timestamp, swap
-                if created and existing.get("created_at"):
-                    if created < existing.get("created_at"):
-                        keep = t
-                        drop = existing
-                        seen[key] = keep
-                duplicates.append(drop)
-            else:
-                seen[key] = t
-
-        # Remove duplicates
         if duplicates:
-            for d in duplicates:
-                self.table.remove(doc_ids=[d.doc_id])
-            logger.info("TaskMemory: removed %d duplicate tasks.", len(duplicates))
-
+            logger.info("TaskMemory: removed %d duplicate tasks.", duplicates)
         logger.info("TaskMemory: startup cleanup complete.")
-
@@ -0,0 +1,65 @@
+"""Copy tasks between TaskMemory backends (e.g. a TinyDB file to SQLite).
+
+Usage:
+    python -m state.migrate workflowgenie_adk_db.json workflowgenie_adk_db.sqlite3
+    python -m state.migrate SRC DST --from tinydb --to sqlite --cleanup
+
+Then point the app at the new store with WORKFLOWGENIE_DB_BACKEND=sqlite and
+WORKFLOWGENIE_DB=<DST>. The source file is never modified.
+"""
+
+import os
+import argparse
+import logging
+from typing import Tuple
+
+from state.backends import BACKENDS, TaskBackend, open_backend
+
+logger = logging.getLogger(__name__)
+
+
+def migrate(source: TaskBackend, target: TaskBackend, cleanup: bool = False) -> Tuple[int, int]:
+    """Upsert every task from `source` into `target` in one batch.
+
+    Tasks without an id are skipped. Returns (copied, skipped).
+    """
+    tasks = source.all()
+    valid = [t for t in tasks if t.get("id") is not None]
+    copied = target.upsert_many(valid)
+    if cleanup:
+        removed, duplicates = target.cleanup()
+        logger.info("Cleanup removed %d blank and %d duplicate tasks", removed, duplicates)
+    return copied, len(tasks) - len(valid)
+
+
+def _guess_kind(path: str) -> str:
+    path = path.lower()
+    if path.endswith(".json"):
+        return "tinydb"
+    return "log" if path.endswith(".jsonl") else "sqlite"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="existing task store")
+    parser.add_argument("target", help="task store to create or update")
+    parser.add_argument("--from", dest="source_kind", choices=BACKENDS, help="source backend (default: by extension)")
+    parser.add_argument("--to", dest="target_kind", choices=BACKENDS, help="target backend (default: by extension)")
+    parser.add_argument("--cleanup", action="store_true", help="drop blank and duplicate tasks after copying")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        parser.error(f"source {args.source!r} does not exist")
+    source = open_backend(args.source_kind or _guess_kind(args.source), args.source)
+    target = open_backend(args.target_kind or _guess_kind(args.target), args.target)
+    try:
+        copied, skipped = migrate(source, target, cleanup=args.cleanup)
+    finally:
+        source.close()
+        target.close()
+    print(f"Copied {copied} task(s) from {args.source} to {args.target}" + (f"; skipped {skipped} without an id" if skipped else ""))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,141 @@
+"""TinyDB storage pieces for the opt-in write-behind mode.
+
+`AtomicJSONStorage` writes the whole database to a temporary file and
+renames it over the original, so a crash mid-write never leaves a truncated
+JSON file. `WriteBehindMiddleware` keeps the database in memory, serves
+reads from it and buffers writes, flushing to the wrapped storage when
+`flush_ops` writes are pending, `flush_interval` seconds after the first
+unflushed write, on `flush()`, on `close()` and at interpreter exit.
+"""
+
+import os
+import json
+import time
+import atexit
+import logging
+import tempfile
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+from tinydb.middlewares import Middleware
+from tinydb.storages import Storage
+
+logger = logging.getLogger(__name__)
+
+
+class AtomicJSONStorage(Storage):
+    """JSON file storage with write-to-temp-then-rename writes."""
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        self.kwargs = kwargs
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                raw = fh.read()
+        except FileNotFoundError:
+            return None
+        return json.loads(raw) if raw.strip() else None
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, **self.kwargs)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def close(self) -> None:
+        pass
+
+
+_open_middlewares: "weakref.WeakSet[WriteBehindMiddleware]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for middleware in list(_open_middlewares):
+        try:
+            middleware.flush()
+        except Exception:
+            logger.exception("Write-behind flush at exit failed")
+
+
+class WriteBehindMiddleware(Middleware):
+    """Buffer TinyDB writes in memory and flush them in batches.
+
+    Use as `TinyDB(path, storage=WriteBehindMiddleware(AtomicJSONStorage))`.
+    """
+
+    def __init__(self, storage_cls=AtomicJSONStorage, flush_ops: int = 100, flush_interval: float = 1.0):
+        super().__init__(storage_cls)
+        self.flush_ops = max(1, int(flush_ops))
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._data: Optional[Dict[str, Dict[str, Any]]] = None
+        self._pending = 0
+        self._timer: Optional[threading.Timer] = None
+        self.writes = 0
+        self.flushes = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+        _open_middlewares.add(self)
+
+    def read(self):
+        with self._lock:
+            if self._data is None:
+                self._data = self.storage.read()
+            return self._data
+
+    def write(self, data):
+        with self._lock:
+            self._data = data
+            self._pending += 1
+            self.writes += 1
+            if self._pending >= self.flush_ops:
+                self.flush()
+            elif self._timer is None and self.flush_interval > 0:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write the buffered state to storage if anything is pending."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            started = time.perf_counter()
+            self.storage.write(self._data)
+            elapsed = time.perf_counter() - started
+            self._pending = 0
+            self.flushes += 1
+            self.flush_seconds_total += elapsed
+            self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+
+    def close(self) -> None:
+        self.flush()
+        _open_middlewares.discard(self)
+        self.storage.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "buffered_ops": self._pending,
+                "writes": self.writes,
+                "flushes": self.flushes,
+                "flush_latency_avg_s": round(self.flush_seconds_total / self.flushes, 6) if self.flushes else 0.0,
+                "flush_latency_max_s": round(self.flush_seconds_max, 6),
+            }
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from tools.calendar_tool import LONG_SPAN, CalendarConflict, CalendarTool
+
+DAY = datetime(2025, 3, 3)
+
+
+def _at(hours: float) -> str:
+    return (DAY + timedelta(hours=hours)).isoformat()
+
+
+@pytest.fixture
+def calendar():
+    calendar = CalendarTool()
+    calendar.add_event("standup", _at(9), 15)
+    calendar.add_event("deep work", _at(10), 120)
+    calendar.add_event("lunch", _at(12.5), 60)
+    return calendar
+
+
+def test_events_between_finds_overlaps_in_start_order(calendar):
+    titles = [e["title"] for e in calendar.events_between(DAY + timedelta(hours=11), DAY + timedelta(hours=13))]
+    assert titles == ["deep work", "lunch"]
+    assert calendar.events_between(DAY + timedelta(hours=9, minutes=15), DAY + timedelta(hours=10)) == []
+
+
+def test_long_event_is_found_without_widening_the_index(calendar):
+    calendar.add_event("conference", _at(-48), 5 * 24 * 60)
+    assert calendar._max_span == timedelta(hours=2)
+    titles = [e["title"] for e in calendar.events_between(DAY + timedelta(hours=11), DAY + timedelta(hours=13))]
+    assert titles == ["conference", "deep work", "lunch"]
+    assert [e["title"] for e in calendar.overlaps(_at(60), 30)] == ["conference"]
+    assert calendar.overlaps(_at(200), 30) == []
+
+
+def test_batch_add_matches_single_adds(calendar):
+    batch = CalendarTool()
+    batch.add_events([
+        {"title": "lunch", "start_time": _at(12.5), "duration_mins": 60},
+        {"title": "trip", "start_time": _at(-24), "duration_mins": int(LONG_SPAN.total_seconds() // 60) * 3},
+        {"title": "standup", "start_time": _at(9), "duration_mins": 15},
+        {"title": "deep work", "start_time": _at(10), "duration_mins": 120},
+    ])
+    calendar.add_event("trip", _at(-24), int(LONG_SPAN.total_seconds() // 60) * 3)
+    assert batch.intervals() == calendar.intervals()
+
+
+def test_find_free_slots_respects_gaps_and_long_events(calendar):
+    window = (DAY + timedelta(hours=9), DAY + timedelta(hours=14))
+    slots = calendar.find_free_slots(window, duration=30, gap_mins=0)
+    assert slots == [
+        (DAY + timedelta(hours=9, minutes=15), DAY + timedelta(hours=10)),
+        (DAY + timedelta(hours=12), DAY + timedelta(hours=12, minutes=30)),
+        (DAY + timedelta(hours=13, minutes=30), DAY + timedelta(hours=14)),
+    ]
+    calendar.add_event("offsite", _at(-12), 3 * 24 * 60)
+    assert calendar.find_free_slots(window, duration=30) == []
+
+
+def test_conflicts_raise_and_unparseable_events_never_block(calendar):
+    with pytest.raises(CalendarConflict):
+        calendar.add_event("clash", _at(10.5), 30, allow_overlap=False)
+    calendar.add_event("someday", "whenever", 30)
+    assert calendar.add_event("free", _at(15), 30, allow_overlap=False)["title"] == "free"
+    assert len(calendar.list_events()) == 5
+    calendar.clear_events()
+    assert calendar.list_events() == [] and calendar.intervals() == []
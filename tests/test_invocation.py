@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+import pytest
+
+from tools import invocation
+from tools.invocation import AWAIT, EXECUTOR, INLINE, blocking, inline, invoke, register
+
+
+class Tool:
+    name = "tool"
+
+    def __init__(self):
+        self.reads = 0
+
+    @property
+    def expensive(self):
+        self.reads += 1
+        return []
+
+    def plain(self):
+        return threading.get_ident()
+
+    @inline
+    def cheap(self, x):
+        return threading.get_ident(), x
+
+    @blocking
+    def slow(self):
+        return threading.get_ident()
+
+    async def coro(self, x):
+        return x * 2
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    invocation.reset_stats()
+    yield
+    invocation.reset_stats()
+
+
+def test_register_classifies_methods_without_reading_properties():
+    tool = Tool()
+    modes = register(tool)
+    assert modes == {"plain": EXECUTOR, "cheap": INLINE, "slow": EXECUTOR, "coro": AWAIT}
+    assert tool.reads == 0
+
+
+def test_invoke_dispatches_by_mode():
+    tool = Tool()
+
+    async def go():
+        loop_thread = threading.get_ident()
+        cheap_thread, x = await invoke(tool, "cheap", 1)
+        return loop_thread, cheap_thread, x, await invoke(tool, "slow"), await invoke(tool, "coro", 4)
+
+    loop_thread, cheap_thread, x, slow_thread, doubled = asyncio.run(go())
+    assert cheap_thread == loop_thread and x == 1
+    assert slow_thread != loop_thread
+    assert doubled == 8
+    assert invocation.stats()["tool.cheap"]["mode"] == INLINE
+
+
+def test_stats_count_every_call_across_threads():
+    tool = Tool()
+
+    def worker():
+        async def calls():
+            for _ in range(500):
+                await invoke(tool, "cheap", 0)
+        asyncio.run(calls())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert invocation.stats()["tool.cheap"]["calls"] == 8 * 500
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from llm_cache import ResponseCache, SingleFlight, make_key
+
+
+def test_make_key_depends_on_every_param():
+    base = make_key("m", "p", temperature=0.0)
+    assert base == make_key("m", "p", temperature=0.0)
+    assert base != make_key("m", "p", temperature=0.5)
+    assert base != make_key("m2", "p", temperature=0.0)
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    cache = ResponseCache(max_entries=2, ttl=10)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")             # evicts "b", the least recently used
+    assert cache.get("b") is None
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["expirations"] == 1
+
+
+def test_sqlite_tier_survives_restart_and_is_bounded(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(max_entries=1, ttl=None, persist_path=path, disk_entries=3)
+    for i in range(5):
+        cache.set(f"k{i}", f"v{i}")
+    cache.close()
+
+    cache = ResponseCache(max_entries=1, ttl=None, persist_path=path, disk_entries=3)
+    assert cache.get("k4") == "v4"
+    assert cache.stats()["disk_hits"] == 1
+    cache.close()
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("k", upstream) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["answer"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "collapsed": 4}
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    flight = SingleFlight()
+
+    async def upstream():
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do_async("k", upstream))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async("k", upstream))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "answer"
+    assert flight.stats()["leaders"] == 1
+
+
+def test_follower_takes_over_when_upstream_task_is_cancelled():
+    flight = SingleFlight()
+    started = []
+
+    async def upstream():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do_async("k", upstream))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async("k", upstream))
+        await asyncio.sleep(0)
+        for task in flight._tasks:
+            task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "answer"
+    assert len(started) == 2
+
+
+def test_errors_are_shared_with_followers():
+    flight = SingleFlight()
+
+    async def upstream():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("k", upstream) for _ in range(3)),
+                                    return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in asyncio.run(main()))
+
+
+def test_sync_follower_takes_over_after_leader_interrupt():
+    flight = SingleFlight()
+    entered = threading.Event()
+    results = []
+
+    def interrupted():
+        entered.set()
+        time.sleep(0.05)
+        raise KeyboardInterrupt
+
+    def leader():
+        try:
+            flight.do("k", interrupted)
+        except KeyboardInterrupt:
+            results.append("interrupted")
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    entered.wait()
+    results.append(flight.do("k", lambda: "answer"))
+    thread.join()
+    assert sorted(results) == ["answer", "interrupted"]
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from llm_limits import ConcurrencyLimiter, LLMLimiter, TokenBucket, estimate_tokens
+
+
+def test_estimate_tokens_counts_prompt_and_output_budget():
+    assert estimate_tokens("x" * 400, 100) == 201
+    assert estimate_tokens("", None) == 1
+
+
+def test_token_bucket_queues_callers_in_arrival_order():
+    bucket = TokenBucket(per_minute=60, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    first = bucket.reserve()
+    second = bucket.reserve()
+    assert 0.9 < first < 1.1 and 1.9 < second < 2.1
+    # oversized requests are clamped to the bucket size instead of never fitting
+    assert TokenBucket(per_minute=60, capacity=10).reserve(1000) == 0.0
+
+
+def test_slot_bounds_in_flight_calls_across_loops_and_threads():
+    limiter = LLMLimiter(max_concurrency=2)
+    lock = threading.Lock()
+    active = [0, 0]  # current, peak
+
+    async def call():
+        async with limiter.slot():
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            await asyncio.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+    def worker():
+        async def calls():
+            await asyncio.gather(*(call() for _ in range(5)))
+        asyncio.run(calls())
+
+    def sync_worker():
+        for _ in range(5):
+            with limiter.slot_sync():
+                with lock:
+                    active[0] += 1
+                    active[1] = max(active[1], active[0])
+                time.sleep(0.005)
+                with lock:
+                    active[0] -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(3)] + [threading.Thread(target=sync_worker)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = limiter.stats()
+    assert active[1] == 2
+    assert stats["calls"] == 20 and stats["in_flight"] == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = ConcurrencyLimiter(1)
+
+    async def go():
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+        await asyncio.wait_for(limiter.acquire(), 1)
+        limiter.release()
+
+    asyncio.run(go())
+    assert limiter.in_flight == 0
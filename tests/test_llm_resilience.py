@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from llm_resilience import CircuitBreaker, CircuitOpenError, ResilientCaller, RetryPolicy
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _caller(clock=None, **kwargs) -> ResilientCaller:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=clock or Clock())
+    return ResilientCaller(retry=RetryPolicy(max_attempts=3, base_delay=0.0), breaker=breaker, **kwargs)
+
+
+def _half_open(caller: ResilientCaller, clock: Clock):
+    caller.breaker.record_failure(permanent=True)
+    clock.now += 10.0
+    assert caller.breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_transient_errors_are_retried():
+    caller = _caller()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("503 unavailable")
+        return "ok"
+
+    assert asyncio.run(caller.call(flaky)) == "ok"
+    assert caller.stats()["retries"] == 2
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_permanent_error_opens_the_breaker_without_retrying():
+    caller = _caller()
+    attempts = []
+
+    def missing():
+        attempts.append(1)
+        raise RuntimeError("404 model not found")
+
+    with pytest.raises(RuntimeError):
+        caller.call_sync(missing)
+    assert len(attempts) == 1
+    with pytest.raises(CircuitOpenError):
+        caller.call_sync(lambda: "never")
+
+
+def test_half_open_probe_closes_or_reopens():
+    clock = Clock()
+    caller = _caller(clock)
+    _half_open(caller, clock)
+    assert caller.call_sync(lambda: "ok") == "ok"
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+
+    _half_open(caller, clock)
+    with pytest.raises(ValueError):
+        caller.call_sync(lambda: (_ for _ in ()).throw(ValueError("bad")))
+    assert caller.breaker.state == CircuitBreaker.OPEN
+
+
+def test_cancelled_probe_is_released():
+    clock = Clock()
+    caller = _caller(clock)
+    _half_open(caller, clock)
+
+    async def go():
+        task = asyncio.ensure_future(caller.call(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await caller.call(lambda: asyncio.sleep(0, "probe"))
+
+    assert asyncio.run(go()) == "probe"
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_interrupted_sync_probe_is_released():
+    clock = Clock()
+    caller = _caller(clock)
+    _half_open(caller, clock)
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        caller.call_sync(interrupted)
+    assert caller.call_sync(lambda: "probe") == "probe"
+
+
+def test_hedge_wins_and_cancel_stops_both_requests():
+    caller = _caller(hedge_after=0.01)
+    started = []
+
+    async def slow_then_fast():
+        started.append(asyncio.current_task())
+        await asyncio.sleep(10 if len(started) == 1 else 0)
+        return len(started)
+
+    assert asyncio.run(caller.call(slow_then_fast)) == 2
+    assert caller.stats()["hedge_wins"] == 1
+    assert all(task.done() for task in started)
+
+    started.clear()
+
+    async def cancel_mid_hedge():
+        task = asyncio.ensure_future(caller.call(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(cancel_mid_hedge()) == []
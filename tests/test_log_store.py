@@ -0,0 +1,109 @@
+import os
+import threading
+
+import pytest
+
+from state import log_store
+from state.log_store import LogBackend
+
+
+def _task(i: int) -> dict:
+    return {"id": i, "title": f"task {i}", "created_at": "2025-01-01T00:00:00", "due": None,
+            "priority": "Medium", "done": False}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "tasks.log")
+
+
+def _ids(backend):
+    return sorted(t["id"] for t in backend.all())
+
+
+def test_reopen_replays_log_and_snapshot(path):
+    backend = LogBackend(path, compact_every=5, fsync=False)
+    for i in range(12):
+        backend.upsert_many([_task(i)])
+    backend.mark_done(3)
+    backend.delete([4])
+    backend.close()
+
+    reopened = LogBackend(path, compact_every=5, fsync=False)
+    assert _ids(reopened) == [i for i in range(12) if i != 4]
+    assert [t["done"] for t in reopened.all() if t["id"] == 3] == [True]
+    assert reopened.stats()["seq"] == 14
+    reopened.close()
+
+
+def test_torn_final_line_is_dropped_and_truncated(path):
+    backend = LogBackend(path, compact_every=100, fsync=False)
+    backend.upsert_many([_task(1), _task(2)])
+    backend.close()
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write('{"op":"put","tasks":[{"id":3')
+
+    reopened = LogBackend(path, compact_every=100, fsync=False)
+    assert _ids(reopened) == [1, 2]
+    reopened.upsert_many([_task(5)])
+    reopened.close()
+    assert _ids(LogBackend(path, compact_every=100, fsync=False)) == [1, 2, 5]
+
+
+def test_compact_while_compactor_runs_snapshots_latest_state(path, monkeypatch):
+    release = threading.Event()
+    write_snapshot = LogBackend._write_snapshot
+    calls = []
+
+    def slow_snapshot(self, seq, tasks):
+        calls.append(seq)
+        if len(calls) == 1:
+            release.wait(5)
+        write_snapshot(self, seq, tasks)
+
+    monkeypatch.setattr(LogBackend, "_write_snapshot", slow_snapshot)
+    backend = LogBackend(path, compact_every=4, fsync=False)
+    for i in range(4):
+        backend.upsert_many([_task(i)])  # the 4th append starts a compaction that blocks
+    for i in range(4, 7):
+        backend.upsert_many([_task(i)])
+    assert backend.stats()["records_since_snapshot"] == 3
+
+    threading.Timer(0.05, release.set).start()
+    backend.compact()
+    stats = backend.stats()
+    assert calls == [4, 7]
+    assert stats["records_since_snapshot"] == 0
+    assert stats["compactions"] == 2
+    assert not os.path.exists(backend.rotated_path)
+    backend.close()
+
+    with open(path + ".snapshot", "rb") as fh:
+        assert b'"seq":7' in fh.readline()
+    assert _ids(LogBackend(path, compact_every=4, fsync=False)) == list(range(7))
+
+
+def test_failed_compaction_is_retried_without_losing_records(path, monkeypatch):
+    replace = os.replace
+    failures = []
+
+    def flaky_replace(src, dst):
+        if dst.endswith(".snapshot") and not failures:
+            failures.append(dst)
+            raise OSError("disk full")
+        replace(src, dst)
+
+    monkeypatch.setattr(log_store.os, "replace", flaky_replace)
+    backend = LogBackend(path, compact_every=3, fsync=False)
+    for i in range(3):
+        backend.upsert_many([_task(i)])
+    backend._compactor.join()
+    assert failures and os.path.exists(backend.rotated_path)
+
+    for i in range(3, 5):
+        backend.upsert_many([_task(i)])
+    backend.compact()
+    assert not os.path.exists(backend.rotated_path)
+    assert backend.stats()["records_since_snapshot"] == 0
+    backend.close()
+    assert _ids(LogBackend(path, compact_every=3, fsync=False)) == list(range(5))
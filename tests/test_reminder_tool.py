@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from tools.reminder_dispatcher import QueueSink, ReminderDispatcher
+from tools.reminder_tool import ReminderTool
+
+NOW = datetime(2025, 3, 3, 9)
+
+
+def _at(minutes: int) -> str:
+    return (NOW + timedelta(minutes=minutes)).isoformat()
+
+
+def test_re_adding_reminders_does_not_duplicate_them():
+    tool = ReminderTool()
+    session = ReminderTool()
+    session.create_reminders([{"task_id": 1, "remind_at": _at(5)}, {"task_id": 2, "remind_at": _at(10)}])
+    for _ in range(50):
+        tool.create_reminders(session.list_reminders())
+    assert [r["id"] for r in tool.list_reminders()] == [r["id"] for r in session.list_reminders()]
+    assert tool.pending_count() == 2
+
+
+def test_popped_reminders_are_no_longer_listed():
+    tool = ReminderTool()
+    first = tool.create_reminder(1, _at(5))
+    second = tool.create_reminder(2, _at(60))
+    assert tool.pop_due(NOW + timedelta(minutes=30)) == [first]
+    assert tool.list_reminders() == [second]
+    assert tool.pending_count() == 1
+    # handing the app-wide tool a fresh batch every run keeps it bounded
+    for i in range(100):
+        tool.create_reminders([{"task_id": 3, "remind_at": _at(i % 20)}])
+        tool.pop_due(NOW + timedelta(minutes=30))
+    assert tool.list_reminders() == [second]
+
+
+def test_unparseable_reminder_is_listed_but_never_due():
+    tool = ReminderTool()
+    tool.create_reminder(1, "whenever")
+    assert tool.pop_due(NOW + timedelta(days=365)) == []
+    assert len(tool.list_reminders()) == 1
+    assert tool.next_due() is None
+
+
+def test_pop_due_respects_limit_and_order():
+    tool = ReminderTool()
+    tool.create_reminders([{"task_id": i, "remind_at": _at(10 - i)} for i in range(5)])
+    assert [r["task_id"] for r in tool.pop_due(NOW + timedelta(hours=1), limit=3)] == [4, 3, 2]
+    assert [r["task_id"] for r in tool.pop_due(NOW + timedelta(hours=1))] == [1, 0]
+
+
+def test_dispatcher_drain_delivers_due_reminders_once():
+    tool = ReminderTool()
+    tool.create_reminders([{"task_id": i, "remind_at": _at(i)} for i in range(5)])
+    sink = QueueSink()
+    dispatcher = ReminderDispatcher(tool, sink, clock=lambda: NOW + timedelta(minutes=2))
+
+    async def go():
+        await dispatcher.drain()
+        await dispatcher.drain()
+
+    asyncio.run(go())
+    assert [sink.queue.get_nowait()["task_id"] for _ in range(sink.queue.qsize())] == [0, 1, 2]
+    assert dispatcher.stats()["delivered"] == 3
+    assert dispatcher.stats()["pending"] == 2
+    assert [r["task_id"] for r in tool.list_reminders()] == [3, 4]
+
+
+def test_dispatcher_counts_sink_failures():
+    tool = ReminderTool()
+    tool.create_reminder(1, _at(0))
+
+    def broken(reminder):
+        raise RuntimeError("sink down")
+
+    dispatcher = ReminderDispatcher(tool, broken, clock=lambda: NOW)
+    asyncio.run(dispatcher.drain())
+    assert dispatcher.failed == 1 and dispatcher.delivered == 0
+
+
+def test_dispatch_once_leaves_backlog_in_the_tool_when_queue_is_full():
+    tool = ReminderTool()
+    tool.create_reminders([{"task_id": i, "remind_at": _at(0)} for i in range(5)])
+    dispatcher = ReminderDispatcher(tool, QueueSink(), clock=lambda: NOW, queue_size=2)
+    assert dispatcher.dispatch_once() == 2
+    assert dispatcher.dispatch_once() == 0
+    assert tool.pending_count() == 3
@@ -0,0 +1,36 @@
+from schemas import EVENT, REPORT, TASK_INPUT
+
+MESSY_TASKS = [
+    {"title": "Finish report", "due": "2025-11-25T17:00:00", "priority": "High"},
+    {"title": "  study React ", "due": " null ", "priority": "urgent"},
+    {"title": "", "due": None},
+    {"title": 42},
+    {"title": "walk", "due": 5},
+    "not a task",
+]
+
+
+def test_task_input_batch_matches_per_item_validation():
+    expected = [TASK_INPUT.validate(item) for item in MESSY_TASKS]
+    assert TASK_INPUT.validate_many(MESSY_TASKS) == [v for v in expected if v is not None]
+    assert TASK_INPUT.validate_many(MESSY_TASKS) == [
+        {"title": "Finish report", "due": "2025-11-25T17:00:00", "priority": "High"},
+        {"title": "study React", "due": None, "priority": "Medium"},
+        {"title": "walk", "due": None, "priority": "Medium"},
+    ]
+    assert TASK_INPUT.validate_many("not a list") == []
+
+
+def test_event_coerces_duration_and_defaults_start_time():
+    event = EVENT.validate({"title": " Standup ", "duration_mins": "15"})
+    assert event["title"] == "Standup" and event["duration_mins"] == 15 and event["notes"] == ""
+    assert event["start_time"]
+    assert EVENT.validate({"title": "x", "start_time": "2025-01-01T09:00:00", "duration_mins": "soon"})["duration_mins"] is None
+    assert EVENT.validate({"start_time": "2025-01-01T09:00:00"}) is None
+
+
+def test_report_defaults_for_unusable_output():
+    assert REPORT.defaults() == {"summary": "No summary available", "completed_count": 0,
+                                 "pending_count": 0, "top_actions": []}
+    report = REPORT.validate({"summary": "ok", "completed_count": "3", "top_actions": ["a", 1, "b"]})
+    assert report["completed_count"] == 3 and report["top_actions"] == ["a", "b"]
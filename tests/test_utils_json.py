@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+from benchmarks.json_parse_bench import CORPUS, large_fenced, large_truncated, large_wrapped
+from utils import safe_parse_json
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('[{"title": "a"}]', [{"title": "a"}]),
+    ('Sure:\n[{"title": "a"}] thanks', [{"title": "a"}]),
+    ('```json\n{"a": [1, 2,],}\n```', {"a": [1, 2]}),
+    ('Note [see below: {"title": "x"}', {"title": "x"}),
+    ('Tasks [draft\n[{"title": "x"}]', [{"title": "x"}]),
+    ('[{"title": "a"},{"title": "b', [{"title": "a"}]),
+    ('{"tasks": [{"t": 1}, {"t": 2}], "note": "abc', {"tasks": [{"t": 1}, {"t": 2}]}),
+    ('[1,[1,[1, ', [1, [1, [1]]]),
+    ('a [x {"k": [1,2,]} ', {"k": [1, 2]}),
+    ('[{"title": "He said \\"done]\\" already"}]', [{"title": 'He said "done]" already'}]),
+    ('x [{"a": "raw\nnewline"}, {"b": 1}]', {"b": 1}),
+    ('[{"a": "ok"}, {"b": "cut', [{"a": "ok"}]),
+    ('"just a string"', "just a string"),
+])
+def test_recovers(text, expected):
+    assert safe_parse_json(text) == expected
+
+
+def test_gives_up_with_default():
+    assert safe_parse_json("No JSON here at all", default=[]) == []
+    assert safe_parse_json('[{"title": "x', default="d") == "d"
+    assert safe_parse_json("[" * 20000) is None
+
+
+def test_bench_inputs():
+    assert sum(safe_parse_json(t) is not None for t in CORPUS) == len(CORPUS) - 1
+    for text in (large_fenced(), large_wrapped(), large_truncated()):
+        assert len(safe_parse_json(text)) == 300
+
+
+@pytest.mark.parametrize("unit", ['[{"a":1', "x [ ", "{", "a{b]", '{"a":[1,2,]} [', "[1,"])
+def test_pathological_inputs_scale_linearly(unit):
+    def elapsed(n):
+        text = unit * n
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            safe_parse_json(text)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    small, large = elapsed(2000), elapsed(16000)
+    # 8x the input; a quadratic scan would take ~64x as long
+    assert large < 24 * small + 0.01
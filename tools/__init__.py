@@ -1,4 +1,4 @@
-from .calendar_tool import CalendarTool
+from .calendar_tool import CalendarConflict, CalendarTool
 from .reminder_tool import ReminderTool
 
-__all__ = ["CalendarTool", "ReminderTool"]
+__all__ = ["CalendarConflict", "CalendarTool", "ReminderTool"]
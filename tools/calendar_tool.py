@@ -1,29 +1,195 @@
-from typing import Dict, Any
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from heapq import merge
+from typing import Any, Iterable, List, Mapping, Optional, Tuple, Union
 import uuid
 
+from normalize import local_naive
+from records import Event
+
+When = Union[datetime, str]
+Span = Tuple[datetime, datetime, Event]
+
+# Events longer than this (multi-day blocks, vacations) are kept out of the
+# start-sorted index so they do not widen its lookback window
+LONG_SPAN = timedelta(days=1)
+
+
+class CalendarConflict(ValueError):
+    """Raised by `add_event(..., allow_overlap=False)` when the slot is taken."""
+
+    def __init__(self, title: str, conflicts: List[Event]):
+        super().__init__(f"{title!r} overlaps {', '.join(repr(e['title']) for e in conflicts)}")
+        self.conflicts = conflicts
+
+
+def _span_start(span: Span) -> datetime:
+    return span[0]
+
+
+def _require_dt(value: When) -> datetime:
+    dt = local_naive(value)
+    if dt is None:
+        raise ValueError(f"not a date/time: {value!r}")
+    return dt
+
 
 class CalendarTool:
-    """In-memory calendar tool. Stores events with title, start_time, duration_mins, notes."""
-    
+    """In-memory calendar tool. Stores events with title, start_time, duration_mins, notes.
+
+    Besides the insertion-ordered list, events are kept in an interval index
+    sorted by parsed start time with end times precomputed. A query only
+    looks back as far as the longest indexed event, so events longer than
+    `LONG_SPAN` go to a separate list that is checked in full. Range
+    queries (`events_between`), overlap checks and `find_free_slots` thus
+    cost O(log n + k + m), with k events in or just before the range and m
+    long events, instead of parsing every event. Events whose start_time
+    cannot be parsed are listed but never block time.
+    """
+
+    # everything is in-memory: `tools.invocation` calls methods on the event loop
+    invoke_mode = "inline"
+
     def __init__(self):
         self._calendar = []
+        self._starts: List[datetime] = []
+        self._spans: List[Span] = []
+        # longest indexed event; bounds how far before a range an overlapping event can start
+        self._max_span = timedelta(0)
+        self._long: List[Span] = []     # events longer than LONG_SPAN, by start
+
+    def add_event(self, title: str, start_time: str, duration_mins: int = 60, notes: str = "",
+                  allow_overlap: bool = True) -> Event:
+        """Add an event to the calendar.
 
-    def add_event(self, title: str, start_time: str, duration_mins: int = 60, notes: str = "") -> Dict[str, Any]:
-        """Add an event to the calendar."""
-        event = {
-            "id": str(uuid.uuid4()),
-            "title": title,
-            "start_time": start_time,
-            "duration_mins": duration_mins,
-            "notes": notes if isinstance(notes, str) else ""
-        }
+        With `allow_overlap=False` an event that overlaps existing ones is not
+        added and `CalendarConflict` is raised instead.
+        """
+        event, span = self._make_event(title, start_time, duration_mins, notes)
+        if span is not None:
+            start, end = span
+            if not allow_overlap:
+                conflicts = self._overlapping(start, end)
+                if conflicts:
+                    raise CalendarConflict(title, conflicts)
+            if end - start > LONG_SPAN:
+                insort(self._long, (start, end, event), key=_span_start)
+            else:
+                i = bisect_right(self._starts, start)
+                self._starts.insert(i, start)
+                self._spans.insert(i, (start, end, event))
+                self._max_span = max(self._max_span, end - start)
         self._calendar.append(event)
         return event
 
-    def list_events(self) -> list:
-        """Return all events."""
+    def add_events(self, events: Iterable[Mapping[str, Any]], allow_overlap: bool = True) -> List[Event]:
+        """Add several events (mappings with add_event's arguments) in one call.
+
+        The index is re-sorted once for the whole batch. With
+        `allow_overlap=False` events are added one by one and the first
+        conflict raises `CalendarConflict`, keeping the ones added before it.
+        """
+        if not allow_overlap:
+            return [self.add_event(e["title"], e["start_time"], e.get("duration_mins", 60), e.get("notes", ""),
+                                   allow_overlap=False) for e in events]
+        added, spans, long = [], [], []
+        for e in events:
+            event, span = self._make_event(e["title"], e["start_time"], e.get("duration_mins", 60), e.get("notes", ""))
+            added.append(event)
+            if span is not None:
+                start, end = span
+                (long if end - start > LONG_SPAN else spans).append((start, end, event))
+        if spans:
+            # timsort merges the sorted index and the new run in near-linear time
+            self._spans.extend(spans)
+            self._spans.sort(key=_span_start)
+            self._starts = [s for s, _, _ in self._spans]
+            self._max_span = max(self._max_span, max(e - s for s, e, _ in spans))
+        if long:
+            self._long.extend(long)
+            self._long.sort(key=_span_start)
+        self._calendar.extend(added)
+        return added
+
+    @staticmethod
+    def _make_event(title, start_time, duration_mins, notes) -> Tuple[Event, Optional[Tuple[datetime, datetime]]]:
+        event = Event(
+            id=str(uuid.uuid4()),
+            title=title,
+            start_time=start_time,
+            duration_mins=duration_mins,
+            notes=notes if isinstance(notes, str) else "",
+        )
+        start = local_naive(start_time)
+        if start is None:
+            return event, None
+        try:
+            end = start + timedelta(minutes=int(duration_mins or 0))
+        except (TypeError, ValueError):
+            end = start
+        return event, (start, end)
+
+    def list_events(self) -> List[Event]:
+        """Return all events (immutable records, so the list is only a shallow copy)."""
         return list(self._calendar)
-    
+
+    def _overlapping(self, start: datetime, end: datetime) -> List[Event]:
+        lo = bisect_left(self._starts, start - self._max_span)
+        hi = bisect_left(self._starts, end) if end > start else bisect_right(self._starts, start)
+        found = [span for span in self._spans[lo:hi] if span[1] > start or span[0] == start]
+        if self._long:
+            long = [span for span in self._long if span[1] > start and (span[0] < end or span[0] == start)]
+            if long:
+                found = merge(found, long, key=_span_start)
+        return [ev for _, _, ev in found]
+
+    def events_between(self, start: When, end: When) -> List[Event]:
+        """Events overlapping [start, end), in start-time order."""
+        return self._overlapping(_require_dt(start), _require_dt(end))
+
+    def overlaps(self, start_time: When, duration_mins: int = 60) -> List[Event]:
+        """Existing events that a new event at `start_time` would overlap."""
+        start = _require_dt(start_time)
+        return self._overlapping(start, start + timedelta(minutes=int(duration_mins)))
+
+    def intervals(self) -> List[Tuple[datetime, datetime]]:
+        """Sorted (start, end) pairs of every schedulable event."""
+        return [(s, e) for s, e, _ in merge(self._spans, self._long, key=_span_start)]
+
+    def find_free_slots(self, window: Tuple[When, When], duration: int = 30,
+                        gap_mins: int = 0) -> List[Tuple[datetime, datetime]]:
+        """Free (start, end) gaps of at least `duration` minutes inside `window`.
+
+        `gap_mins` of padding is kept after each existing event and before
+        the next one.
+        """
+        window_start, window_end = _require_dt(window[0]), _require_dt(window[1])
+        need = timedelta(minutes=int(duration))
+        gap = timedelta(minutes=int(gap_mins))
+        slots = []
+        cursor = window_start
+        lo = bisect_left(self._starts, window_start - self._max_span - gap)
+        hi = bisect_left(self._starts, window_end + gap)
+        spans = self._spans[lo:hi]
+        if self._long:
+            long = [span for span in self._long if span[1] + gap > window_start and span[0] < window_end + gap]
+            if long:
+                spans = merge(spans, long, key=_span_start)
+        for s, e, _ in spans:
+            free_until = min(s - gap, window_end)
+            if free_until - cursor >= need:
+                slots.append((cursor, free_until))
+            cursor = max(cursor, e + gap)
+            if cursor >= window_end:
+                return slots
+        if window_end - cursor >= need:
+            slots.append((cursor, window_end))
+        return slots
+
     def clear_events(self) -> None:
         """Clear all events (for stateless operation)."""
         self._calendar.clear()
+        self._starts.clear()
+        self._spans.clear()
+        self._max_span = timedelta(0)
+        self._long.clear()
@@ -0,0 +1,130 @@
+"""Call tool methods from async code without paying for what they don't need.
+
+Each (tool, method) is classified once, on first use or by `register(tool)`:
+
+- "await": the method is a coroutine function; it is awaited directly,
+- "inline": cheap synchronous work (in-memory lists, dicts); called on the
+  event loop with no thread hop,
+- "executor": synchronous work that really blocks (file or network I/O);
+  run with `asyncio.to_thread`.
+
+A sync method is "executor" unless it, or its class via an `invoke_mode`
+attribute, says otherwise; decorate with `@inline` / `@blocking` to mark a
+single method. Every call is timed per "tool.method"; see `stats()`.
+"""
+
+import time
+import asyncio
+import inspect
+import weakref
+import threading
+from typing import Any, Dict
+
+INLINE = "inline"
+EXECUTOR = "executor"
+AWAIT = "await"
+MODES = (INLINE, EXECUTOR, AWAIT)
+
+_modes: "weakref.WeakKeyDictionary[Any, Dict[str, str]]" = weakref.WeakKeyDictionary()
+_stats: Dict[str, list] = {}
+# invoke() runs on every worker thread's event loop
+_stats_lock = threading.Lock()
+
+
+def inline(fn):
+    """Mark a sync method as cheap enough to call on the event loop."""
+    fn._invoke_mode = INLINE
+    return fn
+
+
+def blocking(fn):
+    """Mark a sync method as blocking; it will run in a worker thread."""
+    fn._invoke_mode = EXECUTOR
+    return fn
+
+
+def classify(target: Any, method: str) -> str:
+    """The dispatch mode for `target.<method>` (not cached; see `mode_of`)."""
+    fn = getattr(target, method)
+    if inspect.iscoroutinefunction(fn):
+        return AWAIT
+    mode = getattr(fn, "_invoke_mode", None) or getattr(target, "invoke_mode", None)
+    return mode if mode in (INLINE, EXECUTOR) else EXECUTOR
+
+
+def mode_of(target: Any, method: str) -> str:
+    """Cached `classify`."""
+    try:
+        modes = _modes.get(target)
+        if modes is None:
+            modes = _modes[target] = {}
+    except TypeError:  # not weak-referenceable; classify every time
+        return classify(target, method)
+    mode = modes.get(method)
+    if mode is None:
+        mode = modes[method] = classify(target, method)
+    return mode
+
+
+def _is_method(target: Any, name: str) -> bool:
+    # look the attribute up without running it: a property such as
+    # TaskMemory.tasks would otherwise read the whole store
+    try:
+        attr = inspect.getattr_static(target, name)
+    except AttributeError:
+        return False
+    if isinstance(attr, (staticmethod, classmethod)):
+        return True
+    return callable(attr) and not inspect.isdatadescriptor(attr)
+
+
+def register(target: Any) -> Dict[str, str]:
+    """Classify every public method of `target` up front; returns the modes.
+
+    Properties and other data attributes are skipped without being evaluated.
+    """
+    return {name: mode_of(target, name) for name in dir(target)
+            if not name.startswith("_") and _is_method(target, name)}
+
+
+def _name(target: Any) -> str:
+    name = getattr(target, "name", None)
+    return name if isinstance(name, str) else type(target).__name__
+
+
+async def invoke(target: Any, method: str, *args, **kwargs) -> Any:
+    """Call `target.<method>(*args, **kwargs)` the way its mode says."""
+    mode = mode_of(target, method)
+    fn = getattr(target, method)
+    started = time.perf_counter()
+    try:
+        if mode == AWAIT:
+            return await fn(*args, **kwargs)
+        if mode == INLINE:
+            return fn(*args, **kwargs)
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - started
+        key = f"{_name(target)}.{method}"
+        with _stats_lock:
+            entry = _stats.get(key)
+            if entry is None:
+                entry = _stats[key] = [mode, 0, 0.0, 0.0]
+            entry[1] += 1
+            entry[2] += elapsed
+            entry[3] = max(entry[3], elapsed)
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Per "tool.method": mode, calls and average/max seconds per call."""
+    with _stats_lock:
+        entries = [(key, tuple(entry)) for key, entry in _stats.items()]
+    return {
+        key: {"mode": mode, "calls": calls, "avg_s": round(total / calls, 9) if calls else 0.0, "max_s": round(peak, 9)}
+        for key, (mode, calls, total, peak) in entries
+    }
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,183 @@
+"""Deliver due reminders from a `ReminderTool` to a pluggable sink.
+
+`ReminderDispatcher.run()` is a long-running coroutine: each tick it pops
+due reminders (O(log n) each, however many are pending) into a bounded
+queue that `concurrency` workers drain into the sink. Reminders are only
+popped while the queue has room, so a slow sink leaves the backlog in the
+tool's heap instead of in memory twice (backpressure). Between ticks it
+sleeps until the next reminder is due, capped at `tick` seconds so newly
+created reminders are picked up promptly.
+
+A sink is any callable taking a `Reminder` (sync or async) or an object
+with a `deliver(reminder)` method; `LogSink`, `QueueSink` and
+`WebhookSink` are provided. `clock` and `sleep` are injectable, so tests
+can drive the dispatcher with a fake clock or call `dispatch_once()`.
+"""
+
+import json
+import asyncio
+import inspect
+import logging
+import urllib.request
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from records import Reminder
+from normalize import local_naive
+from tools.reminder_tool import ReminderTool
+
+logger = logging.getLogger(__name__)
+
+
+class LogSink:
+    """Log each reminder at INFO."""
+
+    def deliver(self, reminder: Reminder) -> None:
+        logger.info("Reminder due: task %s at %s", reminder["task_id"], reminder["remind_at"])
+
+
+class QueueSink:
+    """Put reminders on an asyncio.Queue; a bounded queue applies backpressure."""
+
+    def __init__(self, queue: Optional[asyncio.Queue] = None):
+        self.queue = queue if queue is not None else asyncio.Queue()
+
+    async def deliver(self, reminder: Reminder) -> None:
+        await self.queue.put(reminder)
+
+
+class WebhookSink:
+    """POST each reminder as JSON to `url` (blocking I/O runs in a thread).
+
+    `post(url, body)` can be replaced, e.g. with a stub that records calls.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0, post: Optional[Callable[[str, bytes], Any]] = None):
+        self.url = url
+        self.timeout = timeout
+        self.post = post or self._post
+
+    def _post(self, url: str, body: bytes) -> None:
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    async def deliver(self, reminder: Reminder) -> None:
+        body = json.dumps(reminder.to_dict(), default=str).encode("utf-8")
+        await asyncio.to_thread(self.post, self.url, body)
+
+
+def make_sink(spec: str):
+    """Sink from a WORKFLOWGENIE_REMINDER_SINK value: "log" or an http(s) URL."""
+    spec = (spec or "").strip()
+    if spec.lower() == "log":
+        return LogSink()
+    if spec.startswith(("http://", "https://")):
+        return WebhookSink(spec)
+    raise ValueError(f"unknown reminder sink {spec!r}; expected 'log' or a webhook URL")
+
+
+class ReminderDispatcher:
+    """Pop due reminders from `tool` and hand them to `sink`."""
+
+    def __init__(self, tool: ReminderTool, sink, *, clock: Callable[[], datetime] = datetime.now,
+                 sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep, tick: float = 1.0,
+                 queue_size: int = 1000, concurrency: int = 4):
+        self.tool = getattr(tool, "_impl", tool)  # accept the ADK wrapper too
+        deliver = getattr(sink, "deliver", sink)
+        self._deliver = deliver
+        self._deliver_is_async = inspect.iscoroutinefunction(deliver)
+        self.clock = clock
+        self.sleep = sleep
+        self.tick = tick
+        self.queue_size = max(1, int(queue_size))
+        self.concurrency = max(1, int(concurrency))
+        self._queue: Optional[asyncio.Queue] = None
+        self._stopping = False
+        self.delivered = 0
+        self.failed = 0
+        self.max_lag_s = 0.0
+
+    def _ensure_queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.queue_size)
+        return self._queue
+
+    def dispatch_once(self, now: Optional[datetime] = None) -> int:
+        """Move due reminders into the delivery queue, as far as it has room."""
+        queue = self._ensure_queue()
+        room = queue.maxsize - queue.qsize()
+        if room <= 0:
+            return 0
+        due = self.tool.pop_due(now or self.clock(), limit=room)
+        for reminder in due:
+            queue.put_nowait(reminder)
+        return len(due)
+
+    async def _deliver_one(self, reminder: Reminder) -> None:
+        try:
+            if self._deliver_is_async:
+                await self._deliver(reminder)
+            else:
+                self._deliver(reminder)
+        except Exception:
+            self.failed += 1
+            logger.exception("Reminder %s for task %s could not be delivered", reminder["id"], reminder["task_id"])
+            return
+        self.delivered += 1
+        due_at = local_naive(reminder["remind_at"])
+        if due_at is not None:
+            self.max_lag_s = max(self.max_lag_s, (self.clock() - due_at).total_seconds())
+
+    async def _worker(self) -> None:
+        queue = self._ensure_queue()
+        while True:
+            reminder = await queue.get()
+            try:
+                await self._deliver_one(reminder)
+            finally:
+                queue.task_done()
+
+    async def drain(self) -> None:
+        """Deliver everything due now, inline; for use when `run()` is not running."""
+        queue = self._ensure_queue()
+        while self.dispatch_once() or queue.qsize():
+            while queue.qsize():
+                await self._deliver_one(queue.get_nowait())
+                queue.task_done()
+
+    async def run(self) -> None:
+        """Dispatch until `stop()` is called (or the task is cancelled)."""
+        queue = self._ensure_queue()
+        self._stopping = False
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        try:
+            while not self._stopping:
+                self.dispatch_once()
+                if queue.full():
+                    # the sink is behind: wait for room instead of popping more
+                    await self.sleep(min(self.tick, 0.05))
+                    continue
+                next_due = self.tool.next_due()
+                delay = self.tick
+                if next_due is not None:
+                    delay = min(delay, max(0.0, (next_due - self.clock()).total_seconds()))
+                await self.sleep(delay)
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def stop(self) -> None:
+        """Ask `run()` to finish after delivering what is already queued."""
+        self._stopping = True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self.tool.pending_count(),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "max_lag_s": round(self.max_lag_s, 3),
+        }
@@ -1,27 +1,110 @@
-from typing import Dict, Any
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+import heapq
+import logging
+import threading
 import uuid
 
+from records import Reminder
+from normalize import local_naive
+
+logger = logging.getLogger(__name__)
+
 
 class ReminderTool:
-    """In-memory reminder tool. Stores reminders for tasks."""
-    
+    """In-memory reminder tool. Stores reminders for tasks.
+
+    Undelivered reminders are also kept in a min-heap keyed on the parsed
+    `remind_at`, so `pop_due` costs O(log n) per reminder returned no matter
+    how many are pending. Reminders are keyed by id, so handing the same
+    reminder over twice stores it once, and `pop_due` drops what it returns:
+    `list_reminders` shows only undelivered reminders. Reminders whose time
+    cannot be parsed are listed but never come due. Safe to use from several
+    threads.
+    """
+
+    # everything is in-memory: `tools.invocation` calls methods on the event loop
+    invoke_mode = "inline"
+
     def __init__(self):
-        self._reminders = []
+        self._reminders: Dict[str, Reminder] = {}
+        self._heap: List[Tuple[datetime, int, Reminder]] = []
+        self._seq = 0
+        self._lock = threading.Lock()
 
-    def create_reminder(self, task_id: int, remind_at: str) -> Dict[str, Any]:
+    def create_reminder(self, task_id: int, remind_at: str) -> Reminder:
         """Create a reminder for a task at a specific time."""
-        r = {
-            "id": str(uuid.uuid4()),
-            "task_id": task_id,
-            "remind_at": remind_at
-        }
-        self._reminders.append(r)
+        r = Reminder(id=str(uuid.uuid4()), task_id=task_id, remind_at=remind_at)
+        at = local_naive(remind_at)
+        with self._lock:
+            self._reminders[r.id] = r
+            if at is None:
+                logger.warning("ReminderTool: unparseable remind_at %r; reminder will not fire", remind_at)
+            else:
+                # the sequence number keeps equal times in creation order
+                self._seq += 1
+                heapq.heappush(self._heap, (at, self._seq, r))
         return r
 
-    def list_reminders(self) -> list:
-        """Return all reminders."""
-        return list(self._reminders)
-    
+    def create_reminders(self, reminders: Iterable[Mapping[str, Any]]) -> List[Reminder]:
+        """Create several reminders (mappings with task_id and remind_at) under one lock.
+
+        An item that carries an `id` keeps it, and one whose id is already
+        stored is skipped, so moving reminders between tools never duplicates
+        them. Returns the reminders actually added.
+        """
+        created = []
+        unparseable = 0
+        with self._lock:
+            for item in reminders:
+                rid = item.get("id") or str(uuid.uuid4())
+                if rid in self._reminders:
+                    continue
+                r = Reminder(id=rid, task_id=item["task_id"], remind_at=item["remind_at"])
+                self._reminders[rid] = r
+                created.append(r)
+                at = local_naive(r.remind_at)
+                if at is None:
+                    unparseable += 1
+                    continue
+                self._seq += 1
+                heapq.heappush(self._heap, (at, self._seq, r))
+        if unparseable:
+            logger.warning("ReminderTool: %d reminder(s) with unparseable remind_at will not fire", unparseable)
+        return created
+
+    def pop_due(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[Reminder]:
+        """Remove and return undelivered reminders due at or before `now`, earliest first.
+
+        At most `limit` are returned; the rest stay queued. Returned reminders
+        are no longer listed.
+        """
+        now = now or datetime.now()
+        due = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now and (limit is None or len(due) < limit):
+                r = heapq.heappop(heap)[2]
+                self._reminders.pop(r.id, None)
+                due.append(r)
+        return due
+
+    def next_due(self) -> Optional[datetime]:
+        """When the earliest undelivered reminder is due (None if none are)."""
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def pending_count(self) -> int:
+        """Number of reminders not yet returned by `pop_due`."""
+        return len(self._heap)
+
+    def list_reminders(self) -> List[Reminder]:
+        """Return all reminders not yet returned by `pop_due`, in creation order."""
+        with self._lock:
+            return list(self._reminders.values())
+
     def clear_reminders(self) -> None:
         """Clear all reminders (for stateless operation)."""
-        self._reminders.clear()
+        with self._lock:
+            self._reminders.clear()
+            self._heap.clear()
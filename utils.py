@@ -1,45 +1,329 @@
 import json
 import re
 import logging
+from bisect import bisect_left
 
 logger = logging.getLogger(__name__)
 
 
+_CLOSERS = {"{": "}", "[": "]"}
+_DECODER = json.JSONDecoder()
+# A string literal the decoder accepts (no raw control chars, valid escapes),
+# one it rejects (group 1), a lone quote (unterminated string, group 2) or a
+# structural char, each with the whitespace after it
+_TOKEN = re.compile(
+    r'(?:"[^"\\\x00-\x1f]*+(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*+)*+"'
+    r'|("[^"\\]*+(?:\\.[^"\\]*+)*+")|(")|[{}\[\],:])[ \t\n\r]*+'
+)
+_BLANK = re.compile(r"[ \t\n\r]*")
+# Anything else between two tokens must be one scalar, where a value is due
+_SCALAR = re.compile(
+    r"(?:-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?|true|false|null|NaN|-?Infinity)[ \t\n\r]*"
+)
+_NOT_FOUND = object()
+
+# What an open container accepts next
+_KEY0, _KEY, _COLON, _VALUE, _OBJ_NEXT = range(5)     # after "{", ",", key, ":", value
+_ITEM0, _ITEM, _ARR_NEXT = range(5, 8)                # after "[", ",", value
+_WANTS_VALUE = (_VALUE, _ITEM0, _ITEM)
+_CLOSABLE = (_KEY0, _OBJ_NEXT, _ITEM0, _ARR_NEXT)
+_FIRST_STATE = {"{": _KEY0, "[": _ITEM0}
+_MAX_COMMA_FIXES = 4
+
+
 def safe_parse_json(text: str, default=None):
-    """Safely parse JSON from text with multiple fallback strategies."""
+    """Safely parse JSON from text with multiple fallback strategies.
+
+    A valid scalar goes straight to `json.loads`. Anything else is handed to
+    `_scan_json`, a single left-to-right pass that finds the first balanced
+    object/array (preferring the contents of a ``` fence), drops trailing
+    commas and closes truncated output.
+    """
     if not text:
         return default
-    
+
     text = text.strip()
-    
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
-    
-    match = re.search(r'```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```', text, re.DOTALL)
-    if match:
+
+    if text[0] not in "{[":
+        # containers are decoded by the scan below at no extra cost
         try:
-            return json.loads(match.group(1))
+            return json.loads(text)
         except json.JSONDecodeError:
             pass
-    
-    brace_match = re.search(r'\{.*\}', text, re.DOTALL)
-    if brace_match:
+
+    fence = text.find("```")
+    try:
+        if fence >= 0:
+            body = text.find("\n", fence)
+            body = fence + 3 if body < 0 else body + 1
+            result = _scan_json(text, body)
+            if result is _NOT_FOUND:
+                result = _scan_json(text, 0, fence)
+        else:
+            result = _scan_json(text, 0)
+    except RecursionError:
+        result = _NOT_FOUND
+    if result is not _NOT_FOUND:
+        return result
+
+    logger.warning("safe_parse_json: Could not extract valid JSON from: %s", text[:200])
+    return default
+
+
+def _scan_json(text: str, pos: int, end: int = None):
+    """Return the first decodable JSON container in text[pos:end]."""
+    end = len(text) if end is None else end
+    # a failed C decode costs O(position) to report (line/column), so once
+    # failures have cost two passes over the text only tokenizing is used
+    budget = 2 * end
+    next_obj = next_arr = -1
+    while pos < end:
+        # jump to the next container start; cached so each find is amortized
+        if next_obj < pos:
+            next_obj = text.find("{", pos, end)
+            next_obj = end if next_obj < 0 else next_obj
+        if next_arr < pos:
+            next_arr = text.find("[", pos, end)
+            next_arr = end if next_arr < 0 else next_arr
+        start = min(next_obj, next_arr)
+        if start >= end:
+            return _NOT_FOUND
+        result, pos, budget = _scan_candidate(text, start, end, budget)
+        if result is not _NOT_FOUND:
+            return result
+    return _NOT_FOUND
+
+
+def _decode_loose(text: str, start: int, end: int, budget: int):
+    """Decode the value at `start` with the C scanner; return (value, stop, budget).
+
+    On failure `stop` is the offset where decoding failed instead.
+
+    A comma right before the closer the decoder stopped at is a trailing
+    comma: up to `_MAX_COMMA_FIXES` of them are dropped and the decode
+    retried, which is much cheaper than tokenizing for this common slip.
+    """
+    doc = text
+    fixes = 0
+    while True:
         try:
-            return json.loads(brace_match.group(0))
-        except json.JSONDecodeError:
-            pass
-    
-    bracket_match = re.search(r'\[.*\]', text, re.DOTALL)
-    if bracket_match:
+            value, stop = _DECODER.scan_once(doc, start)
+        except json.JSONDecodeError as e:
+            budget -= e.pos
+            error = e.pos
+        except StopIteration as e:
+            error = e.value     # a value was missing somewhere inside
+        else:
+            stop += fixes       # every dropped comma lies before `stop`
+            return (value, stop, budget) if stop <= end else (_NOT_FOUND, end, budget)
+        if fixes == _MAX_COMMA_FIXES or error >= len(doc) or doc[error] not in "}]":
+            return _NOT_FOUND, error + fixes, budget
+        comma = error - 1
+        while doc[comma] in " \t\n\r":
+            comma -= 1
+        if doc[comma] != ",":
+            return _NOT_FOUND, error + fixes, budget
+        doc = doc[:comma] + doc[comma + 1:]
+        fixes += 1
+
+
+def _scan_candidate(text: str, start: int, end: int, budget: int):
+    """Scan the container at `start` once; return (result, resume offset, budget).
+
+    Wherever a container starts in value position the C scanner
+    (`scan_once`) is tried first and, if the value is complete, skipped
+    over whole. Otherwise `_TOKEN` steps through it: it jumps between
+    structural characters and whole string literals, so brackets inside
+    strings are ignored, and the text between tokens is checked against
+    `_SCALAR`/`_BLANK`. Each open container keeps its grammar state, so a
+    syntax error is seen where it occurs: it fails every container then
+    open (`stack[:failed]`), while those opened after it start clean. Only
+    containers known to be valid are decoded, plus one repair of the
+    outermost valid container left open at the end.
+    """
+    first_error = end
+    if budget > 0:
+        value, first_error, budget = _decode_loose(text, start, end, budget)
+        if value is not _NOT_FOUND:
+            return value, first_error, budget
+    # next "}" / "]" at or after the current offset; a container whose closer
+    # does not occur before `first_error` is still open there, so it is not
+    # worth decoding on its own
+    close_at = {"}": -1, "]": -1}
+    scan_once = _DECODER.scan_once
+    search = _TOKEN.search
+    scalar = _SCALAR.fullmatch
+    # open containers as [closer, start, state, last comma, first valid closed descendant]
+    stack = [[_CLOSERS[text[start]], start, _FIRST_STATE[text[start]], -1, None]]
+    failed = 0
+    dropped = []            # indices of trailing commas to remove, ascending
+    quote = -1              # start of an unterminated string
+    pos = _BLANK.match(text, start + 1, end).end()
+    while True:
+        m = search(text, pos, end)
+        if m is None:
+            break
+        i = m.start()
+        c = text[i]
+        top = stack[-1]
+        state = top[2]
+        if pos < i:
+            if state in _WANTS_VALUE and scalar(text, pos, i):
+                state = top[2] = _OBJ_NEXT if state == _VALUE else _ARR_NEXT
+            else:
+                failed = len(stack)
+        pos = m.end()
+        if c == '"':
+            if m.lastindex == 2:
+                # unterminated string: output was cut off mid-value
+                quote = i
+                break
+            if m.lastindex:
+                failed = len(stack)
+            elif state == _KEY0 or state == _KEY:
+                top[2] = _COLON
+            elif state in _WANTS_VALUE:
+                top[2] = _OBJ_NEXT if state == _VALUE else _ARR_NEXT
+            else:
+                failed = len(stack)
+        elif c == ":":
+            if state == _COLON:
+                top[2] = _VALUE
+            else:
+                failed = len(stack)
+        elif c == ",":
+            if state == _OBJ_NEXT:
+                top[2] = _KEY
+            elif state == _ARR_NEXT:
+                top[2] = _ITEM
+            else:
+                failed = len(stack)
+            top[3] = i
+        elif c in "{[":
+            if state in _WANTS_VALUE:
+                top[2] = _OBJ_NEXT if state == _VALUE else _ARR_NEXT
+                closer = _CLOSERS[c]
+                if close_at[closer] < i:
+                    found = text.find(closer, i, end)
+                    close_at[closer] = end if found < 0 else found
+                if budget > 0 and (i > first_error or close_at[closer] < first_error):
+                    try:
+                        value, stop = scan_once(text, i)
+                    except json.JSONDecodeError as e:
+                        budget -= e.pos
+                    except StopIteration:
+                        pass
+                    else:
+                        if stop <= end:
+                            if failed == len(stack):
+                                # every open container has failed, so nothing earlier can win
+                                return value, stop, budget
+                            if top[4] is None:
+                                top[4] = (i, stop)
+                            pos = _BLANK.match(text, stop, end).end()
+                            continue
+            else:
+                failed = len(stack)
+            stack.append([_CLOSERS[c], i, _FIRST_STATE[c], -1, None])
+        elif c != top[0]:
+            # mismatched closer: nothing open can be completed
+            return _resolve_open(text, i, stack, len(stack), dropped, False), i, budget
+        else:
+            if state == _KEY or state == _ITEM:
+                dropped.append(top[3])
+            elif state == _COLON or state == _VALUE:
+                failed = len(stack)
+            stack.pop()
+            depth = len(stack)
+            span = (top[1], i + 1) if failed <= depth else top[4]
+            if failed > depth:
+                failed = depth
+            if not depth:
+                return _decode_span(text, span, dropped), i + 1, budget
+            if span is not None:
+                if stack[-1][4] is None:
+                    stack[-1][4] = span
+                if failed == depth:
+                    # every open container has failed, so nothing earlier can win
+                    result = _decode_span(text, span, dropped)
+                    if result is not _NOT_FOUND:
+                        return result, i + 1, budget
+    # can the innermost container be closed right where the text stops?
+    state = stack[-1][2]
+    if quote >= 0:
+        closable = False
+    elif pos >= end:
+        closable = state in _CLOSABLE
+    else:
+        closable = state in _WANTS_VALUE and scalar(text, pos, end) is not None
+    return _resolve_open(text, end, stack, failed, dropped, closable), end, budget
+
+
+def _resolve_open(text: str, end: int, stack: list, failed: int, dropped: list, closable: bool):
+    """First decodable container among those still open at `end`, in start order.
+
+    A failed container can only offer its first valid closed descendant. The
+    outermost valid one is repaired (closed where it was cut off, or cut back
+    to its last comma); containers inside it would fail the same way.
+    """
+    for k, frame in enumerate(stack):
+        if k >= failed:
+            result = _repair(text, end, stack, k, dropped[bisect_left(dropped, frame[1]):], closable)
+            if result is not _NOT_FOUND:
+                return result
+            return _decode_span(text, frame[4], dropped)
+        if frame[4] is not None:
+            result = _decode_span(text, frame[4], dropped)
+            if result is not _NOT_FOUND:
+                return result
+    return _NOT_FOUND
+
+
+def _repair(text: str, end: int, stack: list, k: int, dropped: list, closable: bool):
+    # close what is open if it stops between members; otherwise cut at the
+    # last comma, dropping the partial member rather than inventing its value
+    start = stack[k][1]
+    if closable:
+        result = _decode(text, start, end, dropped, "".join(f[0] for f in reversed(stack[k:])))
+        if result is not _NOT_FOUND:
+            return result
+    cut_frame = max(range(k, len(stack)), key=lambda j: stack[j][3])
+    cut = stack[cut_frame][3]
+    if cut < start:
+        return _NOT_FOUND
+    return _decode(text, start, cut, [d for d in dropped if d < cut],
+                   "".join(f[0] for f in reversed(stack[k:cut_frame + 1])))
+
+
+def _decode_span(text: str, span, dropped: list):
+    if span is None:
+        return _NOT_FOUND
+    start, end = span
+    lo = bisect_left(dropped, start)
+    return _decode(text, start, end, dropped[lo:bisect_left(dropped, end, lo)])
+
+
+def _decode(text: str, start: int, end: int, dropped: list, suffix: str = ""):
+    if not dropped and not suffix:
         try:
-            return json.loads(bracket_match.group(0))
+            value, stop = _DECODER.raw_decode(text, start)
         except json.JSONDecodeError:
-            pass
-    
-    logger.warning("safe_parse_json: Could not extract valid JSON from: %s", text[:200])
-    return default
+            return _NOT_FOUND
+        return value if stop == end else _NOT_FOUND
+    if dropped:
+        parts = []
+        prev = start
+        for d in dropped:
+            parts.append(text[prev:d])
+            prev = d + 1
+        parts.append(text[prev:end])
+        candidate = "".join(parts)
+    else:
+        candidate = text[start:end]
+    try:
+        return json.loads(candidate + suffix)
+    except json.JSONDecodeError:
+        return _NOT_FOUND
 
 
 def extract_json_object(text: str, default=None):
@@ -57,3 +341,109 @@ def extract_json_array(text: str, default=None):
         return result
     return default or []
 
+
+
+class JSONStreamParser:
+    """Incrementally yield completed items from a JSON document fed in chunks.
+
+    Items are the object/array elements of the top-level array, or, when `key`
+    is given, of the array stored under that key in the top-level object
+    (e.g. `key="events"` for `{"events": [...], ...}`). Leading prose or a
+    ```json fence before the document is skipped. `feed()` returns the items
+    that closed in that chunk; `text` holds everything fed so far so callers
+    can run `safe_parse_json` over it once the stream ends.
+    """
+
+    def __init__(self, key: str = None):
+        self.key = key
+        self.items_emitted = 0
+        self._buf = []
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_key = None
+        self._awaiting_value = False
+        self._target_depth = None
+        self._item_start = -1
+
+    @property
+    def text(self) -> str:
+        if self._buf:
+            self._text += "".join(self._buf)
+            self._buf.clear()
+        return self._text
+
+    def feed(self, chunk: str) -> list:
+        if not chunk:
+            return []
+        self._buf.append(chunk)
+        text = self.text
+        items = []
+        i = self._pos
+        n = len(text)
+        while i < n:
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self.key is not None and self._depth == 1 and not self._awaiting_value:
+                        self._last_key = text[self._string_start + 1:i]
+            elif c == '"':
+                if self._depth > 0:
+                    self._in_string = True
+                    self._string_start = i
+            elif c == ":":
+                if self._depth == 1:
+                    self._awaiting_value = True
+            elif c == ",":
+                if self._depth == 1:
+                    self._awaiting_value = False
+                    self._last_key = None
+            elif c in "{[":
+                if self._depth == 0 and self._target_depth is None:
+                    if self.key is None and c == "[":
+                        self._target_depth = 1
+                elif self._target_depth is None and self.key is not None and self._depth == 1 \
+                        and c == "[" and self._awaiting_value and self._last_key == self.key:
+                    self._target_depth = 2
+                elif self._depth == self._target_depth and self._item_start < 0:
+                    self._item_start = i
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._item_start >= 0 and self._depth == self._target_depth:
+                    try:
+                        items.append(json.loads(text[self._item_start:i + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    self._item_start = -1
+                elif self._target_depth is not None and self._depth == self._target_depth - 1:
+                    # the target array closed; later arrays are not items
+                    self._target_depth = -1
+                if self._depth == 1:
+                    self._awaiting_value = False
+            i += 1
+        self._pos = n
+        self.items_emitted += len(items)
+        return items
+
+
+async def stream_text(llm, prompt: str, **kwargs):
+    """Yield response text chunks from `llm`.
+
+    Uses `llm.generate_stream()` when available and otherwise yields the full
+    `await llm.generate()` result as a single chunk.
+    """
+    stream_fn = getattr(llm, "generate_stream", None)
+    if stream_fn is None:
+        yield await llm.generate(prompt, **kwargs)
+        return
+    async for chunk in stream_fn(prompt, **kwargs):
+        yield chunk
@@ -1,3 +1,3 @@
-from .workflow import build_workflow, run
+from .workflow import build_workflow, run, run_async
 
-__all__ = ["build_workflow", "run"]
+__all__ = ["build_workflow", "run", "run_async"]
@@ -0,0 +1,90 @@
+"""Process-wide event loop for running async workflows from sync code.
+
+`submit(coro)` runs a coroutine on a single long-lived loop in a daemon
+thread and blocks for the result, so synchronous callers such as the Flask
+server pay no loop or thread-pool setup per request and async resources
+(LLM clients, limiters, `asyncio.to_thread` workers) are reused across
+requests.
+"""
+
+import os
+import atexit
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+# Worker threads behind asyncio.to_thread on the shared loop (0 = asyncio default)
+EXECUTOR_WORKERS = int(os.environ.get("WORKFLOWGENIE_EXECUTOR_WORKERS", "0"))
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared loop, starting its thread on first use."""
+    global _loop, _thread
+    if _loop is not None:
+        return _loop
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            if EXECUTOR_WORKERS > 0:
+                loop.set_default_executor(ThreadPoolExecutor(EXECUTOR_WORKERS, thread_name_prefix="workflowgenie"))
+            ready = threading.Event()
+
+            def serve():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            _thread = threading.Thread(target=serve, name="workflowgenie-loop", daemon=True)
+            _thread.start()
+            ready.wait()
+            _loop = loop
+            logger.info("Workflow runtime loop started")
+    return _loop
+
+
+def submit(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """Run `coro` on the shared loop and block until it finishes."""
+    loop = get_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("submit() called from the runtime loop; await the coroutine instead")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
+
+
+async def _finish(loop: asyncio.AbstractEventLoop):
+    # cancel long-running tasks (e.g. a reminder dispatcher) so they exit cleanly
+    tasks = [t for t in asyncio.all_tasks(loop) if t is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await loop.shutdown_default_executor()
+
+
+def shutdown():
+    """Stop the shared loop and its executor (also run at interpreter exit)."""
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop = _thread = None
+    if loop is None:
+        return
+    asyncio.run_coroutine_threadsafe(_finish(loop), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+atexit.register(shutdown)
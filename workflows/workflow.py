@@ -1,62 +1,120 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional, Tuple
 import asyncio
 import inspect
+import logging
+import os
 
 from agents import task_extractor_agent, planner_agent, reminder_agent, reporter_agent
+from workflows import runtime
+
+logger = logging.getLogger(__name__)
+
+# Default per-step timeout in seconds (0 = none)
+STEP_TIMEOUT = float(os.environ.get("WORKFLOWGENIE_STEP_TIMEOUT", "0")) or None
 
 
 class Workflow:
-    """Simple workflow definition."""
+    """Workflow definition: named steps plus the steps each one waits for.
+
+    `add_step` without `depends_on` waits for the previously added step, so
+    plain chains stay sequential; steps whose dependencies are all done run
+    concurrently.
+    """
     def __init__(self, name: str):
         self.name = name
         self.steps = []  # list of (step_func, step_name) tuples
-    
-    def set_entrypoint(self, func):
-        self.steps = [(func, func.__name__)]
-    
-    def add_step(self, func):
-        self.steps.append((func, func.__name__))
+        self.dependencies: Dict[str, Tuple[str, ...]] = {}
+        self.timeouts: Dict[str, Optional[float]] = {}
 
+    def set_entrypoint(self, func, timeout: Optional[float] = None):
+        self.steps = []
+        self.dependencies = {}
+        self.timeouts = {}
+        self.add_step(func, depends_on=(), timeout=timeout)
 
-def run(workflow: Workflow, memory: Any, inputs: Dict[str, Any]):
-    """Execute workflow: run each step sequentially, collecting outputs.
-    
-    IMPORTANT: After all steps complete, the database is automatically cleared
-    to ensure stateless operation (no leftover state between requests).
+    def add_step(self, func, depends_on: Optional[Iterable[str]] = None, timeout: Optional[float] = None):
+        name = func.__name__
+        if depends_on is None:
+            depends_on = (self.steps[-1][1],) if self.steps else ()
+        depends_on = tuple(depends_on)
+        for dep in depends_on:
+            if dep not in self.dependencies:
+                raise ValueError(f"step {name!r} depends on unknown step {dep!r}")
+        self.steps.append((func, name))
+        self.dependencies[name] = depends_on
+        self.timeouts[name] = timeout if timeout is not None else STEP_TIMEOUT
+
+
+async def _run_step(step_func, step_name: str, timeout: Optional[float],
+                    inputs: Dict[str, Any], memory: Any, tools: Dict, llm) -> Any:
+    """Run one step, returning its output or an {"error": ...} dict."""
+    try:
+        if inspect.iscoroutinefunction(step_func):
+            call = step_func(inputs, memory, tools, llm)
+        else:
+            # keep blocking steps off the event loop so siblings can overlap
+            call = asyncio.to_thread(step_func, inputs, memory, tools, llm)
+        output = await asyncio.wait_for(call, timeout) if timeout else await call
+        # If the returned value itself is awaitable, await it as well.
+        if inspect.isawaitable(output):
+            output = await output
+        return output
+    except asyncio.TimeoutError:
+        logger.error("Workflow step %s timed out after %.1fs", step_name, timeout)
+        return {"error": f"timed out after {timeout}s"}
+    except Exception as e:
+        logger.exception(f"Workflow step {step_name} failed: {e}")
+        return {"error": str(e)}
+
+
+async def run_async(workflow: Workflow, memory: Any, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute the workflow's step graph; independent steps run concurrently.
+
+    A failed step records {"error": ...} and does not stop its dependents,
+    which only rely on the shared memory, not on each other's outputs.
     """
-    result = {}
     tools = memory.tools if hasattr(memory, 'tools') else {}
     llm = memory.llm if hasattr(memory, 'llm') else None
+    deps = getattr(workflow, "dependencies", {})
+    timeouts = getattr(workflow, "timeouts", {})
+
+    running: Dict[str, asyncio.Task] = {}
+
+    async def run_after(step_func, step_name):
+        for dep in deps.get(step_name, ()):
+            await running[dep]
+        return await _run_step(step_func, step_name, timeouts.get(step_name),
+                               inputs, memory, tools, llm)
+
+    for step_func, step_name in workflow.steps:
+        running[step_name] = asyncio.ensure_future(run_after(step_func, step_name))
+    await asyncio.gather(*running.values())
+    return {step_name: running[step_name].result() for _, step_name in workflow.steps}
+
+
+def run(workflow: Workflow, memory: Any, inputs: Dict[str, Any], persist_to: Any = None):
+    """Execute workflow steps (see `run_async`), collecting outputs.
     
+    IMPORTANT: After all steps complete, the database is automatically cleared
+    to ensure stateless operation (no leftover state between requests).
+    Pass `persist_to` (another memory) to keep the run's tasks there first.
+    """
     try:
-        for step_func, step_name in workflow.steps:
+        # Synchronous callers (like Flask) submit into the shared runtime
+        # loop instead of creating an event loop per request.
+        result = runtime.submit(run_async(workflow, memory, inputs))
+    finally:
+        if persist_to is not None and hasattr(memory, 'merge_into'):
             try:
-                # If the step function is a coroutine function, run it in an
-                # event loop so legacy synchronous callers (like Flask) can
-                # execute async agents. Also handle the case where a sync
-                # function returns an awaitable.
-                if inspect.iscoroutinefunction(step_func):
-                    output = asyncio.run(step_func(inputs, memory, tools, llm))
-                else:
-                    output = step_func(inputs, memory, tools, llm)
-
-                # If the returned value itself is awaitable, await it as well.
-                if inspect.isawaitable(output):
-                    output = asyncio.run(output)
-
-                result[step_name] = output
+                memory.merge_into(persist_to)
             except Exception as e:
-                import logging
-                logging.getLogger(__name__).exception(f"Workflow step {step_name} failed: {e}")
-                result[step_name] = {"error": str(e)}
-    finally:
+                logger.exception(f"Failed to persist workflow tasks: {e}")
         # Auto-clear DB after workflow completes (stateless operation)
         if hasattr(memory, 'clear_db'):
             try:
                 memory.clear_db()
             except Exception as e:
-                import logging
-                logging.getLogger(__name__).exception(f"Failed to clear DB after workflow: {e}")
+                logger.exception(f"Failed to clear DB after workflow: {e}")
     
     return result
 
@@ -65,7 +123,8 @@ def build_workflow() -> Workflow:
     """Build the WorkFlowGenie workflow."""
     w = Workflow("workflowgenie")
     w.set_entrypoint(task_extractor_agent)
-    w.add_step(planner_agent)
-    w.add_step(reminder_agent)
-    w.add_step(reporter_agent)
+    # planner, reminder and reporter only read the extracted tasks
+    w.add_step(planner_agent, depends_on=["task_extractor_agent"])
+    w.add_step(reminder_agent, depends_on=["task_extractor_agent"])
+    w.add_step(reporter_agent, depends_on=["task_extractor_agent"])
     return w